@@ -0,0 +1,41 @@
+"""benchmarks/common.py
+
+Small helpers shared by the benchmark scripts (timing statistics and output).
+"""
+
+import json
+import math
+
+
+def percentile(samples, pct: float) -> float:
+    """Return the ``pct`` percentile (0-100) of ``samples`` (nearest-rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples) -> dict:
+    """Return count, mean, p50 and p99 (in milliseconds) for timings in seconds."""
+    if not samples:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0}
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def print_table(rows: list, columns: list):
+    """Print a list of dictionaries as an aligned text table."""
+    widths = [max(len(col), *(len(str(row.get(col, ""))) for row in rows)) for col in columns]
+    print("  ".join(col.ljust(w) for col, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row.get(col, "")).ljust(w) for col, w in zip(columns, widths)))
+
+
+def write_json(path, payload):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=4, ensure_ascii=False)
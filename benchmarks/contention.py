@@ -0,0 +1,247 @@
+"""benchmarks/contention.py
+
+Multi-process load test for a shared data directory: N worker processes run
+a realistic mix of project loads, project saves (load, edit, save) and
+template edits through ProjectManager against the same projects.json and
+templates.json, the way many editor instances share DATA_DIR.
+
+Reported per operation: throughput and latency percentiles. Integrity:
+- corrupted reads: loads that failed to decode a half-written file
+  (ProjectManager logs the error and returns an empty list, which the next
+  save then writes back)
+- lost updates: every save adds a unique marker (a step on the worker's own
+  project, or a template); markers missing from the final files were
+  overwritten by a concurrent save
+- lost seeded projects: projects present before the run and missing after it
+
+The storage class is pluggable (--manager module:Class, same interface as
+ProjectManager), so alternative strategies can be compared under the same load.
+
+Usage:
+    python -m benchmarks.contention --workers 16 --ops 200
+    python -m benchmarks.contention --workers 32 --data-dir /mnt/share/loadtest --output contention.json
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.common import percentile, print_table, summarize, write_json
+from benchmarks.synthetic import make_projects, make_templates
+
+OPERATIONS = ("load", "save", "template")
+DEFAULT_MIX = "load=5,save=4,template=1"
+DEFAULT_MANAGER = "core.project_manager:ProjectManager"
+
+
+def parse_mix(text: str) -> dict:
+    """Parse ``"load=5,save=4,template=1"`` into operation weights."""
+    mix = {}
+    for part in (p.strip() for p in text.split(",") if p.strip()):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}' (expected {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_manager_class(spec: str):
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name or "ProjectManager")
+
+
+class _ErrorCounter(logging.Handler):
+    """Counts ERROR records (ProjectManager logs failed reads instead of raising)."""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def worker(index, options, barrier, results):
+    """Run one worker's operations and put its measurements on ``results``."""
+    manager_class = load_manager_class(options["manager"])
+    projects = manager_class(os.path.join(options["data_dir"], "projects.json"))
+    templates = manager_class(os.path.join(options["data_dir"], "templates.json"))
+    errors = _ErrorCounter()
+    logging.getLogger().addHandler(errors)
+    logging.getLogger().setLevel(logging.ERROR)
+
+    rng = random.Random(index)
+    names, weights = zip(*options["mix"].items())
+    own_name = f"Load test worker {index:03d}"
+    timings = {op: [] for op in OPERATIONS}
+    markers = {"steps": [], "templates": []}
+    corrupted = failures = 0
+
+    def read_projects():
+        nonlocal corrupted
+        before = errors.count
+        items = projects.load_projects()
+        if errors.count > before:
+            corrupted += 1
+        return items
+
+    barrier.wait()
+    started = time.perf_counter()
+    for seq in range(options["ops"]):
+        op = rng.choices(names, weights)[0]
+        op_started = time.perf_counter()
+        try:
+            if op == "load":
+                read_projects()
+            elif op == "save":
+                items = read_projects()
+                own = next((p for p in items if p.get("name") == own_name), None)
+                if own is None:
+                    own = {"name": own_name, "area": "Load test", "steps": []}
+                    items.append(own)
+                marker = f"w{index}-s{seq}"
+                own["steps"].append({"name": marker, "type": "Task", "hours": 1.0})
+                own["total"] = float(len(own["steps"]))
+                projects.save_projects(items)
+                markers["steps"].append(marker)
+            else:
+                before = errors.count
+                items = templates.load_projects()
+                if errors.count > before:
+                    corrupted += 1
+                marker = f"w{index}-t{seq}"
+                items.append({"name": marker, "description": "", "hours": "1"})
+                templates.save_projects(items)
+                markers["templates"].append(marker)
+        except Exception:
+            failures += 1
+        timings[op].append(time.perf_counter() - op_started)
+        if options["think"]:
+            time.sleep(rng.uniform(0, options["think"]))
+
+    results.put({"index": index, "seconds": time.perf_counter() - started, "timings": timings,
+                 "markers": markers, "corrupted": corrupted, "failures": failures})
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f), True
+    except (OSError, ValueError):
+        return [], False
+
+
+def verify(data_dir, outcomes, seeded_names) -> dict:
+    """Count the markers missing from the final files (lost updates)."""
+    projects, projects_ok = _read_json(os.path.join(data_dir, "projects.json"))
+    templates, templates_ok = _read_json(os.path.join(data_dir, "templates.json"))
+    present_steps = {s.get("name") for p in projects if isinstance(p, dict) for s in p.get("steps") or []}
+    present_templates = {t.get("name") for t in templates if isinstance(t, dict)}
+
+    written_steps = [m for o in outcomes for m in o["markers"]["steps"]]
+    written_templates = [m for o in outcomes for m in o["markers"]["templates"]]
+    return {
+        "final_files_valid": projects_ok and templates_ok,
+        "saves": len(written_steps),
+        "lost_saves": sum(1 for m in written_steps if m not in present_steps),
+        "template_edits": len(written_templates),
+        "lost_template_edits": sum(1 for m in written_templates if m not in present_templates),
+        "lost_seeded_projects": len(set(seeded_names) - {p.get("name") for p in projects if isinstance(p, dict)}),
+    }
+
+
+def seed_data(data_dir, manager_class, n_projects: int, n_templates: int) -> list:
+    """Write the starting projects and templates; returns the seeded project names."""
+    os.makedirs(data_dir, exist_ok=True)
+    projects = make_projects(n_projects)
+    manager_class(os.path.join(data_dir, "projects.json")).save_projects(projects)
+    manager_class(os.path.join(data_dir, "templates.json")).save_projects(make_templates(n_templates))
+    return [p["name"] for p in projects]
+
+
+def run(workers: int, ops: int, mix: dict, data_dir: str, manager: str = DEFAULT_MANAGER,
+        seed_projects: int = 50, seed_templates: int = 100, think: float = 0.0) -> dict:
+    """Seed ``data_dir``, run the workers and return the report."""
+    seeded_names = seed_data(data_dir, load_manager_class(manager), seed_projects, seed_templates)
+    options = {"data_dir": data_dir, "manager": manager, "mix": mix, "ops": ops, "think": think}
+
+    ctx = mp.get_context("spawn")  # Same behaviour on Linux and Windows clients
+    barrier = ctx.Barrier(workers + 1)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(i, options, barrier, results)) for i in range(workers)]
+    for process in processes:
+        process.start()
+    barrier.wait()  # Every worker is up; start the clock together
+    started = time.perf_counter()
+    outcomes = [results.get() for _ in processes]
+    wall = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    rows = []
+    for op in OPERATIONS:
+        samples = [t for o in outcomes for t in o["timings"][op]]
+        if samples:
+            rows.append({"operation": op, "ops_per_s": round(len(samples) / wall, 1), **summarize(samples),
+                         "p95_ms": round(percentile(samples, 95) * 1000, 3)})
+    integrity = verify(data_dir, outcomes, seeded_names)
+    integrity["corrupted_reads"] = sum(o["corrupted"] for o in outcomes)
+    integrity["failed_operations"] = sum(o["failures"] for o in outcomes)
+    return {
+        "workers": workers,
+        "ops_per_worker": ops,
+        "manager": manager,
+        "wall_s": round(wall, 3),
+        "throughput_ops_s": round(workers * ops / wall, 1),
+        "operations": rows,
+        "integrity": integrity,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent save/load load test for a shared data directory")
+    parser.add_argument("--workers", type=int, default=8, help="Worker processes")
+    parser.add_argument("--ops", type=int, default=200, help="Operations per worker")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights")
+    parser.add_argument("--data-dir", help="Shared directory (default: a temporary one)")
+    parser.add_argument("--manager", default=DEFAULT_MANAGER, help="Storage class as module:Class")
+    parser.add_argument("--seed-projects", type=int, default=50)
+    parser.add_argument("--seed-templates", type=int, default=100)
+    parser.add_argument("--think", type=float, default=0.0, help="Max random pause between operations (s)")
+    parser.add_argument("--output", help="Optional JSON file for the report")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    if args.data_dir:
+        report = run(args.workers, args.ops, mix, args.data_dir, args.manager,
+                     args.seed_projects, args.seed_templates, args.think)
+    else:
+        with tempfile.TemporaryDirectory(prefix="estimator_contention_") as data_dir:
+            report = run(args.workers, args.ops, mix, data_dir, args.manager,
+                         args.seed_projects, args.seed_templates, args.think)
+
+    print(f"{report['workers']} workers x {report['ops_per_worker']} ops in {report['wall_s']}s "
+          f"({report['throughput_ops_s']} ops/s) using {report['manager']}")
+    print()
+    print_table(report["operations"], ["operation", "count", "ops_per_s", "p50_ms", "p95_ms", "p99_ms"])
+    print()
+    for key, value in report["integrity"].items():
+        print(f"{key:<22} {value}")
+    if args.output:
+        write_json(args.output, report)
+
+    integrity = report["integrity"]
+    damaged = (integrity["corrupted_reads"] or integrity["lost_saves"] or integrity["lost_template_edits"]
+               or integrity["lost_seeded_projects"] or not integrity["final_files_valid"])
+    return 1 if damaged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
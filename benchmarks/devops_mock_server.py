@@ -0,0 +1,290 @@
+"""benchmarks/devops_mock_server.py
+
+Local stand-in for the Azure DevOps work item REST API.
+Implements the endpoints used by DevOpsClient (work item create, update,
+$batch and workitemsbatch reads) on top of the standard library HTTP server, with configurable latency,
+error injection and throttling, so uploads can be measured and regression-tested
+without a live organization or a PAT.
+
+Run standalone with:
+    python -m benchmarks.devops_mock_server --port 8765 --latency 0.01
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+CREATE_RE = re.compile(r"^/[^/]+/[^/]+/_apis/wit/workitems/\$(?P<type>[^/?]+)$")
+UPDATE_RE = re.compile(r"^/[^/]+/[^/]+/_apis/wit/workitems/(?P<id>\d+)$")
+BATCH_RE = re.compile(r"^/[^/]+/_apis/wit/\$batch$")
+GET_BATCH_RE = re.compile(r"^/[^/]+/[^/]+/_apis/wit/workitemsbatch$")
+
+
+class MockDevOpsState:
+    """Work item store, counters and fault configuration shared by all handlers."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: float = 0.0, retry_after: float = 0.0, seed: int | None = None):
+        """Configure the stand-in behaviour.
+
+        Args:
+            latency: Fixed delay in seconds added to every response.
+            jitter: Extra random delay in seconds (uniform 0..jitter).
+            error_rate: Fraction of requests answered with HTTP 500.
+            rate_limit: Requests per second allowed before answering 429
+                (0 disables throttling).
+            retry_after: Minimum Retry-After value sent with 429 responses; the
+                time left in the current one-second window is used if larger.
+            seed: Optional random seed for reproducible fault injection.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.items = {}
+        self.counters = {"requests": 0, "created": 0, "updated": 0, "batches": 0,
+                         "errors": 0, "throttled": 0}
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.counters[key] += n
+
+    def admit(self):
+        """Return the (status, headers) to answer with, or None to serve normally."""
+        with self.lock:
+            self.counters["requests"] += 1
+            if self.rate_limit:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start = now
+                    self._window_count = 0
+                self._window_count += 1
+                if self._window_count > self.rate_limit:
+                    self.counters["throttled"] += 1
+                    wait = max(self.retry_after, self._window_start + 1.0 - now)
+                    return 429, {"Retry-After": f"{wait:.3f}",
+                                 "X-RateLimit-Limit": str(int(self.rate_limit)),
+                                 "X-RateLimit-Remaining": "0"}
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.counters["errors"] += 1
+                return 500, {}
+        return None
+
+    def delay(self):
+        wait = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if wait > 0:
+            time.sleep(wait)
+
+    def apply_ops(self, item, ops):
+        for op in ops or []:
+            path = op.get("path", "")
+            if path.startswith("/fields/"):
+                item["fields"][path[len("/fields/"):]] = op.get("value")
+            elif path.startswith("/relations"):
+                item.setdefault("relations", []).append(op.get("value"))
+
+    def create(self, w_type, ops):
+        with self.lock:
+            wid = next(self.ids)
+            item = {"id": wid, "rev": 1, "fields": {"System.WorkItemType": w_type}}
+            self.apply_ops(item, ops)
+            self.items[wid] = item
+            self.counters["created"] += 1
+        return item
+
+    def get_many(self, ids, fields=None):
+        with self.lock:
+            found = []
+            for wid in ids:
+                item = self.items.get(wid)
+                if item is None:
+                    continue
+                item_fields = item["fields"]
+                if fields:
+                    item_fields = {k: v for k, v in item_fields.items() if k in fields}
+                found.append({"id": wid, "rev": item["rev"], "fields": dict(item_fields)})
+        return found
+
+    def update(self, wid, ops):
+        with self.lock:
+            item = self.items.get(wid)
+            if item is None:
+                return None
+            self.apply_ops(item, ops)
+            item["rev"] += 1
+            self.counters["updated"] += 1
+        return item
+
+
+class MockDevOpsHandler(BaseHTTPRequestHandler):
+    """Request handler; the shared state is attached to the server instance."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    @property
+    def state(self) -> MockDevOpsState:
+        return self.server.state
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw) if raw else None
+
+    def _send(self, status, payload=None, headers=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _guard(self):
+        """Apply latency, throttling and error injection; return True if answered."""
+        self.state.delay()
+        verdict = self.state.admit()
+        if verdict is None:
+            return False
+        status, headers = verdict
+        self._read_json()  # Drain the body so the connection can be reused
+        self._send(status, {"message": "injected failure"}, headers)
+        return True
+
+    def do_PATCH(self):
+        if self._guard():
+            return
+        path = unquote(self.path.split("?", 1)[0])
+        ops = self._read_json()
+
+        match = CREATE_RE.match(path)
+        if match:
+            self._send(200, self.state.create(match["type"], ops))
+            return
+
+        match = UPDATE_RE.match(path)
+        if match:
+            item = self.state.update(int(match["id"]), ops)
+            if item is None:
+                self._send(404, {"message": f"Work item {match['id']} not found"})
+            else:
+                self._send(200, item)
+            return
+
+        self._send(404, {"message": f"Unknown endpoint {path}"})
+
+    def do_POST(self):
+        if self._guard():
+            return
+        path = unquote(self.path.split("?", 1)[0])
+        if GET_BATCH_RE.match(path):
+            request = self._read_json() or {}
+            found = self.state.get_many(request.get("ids") or [], request.get("fields"))
+            self._send(200, {"count": len(found), "value": found})
+            return
+        if not BATCH_RE.match(path):
+            self._read_json()
+            self._send(404, {"message": f"Unknown endpoint {path}"})
+            return
+
+        self.state.count("batches")
+        results = []
+        for sub in self._read_json() or []:
+            uri = unquote(sub.get("uri", "").split("?", 1)[0])
+            create = re.match(r"^/[^/]+/_apis/wit/workitems/\$(?P<type>[^/]+)$", uri)
+            update = re.match(r"^/[^/]+/_apis/wit/workitems/(?P<id>\d+)$", uri)
+            if create:
+                code, item = 200, self.state.create(create["type"], sub.get("body"))
+            elif update:
+                item = self.state.update(int(update["id"]), sub.get("body"))
+                code = 200 if item is not None else 404
+            else:
+                code, item = 404, {"message": f"Unknown endpoint {uri}"}
+            # Like the real service, sub-response bodies are JSON strings
+            results.append({"code": code, "headers": {"Content-Type": "application/json"},
+                            "body": json.dumps(item)})
+        self._send(200, {"count": len(results), "value": results})
+
+
+class MockDevOpsServer:
+    """Threaded mock server that can run in the background of a benchmark."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **options):
+        """Create the server; ``options`` are forwarded to MockDevOpsState."""
+        self.state = MockDevOpsState(**options)
+        self.httpd = ThreadingHTTPServer((host, port), MockDevOpsHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = self.state
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve in a background thread and return the base URL."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self) -> dict:
+        with self.state.lock:
+            return dict(self.state.counters)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Azure DevOps stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed delay per request (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra delay (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/s before HTTP 429")
+    parser.add_argument("--retry-after", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    server = MockDevOpsServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                              error_rate=args.error_rate, rate_limit=args.rate_limit,
+                              retry_after=args.retry_after)
+    print(f"Mock DevOps server listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Stats: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""benchmarks/devops_upload.py
+
+Benchmark harness for DevOps uploads against the local stand-in server.
+Runs create_structure_from_json (sequential mode) and create_structure_batched
+(batch mode) on synthetic projects and reports requests sent, wall time and
+per-request p50/p99 latency.
+
+Usage:
+    python -m benchmarks.devops_upload --sizes 10,100,1000,10000 --latency 0.002
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import requests
+
+from benchmarks.common import print_table, summarize, write_json
+from benchmarks.devops_mock_server import MockDevOpsServer
+from benchmarks.synthetic import make_project
+from core.helpers.devops_client import DevOpsClient
+from core.helpers.request_scheduler import RequestScheduler
+
+MODES = {
+    "sequential": DevOpsClient.create_structure_from_json,
+    "batched": DevOpsClient.create_structure_batched,
+}
+
+
+class TimedSession(requests.Session):
+    """requests.Session that records the duration of every request."""
+
+    def __init__(self):
+        super().__init__()
+        self.timings = []
+
+    def request(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            self.timings.append(time.perf_counter() - started)
+
+
+def run_case(n_steps: int, mode: str, server_options: dict, rate: float) -> dict:
+    """Upload one synthetic project of ``n_steps`` steps and return the measurements."""
+    project = make_project(n_steps)
+    session = TimedSession()
+    scheduler = RequestScheduler(rate=rate, burst=max(1, int(rate)), session=session)
+
+    with MockDevOpsServer(**server_options) as server:
+        client = DevOpsClient("bench-org", "bench-project", "dummy-pat",
+                              scheduler=scheduler, base_url=server.base_url)
+        started = time.perf_counter()
+        error = ""
+        try:
+            # The client prints one line per created item; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                MODES[mode](client, project)
+        except Exception as ex:
+            error = str(ex)[:80]
+        wall = time.perf_counter() - started
+        stats = server.stats()
+
+    latency = summarize(session.timings)
+    metrics = scheduler.metrics()
+    return {
+        "steps": n_steps,
+        "mode": mode,
+        "requests": stats["requests"],
+        "created": stats["created"],
+        "wall_s": round(wall, 3),
+        "p50_ms": latency["p50_ms"],
+        "p99_ms": latency["p99_ms"],
+        "retries": metrics["retries"],
+        "throttle_s": metrics["throttle_seconds"],
+        "error": error,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DevOps uploads against a local stand-in")
+    parser.add_argument("--sizes", default="10,100,1000,10000", help="Comma-separated step counts")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated upload modes")
+    parser.add_argument("--latency", type=float, default=0.002, help="Server latency per request (s)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Server requests/s before 429")
+    parser.add_argument("--retry-after", type=float, default=0.0)
+    parser.add_argument("--client-rate", type=float, default=1000.0, help="Scheduler requests/s")
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args(argv)
+
+    server_options = {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate,
+                      "rate_limit": args.rate_limit, "retry_after": args.retry_after, "seed": 0}
+    rows = []
+    for size in (int(s) for s in args.sizes.split(",") if s):
+        for mode in (m.strip() for m in args.modes.split(",") if m.strip()):
+            rows.append(run_case(size, mode, server_options, args.client_rate))
+            print(f"{size} steps / {mode}: {rows[-1]['wall_s']}s")
+
+    print()
+    print_table(rows, list(rows[0]) if rows else [])
+    if args.output:
+        write_json(args.output, {"options": vars(args), "results": rows})
+
+
+if __name__ == "__main__":
+    main()
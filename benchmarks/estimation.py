@@ -0,0 +1,60 @@
+"""benchmarks/estimation.py
+
+Monte Carlo estimation benchmark: time to simulate a project whose steps all
+carry distinct optimistic / likely / pessimistic hours (the worst case, since
+steps sharing a range also share a quantile table).
+
+Usage:
+    python -m benchmarks.estimation --steps 1000 --trials 100000 --max-seconds 1
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.common import print_table, summarize
+from benchmarks.synthetic import make_project
+from core.estimation import PERCENTILES, estimate_project
+
+
+def add_ranges(project: dict, seed: int = 0) -> dict:
+    """Give every step a random optimistic / pessimistic spread around its hours."""
+    rng = random.Random(seed)
+    for step in project["steps"]:
+        hours = float(step["hours"])
+        step["hours_optimistic"] = round(hours * rng.uniform(0.5, 1.0), 2)
+        step["hours_pessimistic"] = round(hours * rng.uniform(1.1, 3.0), 2)
+    return project
+
+
+def run(steps: int, trials: int, repeats: int) -> dict:
+    project = add_ranges(make_project(steps))
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = estimate_project(project, trials=trials, seed=0)
+        timings.append(time.perf_counter() - started)
+    row = {"steps": steps, "trials": trials, **summarize(timings)}
+    row.update({f"p{p}": round(result[f"p{p}"], 1) for p in PERCENTILES})
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PERT Monte Carlo benchmark")
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--trials", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None, help="Fail if the median run is slower")
+    args = parser.parse_args(argv)
+
+    row = run(args.steps, args.trials, args.repeats)
+    print_table([row], list(row))
+    if args.max_seconds is not None and row["p50_ms"] / 1000 > args.max_seconds:
+        print(f"FAIL: median {row['p50_ms']:.0f} ms exceeds {args.max_seconds:.2f} s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""benchmarks/headless.py
+
+Drives ui/main_view.py without a display: a stand-in for ft.Page that
+collects controls and ignores updates, plus helpers to find the controls a
+benchmark interacts with. Flet controls themselves are plain Python objects
+and are built for real, so the measured cost is the editor's own work.
+"""
+
+import os
+import tempfile
+import types
+
+import flet as ft
+
+# Keep the editor's draft journals out of the user's real drafts folder
+_drafts = tempfile.TemporaryDirectory(prefix="estimator_drafts_")
+os.environ.setdefault("ESTIMATOR_DRAFT_DIR", _drafts.name)
+
+
+class HeadlessPage:
+    """Minimal ft.Page replacement: updates are no-ops, threads run inline."""
+
+    def __init__(self):
+        self.overlay = []
+        self.controls = []
+        self.dialogs = []
+        self.updates = 0
+        self.window = types.SimpleNamespace()
+
+    def update(self, *controls):
+        self.updates += 1
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+
+    def open(self, control):
+        self.dialogs.append(control)
+
+    def close(self, control):
+        if control in self.dialogs:
+            self.dialogs.remove(control)
+
+    def run_task(self, handler, *args):
+        pass
+
+    def run_thread(self, handler, *args):
+        handler(*args)
+
+
+class Event:
+    """Stand-in for a Flet control event."""
+
+    def __init__(self, control=None, data=None):
+        self.control = control
+        self.data = data
+
+
+def walk(control):
+    """Yield a control and every control nested in it (content, controls, tabs)."""
+    stack = [control]
+    while stack:
+        current = stack.pop()
+        yield current
+        for attr in ("content", "controls", "tabs"):
+            value = getattr(current, attr, None)
+            if isinstance(value, list):
+                stack.extend(v for v in value if isinstance(v, ft.Control))
+            elif isinstance(value, ft.Control):
+                stack.append(value)
+
+
+def find(page, predicate) -> list:
+    """Return every control on the page matching ``predicate``."""
+    return [c for root in page.controls for c in walk(root) if predicate(c)]
+
+
+def build_main_view(manager) -> HeadlessPage:
+    """Build the editor for ``manager`` on a HeadlessPage."""
+    from ui.main_view import main_view
+
+    page = HeadlessPage()
+    main_view(page, manager)
+    return page
@@ -0,0 +1,94 @@
+"""benchmarks/history.py
+
+Undo history benchmark: a deep copy of the steps list per edit versus the
+structurally shared snapshots of core/helpers/history.py, on one large
+estimate. Every edit changes the hours of a random step; reported are the
+cost of recording an edit, the memory held by the history and the cost of
+one undo and one redo.
+
+Usage:
+    python -m benchmarks.history --steps 2000 --edits 500
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import print_table, summarize
+from core.helpers.history import EditorState, History, StepState, StepTrie
+
+
+def _steps(n: int) -> list:
+    return [{"name": f"Step {i}", "description": f"Description of step {i}", "hours": "8",
+             "hours_optimistic": "", "hours_pessimistic": "", "type": "Task", "parent": None}
+            for i in range(1, n + 1)]
+
+
+def run_deepcopy(n_steps: int, edits: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    current = _steps(n_steps)
+    undo, redo = [], []
+    tracemalloc.start()
+    record = []
+    for n in range(edits):
+        started = time.perf_counter()
+        undo.append(copy.deepcopy(current))
+        current[rng.randrange(n_steps)]["hours"] = str(n)
+        record.append(time.perf_counter() - started)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    started = time.perf_counter()
+    redo.append(current)
+    current = undo.pop()
+    undo_s = time.perf_counter() - started
+    started = time.perf_counter()
+    undo.append(current)
+    current = redo.pop()
+    return {"record": record, "memory": memory, "undo": undo_s, "redo": time.perf_counter() - started}
+
+
+def run_persistent(n_steps: int, edits: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    steps = StepTrie.from_items((i, StepState(**s)) for i, s in enumerate(_steps(n_steps), start=1))
+    history = History(EditorState(steps=steps), limit=edits)
+    tracemalloc.start()
+    record = []
+    for n in range(edits):
+        started = time.perf_counter()
+        step_id = rng.randrange(n_steps) + 1
+        state = history.current
+        history.commit(state.with_step(step_id, state.steps.get(step_id)._replace(hours=str(n))), key=n)
+        record.append(time.perf_counter() - started)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    started = time.perf_counter()
+    history.undo()
+    undo_s = time.perf_counter() - started
+    started = time.perf_counter()
+    history.redo()
+    return {"record": record, "memory": memory, "undo": undo_s, "redo": time.perf_counter() - started}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deep-copy vs structurally shared undo history")
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--edits", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rows = []
+    for label, run in (("deepcopy per edit", run_deepcopy), ("persistent snapshots", run_persistent)):
+        result = run(args.steps, args.edits, args.seed)
+        rows.append({"variant": label, "steps": args.steps, "edits": args.edits,
+                     "record_p50_ms": summarize(result["record"])["p50_ms"],
+                     "history_mb": round(result["memory"] / 1e6, 2),
+                     "undo_us": round(result["undo"] * 1e6, 1), "redo_us": round(result["redo"] * 1e6, 1)})
+    print_table(rows, list(rows[0]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
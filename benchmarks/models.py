@@ -0,0 +1,97 @@
+"""benchmarks/models.py
+
+Parsing benchmark: json.load plus the manual coercion the editor, PDF and
+DevOps code repeat (``float(x or 0)``, ``.get()`` defaults) versus
+ProjectManager.load_project_models, which validates against the typed models
+of core/models.py from the JSON bytes in one pass. Both variants then run the
+same downstream loop (hierarchy rollup per project and hours per area).
+
+Usage:
+    python -m benchmarks.models --projects 20000 --steps 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from benchmarks.common import print_table, summarize
+from benchmarks.synthetic import make_projects
+from core.helpers.rollup import RollupTree
+from core.project_manager import ProjectManager
+
+
+def _optional_float(value):
+    return None if value is None or value == "" else float(value)
+
+
+def coerce(projects: list) -> list:
+    for project in projects:
+        project["total"] = _optional_float(project.get("total"))
+        for step in project.get("steps") or []:
+            step["hours"] = float(step.get("hours") or 0)
+            step["hours_optimistic"] = _optional_float(step.get("hours_optimistic"))
+            step["hours_pessimistic"] = _optional_float(step.get("hours_pessimistic"))
+            step["type"] = step.get("type") or "Feature"
+    return projects
+
+
+def downstream_dicts(projects) -> dict:
+    by_area = defaultdict(float)
+    for project in projects:
+        by_area[project.get("area", "")] += RollupTree.from_steps(project.get("steps") or []).total
+    return by_area
+
+
+def _plain_load(path) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run(n_projects: int, steps: int, repeats: int) -> list:
+    with tempfile.TemporaryDirectory() as workdir:
+        manager = ProjectManager(os.path.join(workdir, "projects.json"))
+        manager.save_projects(make_projects(n_projects, steps_per_project=steps))
+        size_mb = round(os.path.getsize(manager.path) / 1e6, 1)
+        variants = {
+            "json.load + coercion": (lambda: coerce(_plain_load(manager.path)), downstream_dicts),
+            "load_project_models": (manager.load_project_models, downstream_dicts),
+        }
+        rows, results = [], {}
+        for label, (load, downstream) in variants.items():
+            load_times, loop_times = [], []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                projects = load()
+                loaded = time.perf_counter()
+                results[label] = downstream(projects)
+                load_times.append(loaded - started)
+                loop_times.append(time.perf_counter() - loaded)
+                del projects
+            load_ms, loop_ms = summarize(load_times)["p50_ms"], summarize(loop_times)["p50_ms"]
+            rows.append({"variant": label, "projects": n_projects, "mb": size_mb, "load_ms": load_ms,
+                         "downstream_ms": loop_ms, "total_ms": round(load_ms + loop_ms, 3)})
+
+    reference = next(iter(results.values()))
+    for label, by_area in results.items():
+        assert all(abs(reference[k] - by_area[k]) < 1e-6 for k in reference), f"{label} disagrees"
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="json.load + coercion vs typed models")
+    parser.add_argument("--projects", type=int, default=20_000)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rows = run(args.projects, args.steps, args.repeats)
+    print_table(rows, list(rows[0]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
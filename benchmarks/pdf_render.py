@@ -0,0 +1,64 @@
+"""benchmarks/pdf_render.py
+
+PDF microbenchmark: per-document cost with a fresh renderer for every report
+(logo located and decoded each time) versus one shared PdfRenderer.
+
+Usage:
+    python -m benchmarks.pdf_render --docs 50 --steps 30
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import print_table, summarize
+from benchmarks.synthetic import make_project
+from core.pdf_generator import LOGO_PATH, PdfRenderer
+
+
+def _ensure_logo(path):
+    """Return a logo path, generating a placeholder PNG if BallLogo.png is absent."""
+    if path and os.path.exists(path):
+        return path
+    from PIL import Image  # Pillow is installed with fpdf2
+
+    placeholder = os.path.join(tempfile.gettempdir(), "bench_logo.png")
+    Image.new("RGB", (600, 300), (0, 70, 140)).save(placeholder)
+    return placeholder
+
+
+def run(docs: int, steps: int, logo: str) -> list:
+    projects = [make_project(steps, index=i) for i in range(docs)]
+    rows = []
+
+    timings = []
+    for project in projects:
+        started = time.perf_counter()
+        PdfRenderer(logo).render(project).output()
+        timings.append(time.perf_counter() - started)
+    rows.append({"mode": "fresh renderer", "docs": docs, "steps": steps, **summarize(timings)})
+
+    renderer = PdfRenderer(logo)
+    timings = []
+    for project in projects:
+        started = time.perf_counter()
+        renderer.render(project).output()
+        timings.append(time.perf_counter() - started)
+    rows.append({"mode": "shared renderer", "docs": docs, "steps": steps, **summarize(timings)})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDF renderer microbenchmark")
+    parser.add_argument("--docs", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=30)
+    parser.add_argument("--logo", default=LOGO_PATH, help="Logo image (placeholder used if missing)")
+    args = parser.parse_args(argv)
+
+    rows = run(args.docs, args.steps, _ensure_logo(args.logo))
+    print_table(rows, list(rows[0]))
+
+
+if __name__ == "__main__":
+    main()
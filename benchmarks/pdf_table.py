@@ -0,0 +1,51 @@
+"""benchmarks/pdf_table.py
+
+Large-table PDF benchmark: renders a synthetic estimate with thousands of
+wrapped, hierarchical breakdown rows and checks wall time and peak traced
+memory against bounds (non-zero exit code when a bound is exceeded).
+
+Usage:
+    python -m benchmarks.pdf_table --rows 5000 --max-seconds 5 --max-mb 100
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.synthetic import make_project
+from core.pdf_generator import PdfRenderer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the PDF breakdown table")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--max-seconds", type=float, default=5.0)
+    parser.add_argument("--max-mb", type=float, default=100.0)
+    args = parser.parse_args(argv)
+
+    project = make_project(args.rows)
+    renderer = PdfRenderer()
+
+    started = time.perf_counter()
+    data = renderer.render_bytes(project)
+    seconds = time.perf_counter() - started
+
+    # Separate run: tracemalloc slows rendering down and would skew the timing
+    tracemalloc.start()
+    renderer.render_bytes(project)
+    peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+
+    print(f"rows={args.rows} pdf_bytes={len(data)} seconds={seconds:.2f} peak_mb={peak_mb:.1f}")
+    failures = []
+    if seconds > args.max_seconds:
+        failures.append(f"time {seconds:.2f}s > {args.max_seconds}s")
+    if peak_mb > args.max_mb:
+        failures.append(f"memory {peak_mb:.1f}MB > {args.max_mb}MB")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
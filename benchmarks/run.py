@@ -0,0 +1,249 @@
+"""benchmarks/run.py
+
+Benchmark suite for the hot paths, with results saved as JSON and compared
+against a stored baseline:
+
+- storage: ProjectManager.load_projects / save_projects against project count
+- ui: loading a project, update_total_hours (an hours edit) and
+  refresh_templates (a template search) in the editor, driven headless
+- pdf: generate_pdf against breakdown row count
+- devops: DevOpsClient.create_structure_from_json against work item count,
+  uploaded to the local stand-in server
+
+Every case runs on synthetic data (benchmarks/synthetic.py) in a temporary
+directory. The "quick" profile finishes in about a minute; "full" goes up to
+100,000 projects (storage) and 10,000 steps / templates / rows / work items.
+
+Usage:
+    python -m benchmarks.run --profile quick --output results.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.25
+
+With --baseline, a case is a regression when its median is more than
+--threshold slower (and at least --min-delta-ms slower) than the baseline;
+the exit code is then 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.common import print_table, summarize, write_json
+from benchmarks.synthetic import make_project, make_projects, make_templates
+
+SUITES = ("storage", "ui", "pdf", "devops")
+
+PROFILES = {
+    "quick": {"storage": (100, 1_000, 10_000), "ui_steps": (10, 100, 1_000),
+              "ui_templates": (10, 100, 1_000), "pdf": (10, 100, 1_000), "devops": (10, 100)},
+    "full": {"storage": (100, 1_000, 10_000, 100_000), "ui_steps": (10, 100, 1_000, 10_000),
+             "ui_templates": (10, 100, 1_000, 10_000), "pdf": (10, 100, 1_000, 10_000),
+             "devops": (10, 100, 1_000, 10_000)},
+}
+
+STEPS_PER_PROJECT = 10  # Storage cases scale the number of projects
+
+
+def _timed(func, repeats: int) -> list:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _row(suite, case, size, timings, **extra) -> dict:
+    return {"suite": suite, "case": case, "size": size, **summarize(timings), **extra}
+
+
+# ---------- Suites ----------
+
+def bench_storage(sizes, repeats, workdir) -> list:
+    from core.project_manager import ProjectManager
+
+    rows = []
+    for size in sizes:
+        projects = make_projects(size, steps_per_project=STEPS_PER_PROJECT)
+        manager = ProjectManager(os.path.join(workdir, f"storage_{size}.json"))
+        save = _timed(lambda: manager.save_projects(projects), repeats)
+        file_mb = round(os.path.getsize(manager.path) / 1e6, 2)
+        load = _timed(manager.load_projects, repeats)
+        rows.append(_row("storage", "save_projects", size, save, file_mb=file_mb))
+        rows.append(_row("storage", "load_projects", size, load, file_mb=file_mb))
+    return rows
+
+
+def bench_ui(step_sizes, template_sizes, repeats, workdir) -> list:
+    import flet as ft
+
+    from benchmarks.headless import Event, build_main_view, find
+    from core.helpers.template_utils import get_template_manager, set_template_manager
+    from core.project_manager import ProjectManager
+
+    rows = []
+    previous_templates = get_template_manager()
+    try:
+        set_template_manager(ProjectManager(os.path.join(workdir, "ui_templates_empty.json")))
+        for size in step_sizes:
+            manager = ProjectManager(os.path.join(workdir, f"ui_projects_{size}.json"))
+            project = make_project(size)
+            manager.save_projects([project])
+            page = build_main_view(manager)
+            dropdown = find(page, lambda c: isinstance(c, ft.Dropdown) and c.label == "Existing Projects")[0]
+
+            def load_project():
+                dropdown.value = "Create New Project"
+                dropdown.on_change(Event(dropdown))
+                dropdown.value = project["name"]
+                dropdown.on_change(Event(dropdown))
+
+            rows.append(_row("ui", "load_project", size, _timed(load_project, repeats)))
+
+            hours = find(page, lambda c: isinstance(c, ft.TextField) and c.hint_text == "Hours")[-1]
+            values = iter(str(v % 17) for v in range(10 ** 9))
+
+            def edit_hours():
+                hours.value = next(values)
+                hours.on_change(Event(hours))
+
+            rows.append(_row("ui", "update_total_hours", size, _timed(edit_hours, repeats * 10)))
+
+        for size in template_sizes:
+            templates = ProjectManager(os.path.join(workdir, f"ui_templates_{size}.json"))
+            templates.save_projects(make_templates(size))
+            set_template_manager(templates)
+            page = build_main_view(ProjectManager(os.path.join(workdir, "ui_projects_empty.json")))
+            search = find(page, lambda c: isinstance(c, ft.TextField) and c.hint_text == "Search template...")[0]
+            rows.append(_row("ui", "refresh_templates", size,
+                             _timed(lambda: search.on_change(Event(search)), repeats)))
+    finally:
+        set_template_manager(previous_templates)
+    return rows
+
+
+def bench_pdf(sizes, repeats, workdir) -> list:
+    from core.pdf_generator import generate_pdf
+
+    rows = []
+    for size in sizes:
+        project = make_project(size)
+        destination = os.path.join(workdir, f"estimate_{size}.pdf")
+        timings = _timed(lambda: generate_pdf(project, destination), repeats)
+        rows.append(_row("pdf", "generate_pdf", size, timings,
+                         file_kb=round(os.path.getsize(destination) / 1024, 1)))
+    return rows
+
+
+def bench_devops(sizes, repeats, workdir) -> list:
+    from benchmarks.devops_upload import run_case
+
+    rows = []
+    for size in sizes:
+        results = [run_case(size, "sequential", {"latency": 0.0, "seed": 0}, rate=1e6) for _ in range(repeats)]
+        errors = [r["error"] for r in results if r["error"]]
+        rows.append(_row("devops", "create_structure_from_json", size, [r["wall_s"] for r in results],
+                         requests=results[0]["requests"], error=errors[0] if errors else ""))
+    return rows
+
+
+def run_suites(suites, profile: str, repeats: int) -> list:
+    sizes = PROFILES[profile]
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="estimator_bench_") as workdir:
+        for suite in suites:
+            started = time.perf_counter()
+            if suite == "storage":
+                rows += bench_storage(sizes["storage"], repeats, workdir)
+            elif suite == "ui":
+                rows += bench_ui(sizes["ui_steps"], sizes["ui_templates"], repeats, workdir)
+            elif suite == "pdf":
+                rows += bench_pdf(sizes["pdf"], repeats, workdir)
+            elif suite == "devops":
+                rows += bench_devops(sizes["devops"], repeats, workdir)
+            print(f"{suite}: done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return rows
+
+
+# ---------- Baseline ----------
+
+def _key(row) -> str:
+    return f"{row['suite']}/{row['case']}/{row['size']}"
+
+
+def compare(rows: list, baseline: list, threshold: float, min_delta_ms: float) -> list:
+    """Annotate ``rows`` with the baseline median and return the regressed ones."""
+    previous = {_key(r): r for r in baseline}
+    regressions = []
+    for row in rows:
+        base = previous.get(_key(row))
+        if base is None:
+            row["baseline_ms"] = ""
+            row["change"] = "new"
+            continue
+        row["baseline_ms"] = base["p50_ms"]
+        ratio = row["p50_ms"] / base["p50_ms"] if base["p50_ms"] else 1.0
+        row["change"] = f"{(ratio - 1) * 100:+.0f}%"
+        if ratio > 1 + threshold and row["p50_ms"] - base["p50_ms"] >= min_delta_ms:
+            row["change"] += " REGRESSION"
+            regressions.append(row)
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the hot-path benchmark suite")
+    parser.add_argument("--suites", default=",".join(SUITES), help="Comma-separated suites to run")
+    parser.add_argument("--profile", choices=tuple(PROFILES), default="quick")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Also store the results as a baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns below this")
+    args = parser.parse_args(argv)
+
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    rows = run_suites(suites, args.profile, args.repeats)
+    payload = {"environment": environment(), "profile": args.profile, "repeats": args.repeats, "results": rows}
+
+    regressions = []
+    columns = ["suite", "case", "size", "count", "p50_ms", "p99_ms"]
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(rows, baseline.get("results", []), args.threshold, args.min_delta_ms)
+        payload["regressions"] = [_key(r) for r in regressions]
+        columns += ["baseline_ms", "change"]
+
+    print()
+    print_table(rows, columns)
+    if args.output:
+        write_json(args.output, payload)
+    if args.save_baseline:
+        write_json(args.save_baseline, payload)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(_key(r) for r in regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""benchmarks/synthetic.py
+
+Synthetic data generator for benchmarks and load tests.
+Produces projects shaped like the ones saved by the editor, with a valid
+Feature -> User Story -> Task hierarchy of any size.
+"""
+
+import random
+
+WORDS = [
+    "SAP", "connector", "invoice", "approval", "workflow", "report", "portal", "sync",
+    "migration", "dashboard", "API", "integration", "OCR", "email", "notification",
+    "validation", "export", "import", "bot", "queue", "archive", "audit", "login",
+]
+AREAS = ["Finance", "Supply Chain", "HR", "Sales", "IT", "Procurement", "Legal"]
+ARCHITECTS = ["A. Silva", "B. Costa", "C. Souza", "D. Lima", "E. Rocha", "F. Alves"]
+
+
+def _phrase(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def make_steps(n_steps: int, seed: int = 0, stories_per_feature: int = 4,
+               tasks_per_story: int = 9) -> list:
+    """Return ``n_steps`` steps forming a valid hierarchy (parents come first).
+
+    Args:
+        n_steps: Number of steps to generate.
+        seed: Random seed for reproducible output.
+        stories_per_feature: User Stories generated under each Feature.
+        tasks_per_story: Tasks generated under each User Story.
+    """
+    rng = random.Random(seed)
+    steps = []
+    feature = story = None
+    f_count = s_count = t_count = 0
+
+    while len(steps) < n_steps:
+        if feature is None or s_count == stories_per_feature:
+            f_count += 1
+            s_count = 0
+            feature = f"Feature {f_count}"
+            story = None
+            steps.append({"name": feature, "type": "Feature", "parent": None,
+                          "description": _phrase(rng, 6), "hours": 0.0})
+        elif story is None or t_count == tasks_per_story:
+            s_count += 1
+            t_count = 0
+            story = f"Story {f_count}.{s_count}"
+            steps.append({"name": story, "type": "User Story", "parent": feature,
+                          "description": _phrase(rng, 8), "hours": 0.0})
+        else:
+            t_count += 1
+            steps.append({"name": f"Task {f_count}.{s_count}.{t_count} {_phrase(rng, 2)}",
+                          "type": "Task", "parent": story,
+                          "description": _phrase(rng, rng.randint(0, 25)),
+                          "hours": float(rng.randint(1, 16))})
+    return steps
+
+
+def make_project(n_steps: int, seed: int = 0, index: int = 0) -> dict:
+    """Return a project dictionary with ``n_steps`` synthetic steps."""
+    rng = random.Random(seed * 1_000_003 + index)
+    steps = make_steps(n_steps, seed=seed + index)
+    return {
+        "name": f"Project {index:05d} {_phrase(rng, 2)}",
+        "architect": rng.choice(ARCHITECTS),
+        "area": rng.choice(AREAS),
+        "demand": f"DMD-{rng.randint(1000, 9999)}",
+        "purpose": _phrase(rng, 20),
+        "date": f"20{rng.randint(22, 26)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "steps": steps,
+        "total": sum(s["hours"] for s in steps),
+    }
+
+
+def make_projects(n_projects: int, steps_per_project: int = 20, seed: int = 0) -> list:
+    """Return ``n_projects`` synthetic projects."""
+    return [make_project(steps_per_project, seed=seed, index=i) for i in range(n_projects)]
+
+
+def make_templates(n_templates: int, seed: int = 0) -> list:
+    """Return ``n_templates`` templates in the templates.json format."""
+    rng = random.Random(seed)
+    return [
+        {"name": f"Template {i} {_phrase(rng, 2)}", "description": _phrase(rng, 8),
+         "hours": str(rng.randint(1, 40))}
+        for i in range(n_templates)
+    ]
@@ -0,0 +1,411 @@
+"""cli.py
+
+Headless command-line interface for the Project Estimator.
+Reuses ProjectManager, the PDF generator and DevOpsClient without importing
+Flet, so estimates can be listed, exported, rendered and uploaded from scripts
+and scheduled jobs. Heavy modules (fpdf, requests) are imported only by the
+commands that need them to keep start-up fast.
+
+Usage:
+    python -m cli list [--json]
+    python -m cli show "Project name" [--json]
+    python -m cli import projects_to_add.json [--skip-existing]
+    python -m cli import-steps "Project name" steps.xlsx [--templates]
+    python -m cli export [NAME ...] [-o projects_export.json]
+    python -m cli export-tables OUTPUT_DIR [--format csv|parquet]
+    python -m cli pdf "Project name" [-o estimate.pdf]
+    python -m cli pdf --all --output-dir reports/
+    python -m cli pdf --portfolio portfolio.pdf
+    python -m cli upload "Project name" [--dry-run] [--batched]
+    python -m cli calibrate [--min-samples 3] [--apply]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+
+def _manager(args):
+    """Return the ProjectManager selected by --data, or the application's one."""
+    if args.data:
+        from core.project_manager import ProjectManager
+        return ProjectManager(args.data)
+    from core.helpers.project_utils import get_project_manager
+    return get_project_manager()
+
+
+def _print_json(payload):
+    json.dump(payload, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+
+def _find(manager, name):
+    for project in manager.iter_projects():
+        if project.get("name") == name:
+            return project
+    raise SystemExit(f"Project not found: {name}")
+
+
+def _summary(project):
+    return {
+        "name": project.get("name", ""),
+        "area": project.get("area", ""),
+        "architect": project.get("architect", ""),
+        "demand": project.get("demand", ""),
+        "date": project.get("date", ""),
+        "steps": len(project.get("steps") or []),
+        "total": project.get("total", 0),
+    }
+
+
+# ---------- Commands ----------
+
+def cmd_list(args):
+    rows = [_summary(p) for p in _manager(args).iter_projects()]
+    if args.json:
+        _print_json(rows)
+        return 0
+    for row in rows:
+        print(f"{row['name']}\t{row['area']}\t{row['architect']}\t{row['demand']}\t"
+              f"{row['steps']} steps\t{float(row['total'] or 0):.1f} h")
+    return 0
+
+
+def cmd_show(args):
+    project = _find(_manager(args), args.name)
+    if args.json:
+        _print_json(project)
+        return 0
+    summary = _summary(project)
+    for key in ("name", "area", "architect", "demand", "date"):
+        print(f"{key.capitalize():<10} {summary[key]}")
+    print(f"{'Purpose':<10} {project.get('purpose', '')}")
+    print()
+    for step in project.get("steps") or []:
+        parent = f" <- {step['parent']}" if step.get("parent") else ""
+        print(f"  [{step.get('type') or 'Feature'}] {step.get('name', '')}{parent}: "
+              f"{float(step.get('hours') or 0):.1f} h")
+    print(f"\nTotal: {float(summary['total'] or 0):.1f} h")
+    return 0
+
+
+def cmd_search(args):
+    from core.search_index import get_search_index
+
+    hits = get_search_index(_manager(args)).search(args.query, args.limit)
+    if args.json:
+        _print_json(hits)
+        return 0
+    for hit in hits:
+        print(f"{hit['score']:>7.2f}\t{hit['name']}\t{hit['area']}\t{hit['architect']}\t{hit['steps']} steps")
+    return 0
+
+
+def cmd_import(args):
+    with open(args.file, "r", encoding="utf-8") as f:
+        incoming = json.load(f)
+    if isinstance(incoming, dict):
+        incoming = incoming.get("projects", [incoming])
+
+    manager = _manager(args)
+    projects = manager.load_projects()
+    index = {p.get("name"): i for i, p in enumerate(projects)}
+    added = replaced = skipped = 0
+    for project in incoming:
+        name = project.get("name")
+        if not name:
+            skipped += 1
+        elif name in index:
+            if args.skip_existing:
+                skipped += 1
+            else:
+                projects[index[name]] = project
+                replaced += 1
+        else:
+            index[name] = len(projects)
+            projects.append(project)
+            added += 1
+
+    manager.save_projects(projects)
+    result = {"added": added, "replaced": replaced, "skipped": skipped}
+    if args.json:
+        _print_json(result)
+    else:
+        print(f"Imported: {added} added, {replaced} replaced, {skipped} skipped")
+    return 0
+
+
+def cmd_import_steps(args):
+    from core.importer import import_steps, merge_into_templates
+
+    result = import_steps(args.file, sheet=args.sheet)
+    manager = _manager(args)
+    projects = manager.load_projects()
+    project = next((p for p in projects if p.get("name") == args.name), None)
+    if project is None:
+        project = {"name": args.name, "architect": "N/A", "area": "N/A", "demand": "N/A", "purpose": "", "steps": []}
+        projects.append(project)
+    project.setdefault("steps", []).extend(result.steps)
+    try:
+        from core.helpers.rollup import RollupTree
+        project["total"] = RollupTree.from_steps(project["steps"]).total
+    except ValueError:
+        pass  # Existing steps with invalid hours; keep the stored total
+    manager.save_projects(projects)
+
+    added = 0
+    if args.templates:
+        from core.helpers.template_utils import load_templates, save_templates
+        templates = load_templates()
+        added = merge_into_templates(result.steps, templates)
+        if added:
+            save_templates(templates)
+
+    summary = {**result.to_dict(), "templates_added": added}
+    if args.json:
+        _print_json(summary)
+    else:
+        for error in result.errors:
+            print(f"Skipped: {error}", file=sys.stderr)
+        print(f"Imported {summary['imported']} of {summary['rows']} row(s) into '{args.name}'"
+              + (f", {added} new template(s)" if args.templates else ""))
+    return 1 if result.errors else 0
+
+
+def cmd_export(args):
+    wanted = set(args.names)
+    projects = [p for p in _manager(args).iter_projects() if not wanted or p.get("name") in wanted]
+    missing = wanted - {p.get("name") for p in projects}
+    if missing:
+        print(f"Warning: not found: {', '.join(sorted(missing))}", file=sys.stderr)
+
+    if args.output == "-":
+        _print_json(projects)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(projects, f, indent=4, ensure_ascii=False)
+        if not args.json:
+            print(f"Exported {len(projects)} project(s) to {os.path.abspath(args.output)}")
+        else:
+            _print_json({"exported": len(projects), "path": os.path.abspath(args.output)})
+    return 0
+
+
+def cmd_export_tables(args):
+    from core.tabular_export import export_tables
+
+    try:
+        result = export_tables(_manager(args), args.output_dir, args.format, args.chunk_rows)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        _print_json(result)
+    else:
+        print(f"Exported {result['projects']} project(s) to {os.path.abspath(result['projects_path'])}")
+        print(f"Exported {result['steps']} step(s) to {os.path.abspath(result['steps_path'])}")
+    return 0
+
+
+def cmd_pdf(args):
+    manager = _manager(args)
+    if args.portfolio:
+        from core.portfolio_report import generate_portfolio_pdf
+        path = generate_portfolio_pdf(args.portfolio, manager)
+        if args.json:
+            _print_json({"path": path})
+        else:
+            print(f"Portfolio report saved at {path}")
+        return 0
+
+    if args.all:
+        from core.batch_export import export_all_pdfs
+
+        def progress(done, total, name, error):
+            if not args.json:
+                print(f"[{done}/{total}] {name}: {'FAILED: ' + error if error else 'ok'}")
+
+        result = export_all_pdfs(args.output_dir, manager=manager, workers=args.workers, progress=progress)
+        if args.json:
+            _print_json(result)
+        else:
+            print(f"Done: {len(result['written'])} written, {len(result['errors'])} failed "
+                  f"in {result['seconds']:.1f}s")
+        return 1 if result["errors"] else 0
+
+    if not args.name:
+        raise SystemExit("pdf: give a project name, --all or --portfolio")
+    from core.batch_export import pdf_filename
+    from core.pdf_generator import generate_pdf
+
+    project = _find(manager, args.name)
+    path = generate_pdf(project, args.output or pdf_filename(project))
+    if args.json:
+        _print_json({"path": path})
+    else:
+        print(f"PDF saved at {path}")
+    return 0
+
+
+def _devops_client(pat_required=True):
+    from dotenv import load_dotenv
+    from core.helpers.devops_client import DevOpsClient
+
+    load_dotenv()
+    pat = os.getenv("DEVOPS_PAT")
+    if not pat and pat_required:
+        raise SystemExit("DEVOPS_PAT is not configured (check your .env file)")
+    return DevOpsClient(
+        organization=os.getenv("DEVOPS_ORG", "BallCorporation"),
+        project=os.getenv("DEVOPS_PROJECT", "Automation and Digital Adoption"),
+        pat=pat or "",
+    )
+
+
+def cmd_upload(args):
+    manager = _manager(args)
+    project = _find(manager, args.name)
+    client = _devops_client(pat_required=not args.dry_run)
+
+    if args.dry_run:
+        plan = client.create_structure_from_json(project, dry_run=True)
+        if args.json:
+            _print_json(plan)
+        else:
+            print(f"Epic: {plan['epic']}")
+            print(f"Requests: {plan['request_count']}, total hours: {plan['total_hours']:.1f}")
+            for error in plan["errors"]:
+                print(f"ERROR: {error}")
+        return 1 if plan["errors"] else 0
+
+    upload = client.create_structure_batched if args.batched else client.create_structure_from_json
+    result = upload(project)
+
+    # Keep the work item links for later calibration, like the editor does
+    projects = manager.load_projects()
+    for stored in projects:
+        if stored.get("name") == project.get("name"):
+            stored["devops"] = result
+    manager.save_projects(projects)
+
+    if args.json:
+        _print_json(result)
+    else:
+        print(f"Upload complete: Epic #{result['epic']}, {len(result['items'])} work items")
+    return 0
+
+
+def cmd_calibrate(args):
+    from core.helpers.calibration import calibrate, suggest_template_hours
+    from core.helpers.template_utils import load_templates, save_templates
+
+    projects = [p for p in _manager(args).iter_projects() if (p.get("devops") or {}).get("items")]
+    if not projects:
+        raise SystemExit("No uploaded projects with DevOps work item links to calibrate against")
+    calibration = calibrate(_devops_client(), projects, max_workers=args.workers)
+    templates = load_templates()
+    suggestions = suggest_template_hours(templates, calibration, min_samples=args.min_samples)
+
+    if args.apply and suggestions:
+        suggested = {s["name"]: s["suggested"] for s in suggestions}
+        for tpl in templates:
+            if tpl.get("name") in suggested:
+                tpl["hours"] = f"{suggested[tpl['name']]:g}"  # Templates keep hours as entered text
+        save_templates(templates)
+
+    if args.json:
+        _print_json({"projects": len(projects), "applied": bool(args.apply and suggestions),
+                     "suggestions": suggestions})
+        return 0
+    print(f"Calibrated against {len(projects)} uploaded project(s)")
+    for s in suggestions:
+        print(f"{s['name']}\t{s['hours']:.1f} h -> {s['suggested']:.1f} h\t"
+              f"(actual/estimated {s['ratio']:.2f}, {s['samples']} samples)")
+    if not suggestions:
+        print(f"No template has {args.min_samples} or more completed work items yet")
+    elif args.apply:
+        print(f"Updated {len(suggestions)} template(s)")
+    else:
+        print("Run with --apply to update the templates")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Project Estimator command line")
+    parser.add_argument("--data", help="Path to a projects.json file (default: configured data folder)")
+    parser.add_argument("--json", action="store_true", help="Machine-readable JSON output")
+    # Also accepted after the command; SUPPRESS keeps a root-level --json when it is omitted there
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", default=argparse.SUPPRESS, help="Machine-readable JSON output")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="List stored projects", parents=[common])
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("show", help="Show one project", parents=[common])
+    p.add_argument("name")
+    p.set_defaults(func=cmd_show)
+
+    p = sub.add_parser("search", help="Full-text search over projects, steps and descriptions", parents=[common])
+    p.add_argument("query")
+    p.add_argument("--limit", type=int, default=20)
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("import", help="Import projects from a JSON file (replaces same names)", parents=[common])
+    p.add_argument("file")
+    p.add_argument("--skip-existing", action="store_true", help="Keep stored projects with the same name")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("import-steps", help="Append steps from a CSV / Excel file to a project", parents=[common])
+    p.add_argument("name", help="Project name (created if missing)")
+    p.add_argument("file")
+    p.add_argument("--sheet", help="Worksheet name (default: the active sheet)")
+    p.add_argument("--templates", action="store_true", help="Add new step names to templates")
+    p.set_defaults(func=cmd_import_steps)
+
+    p = sub.add_parser("export", help="Export projects to a JSON file", parents=[common])
+    p.add_argument("names", nargs="*", help="Project names (default: all)")
+    p.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("export-tables", help="Export projects and steps as flat CSV / Parquet tables", parents=[common])
+    p.add_argument("output_dir")
+    p.add_argument("--format", choices=("csv", "parquet"), default="csv")
+    p.add_argument("--chunk-rows", type=int, default=10_000, help="Rows buffered before each write")
+    p.set_defaults(func=cmd_export_tables)
+
+    p = sub.add_parser("pdf", help="Render PDF reports", parents=[common])
+    p.add_argument("name", nargs="?")
+    p.add_argument("-o", "--output", help="Output PDF path for a single project")
+    p.add_argument("--all", action="store_true", help="Render every project into --output-dir")
+    p.add_argument("--output-dir", default="reports")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--portfolio", metavar="PATH", help="Render the combined portfolio report")
+    p.set_defaults(func=cmd_pdf)
+
+    p = sub.add_parser("upload", help="Upload a project to Azure DevOps", parents=[common])
+    p.add_argument("name")
+    p.add_argument("--dry-run", action="store_true", help="Validate and print the upload plan only")
+    p.add_argument("--batched", action="store_true", help="Use $batch requests (faster)")
+    p.set_defaults(func=cmd_upload)
+
+    p = sub.add_parser("calibrate", help="Suggest template hours from the hours logged in DevOps", parents=[common])
+    p.add_argument("--min-samples", type=int, default=3, help="Completed work items needed per template")
+    p.add_argument("--apply", action="store_true", help="Write the suggested hours into the templates")
+    p.add_argument("--workers", type=int, default=4, help="Parallel DevOps requests")
+    p.set_defaults(func=cmd_calibrate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""core/analytics.py
+
+Portfolio analytics: total estimated hours by area, architect, demand and month.
+Aggregates are kept precomputed in a small JSON file next to the projects file
+and updated incrementally after every ProjectManager save, on a background
+thread: only projects whose contribution changed are subtracted and re-added,
+and only their rows are appended to a delta log (``<projects>_analytics.log``)
+that is folded into the JSON file once it grows. Ad-hoc group-bys over
+any combination of dimensions run vectorized with NumPy over a columnar view of
+the same per-project contributions, so queries never re-read projects.json.
+"""
+
+import logging
+import re
+
+import numpy as np
+
+from core.helpers.derived_store import DerivedStore
+from core.helpers.rollup import RollupTree
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("area", "architect", "demand", "month")
+UNKNOWN = "N/A"
+
+_MONTH_RE = re.compile(r"^(\d{4}-\d{2})")
+
+
+def project_hours(project: dict) -> float:
+    """Return a project's total hours (stored total, or the hierarchy rollup if missing or invalid)."""
+    try:
+        return float(project["total"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        return RollupTree.from_steps(project.get("steps") or []).total
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def contribution(project: dict) -> list:
+    """Return the ``[area, architect, demand, month, hours]`` row a project adds."""
+    match = _MONTH_RE.match(str(project.get("date") or ""))
+    return [
+        project.get("area") or UNKNOWN,
+        project.get("architect") or UNKNOWN,
+        project.get("demand") or UNKNOWN,
+        match.group(1) if match else UNKNOWN,
+        project_hours(project),
+    ]
+
+
+class PortfolioAnalytics(DerivedStore):
+    """Incrementally maintained hour aggregates for one projects file.
+
+    The instance registers itself as a save listener on the manager. If the
+    projects file was changed by something else (another machine on the share,
+    the CLI), the aggregates no longer match its version and are rebuilt from a
+    streaming read; this is checked on load and again before queries.
+    """
+
+    label = "analytics"
+
+    def __init__(self, manager, path=None):
+        """
+        Args:
+            manager: ProjectManager whose saves keep the aggregates current.
+            path: Aggregates file; defaults to ``<projects>_analytics.json``.
+        """
+        super().__init__(manager, path or manager.path.with_name(f"{manager.path.stem}_analytics.json"))
+
+    # ---------- Maintenance ----------
+
+    def _apply(self, row: list, sign: int):
+        self._totals[0] += sign
+        self._totals[1] += sign * row[4]
+        for dim, key in zip(DIMENSIONS, row):
+            groups = self._aggregates[dim]
+            entry = groups.setdefault(key, [0, 0.0])
+            entry[0] += sign
+            entry[1] += sign * row[4]
+            if entry[0] <= 0:
+                del groups[key]
+
+    def _reset(self):
+        self._rows = {}  # project name -> list of contribution rows (names may repeat)
+        self._aggregates = {dim: {} for dim in DIMENSIONS}  # key -> [count, hours]
+        self._totals = [0, 0.0]
+        self._frame = None
+
+    def _build(self, projects):
+        for project in projects:
+            row = contribution(project)
+            self._rows.setdefault(project.get("name") or "", []).append(row)
+            self._apply(row, +1)
+
+    def _restore(self, stored: dict) -> bool:
+        self._rows = stored["rows"]
+        self._aggregates = stored["aggregates"]
+        self._totals = stored["totals"]
+        return True
+
+    def _snapshot(self) -> dict:
+        return {"totals": self._totals, "aggregates": self._aggregates, "rows": self._rows}
+
+    def _entries(self) -> dict:
+        return self._rows
+
+    def _changed(self, name: str, group: list):
+        rows = [contribution(p) for p in group]
+        return rows if rows != self._rows.get(name) else None
+
+    def _apply_changes(self, changed: dict, removed: list):
+        for name in removed:
+            for row in self._rows.pop(name, ()):
+                self._apply(row, -1)
+        for name, rows in changed.items():
+            for row in self._rows.get(name, ()):
+                self._apply(row, -1)
+            for row in rows:
+                self._apply(row, +1)
+            self._rows[name] = rows
+        if changed or removed:
+            self._frame = None
+
+    # ---------- Queries ----------
+
+    def totals(self) -> dict:
+        """Return ``{"projects": count, "hours": total}`` for the whole portfolio."""
+        self._refresh_if_stale()
+        return {"projects": self._totals[0], "hours": round(self._totals[1], 6)}
+
+    def by(self, dimension: str) -> list:
+        """Return precomputed ``{"key", "projects", "hours"}`` rows for one dimension, largest first."""
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{dimension}' (expected one of {DIMENSIONS})")
+        self._refresh_if_stale()
+        groups = list(self._aggregates[dimension].items())
+        return [{"key": key, "projects": count, "hours": round(hours, 6)}
+                for key, (count, hours) in sorted(groups, key=lambda kv: (-kv[1][1], kv[0]))]
+
+    def _columns(self) -> dict:
+        """Columnar view of the contributions: per-dimension codes/labels and hours."""
+        with self._lock:
+            if self._frame is None:
+                rows = [row for group in self._rows.values() for row in group]
+                frame = {"hours": np.fromiter((r[4] for r in rows), dtype=np.float64, count=len(rows))}
+                for i, dim in enumerate(DIMENSIONS):
+                    values = [str(r[i]) for r in rows]
+                    labels = sorted(set(values))
+                    lookup = {label: code for code, label in enumerate(labels)}
+                    codes = np.fromiter((lookup[v] for v in values), dtype=np.int64, count=len(values))
+                    frame[dim] = (codes, np.array(labels, dtype=object))
+                self._frame = frame
+            return self._frame
+
+    def group_by(self, *dimensions: str, where: dict | None = None) -> list:
+        """Ad-hoc aggregation over one or more dimensions with optional equality filters.
+
+        Args:
+            dimensions: Dimensions to group by, e.g. ``("area", "month")``.
+            where: Optional ``{dimension: value}`` filters applied before grouping.
+
+        Returns:
+            List of ``{<dimension>: value, ..., "projects", "hours"}`` rows,
+            largest hours first.
+        """
+        for dim in list(dimensions) + list(where or {}):
+            if dim not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension '{dim}' (expected one of {DIMENSIONS})")
+        self._refresh_if_stale()
+        frame = self._columns()
+        hours = frame["hours"]
+        mask = np.ones(len(hours), dtype=bool)
+        for dim, value in (where or {}).items():
+            codes, labels = frame[dim]
+            index = np.searchsorted(labels, str(value))
+            if index >= len(labels) or labels[index] != str(value):
+                return []
+            mask &= codes == index
+
+        if not dimensions:
+            return [{"projects": int(mask.sum()), "hours": round(float(hours[mask].sum()), 6)}]
+
+        # Only label combinations that occur are materialized (never the Cartesian product)
+        codes = np.stack([frame[dim][0][mask] for dim in dimensions], axis=1)
+        if not len(codes):
+            return []
+        combos, inverse = np.unique(codes, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        counts = np.bincount(inverse, minlength=len(combos))
+        sums = np.bincount(inverse, weights=hours[mask], minlength=len(combos))
+
+        order = np.argsort(-sums, kind="stable")
+        columns = [frame[dim][1][combos[order, j]].tolist() for j, dim in enumerate(dimensions)]
+        result = []
+        for values, count, total in zip(zip(*columns), counts[order].tolist(), sums[order].tolist()):
+            row = dict(zip(dimensions, values))
+            row["projects"] = count
+            row["hours"] = round(total, 6)
+            result.append(row)
+        return result
+
+
+_instances = {}
+
+
+def get_analytics(manager=None) -> PortfolioAnalytics:
+    """Return the analytics instance for ``manager`` (the app's manager by default)."""
+    if manager is None:
+        from core.helpers.project_utils import get_project_manager
+        manager = get_project_manager()
+    key = str(manager.path.resolve())
+    if key not in _instances:
+        _instances[key] = PortfolioAnalytics(manager)
+    return _instances[key]
@@ -0,0 +1,306 @@
+"""core/api.py
+
+Async REST service over the project and template stores.
+Exposes paginated listings, single projects, PDF downloads and DevOps upload
+jobs with FastAPI. Responses carry an ETag derived from the JSON file version
+(modification time and size) and honour If-None-Match; large responses are
+gzip-compressed. Blocking work (parsing the share, rendering PDFs, talking to
+DevOps) runs in worker threads so the event loop never stalls.
+
+Run with:
+    uvicorn core.api:app --host 0.0.0.0 --port 8000
+    python -m core.api --port 8000
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
+
+from core.helpers.project_utils import get_project_manager
+from core.helpers.template_utils import get_template_manager, load_template_models
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 500
+UPLOAD_WORKERS = 2
+# Finished upload jobs are forgotten after this many seconds
+JOB_TTL = 24 * 3600
+
+
+class _StoreSnapshot:
+    """Parsed contents of a JSON store, reloaded only when the file version changes.
+
+    Stores are read through the typed models (core/models.py), so hours are
+    already floats for the PDF and DevOps code behind the endpoints.
+    """
+
+    def __init__(self, manager_getter, loader):
+        self._manager_getter = manager_getter
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._version = None
+        self._items = []
+        self._index = {}
+
+    def version(self) -> str:
+        """Return the current file version (hex mtime-size) without reading the file."""
+        st = os.stat(self._manager_getter().path)
+        return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+    def load(self) -> tuple:
+        """Return ``(version, items, index_by_name)``, re-parsing the file if it changed."""
+        with self._lock:
+            version = self.version()
+            if version != self._version:
+                items = self._loader(self._manager_getter())
+                self._items = items
+                self._index = {item.get("name"): item for item in items}
+                self._version = version
+                logger.debug(f"Reloaded store {self._manager_getter().path} ({len(items)} items)")
+            return self._version, self._items, self._index
+
+
+_projects = _StoreSnapshot(get_project_manager, lambda manager: manager.load_project_models())
+_templates = _StoreSnapshot(get_template_manager, load_template_models)
+
+_upload_pool = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="devops-upload")
+_jobs = {}
+_jobs_lock = threading.Lock()
+# Upload jobs finishing together must not overwrite each other's devops links
+_store_lock = threading.Lock()
+
+
+@asynccontextmanager
+async def _lifespan(_app):
+    yield
+    _upload_pool.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="Project Estimator API", lifespan=_lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+# ---------- Helpers ----------
+
+def _etag(version: str) -> str:
+    return f'W/"{version}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in header.split(",")] or header.strip() == "*"
+
+
+async def _snapshot(store: _StoreSnapshot, request: Request, response: Response):
+    """Resolve a store snapshot, or raise 304 when the client copy is current."""
+    version = await run_in_threadpool(store.version)
+    etag = _etag(version)
+    if _not_modified(request, etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return await run_in_threadpool(store.load)
+
+
+def _page(items: list, offset: int, limit: int, transform=None) -> dict:
+    page = items[offset:offset + limit]
+    return {
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "items": [transform(i) for i in page] if transform else page,
+    }
+
+
+def _project_summary(project: dict) -> dict:
+    return {
+        "name": project.get("name", ""),
+        "area": project.get("area", ""),
+        "architect": project.get("architect", ""),
+        "demand": project.get("demand", ""),
+        "date": project.get("date", ""),
+        "steps": len(project.get("steps") or []),
+        "total": project.get("total", 0),
+    }
+
+
+def _devops_client():
+    from dotenv import load_dotenv
+    from core.helpers.devops_client import DevOpsClient
+
+    load_dotenv()
+    pat = os.getenv("DEVOPS_PAT")
+    if not pat:
+        raise HTTPException(status_code=503, detail="DEVOPS_PAT is not configured")
+    return DevOpsClient(
+        organization=os.getenv("DEVOPS_ORG", "BallCorporation"),
+        project=os.getenv("DEVOPS_PROJECT", "Automation and Digital Adoption"),
+        pat=pat,
+    )
+
+
+def _project_for_upload(name: str) -> dict:
+    """Read ``name`` from the projects file and validate it whole.
+
+    The snapshot behind the read endpoints leaves out steps that fail
+    validation, so an upload from it would create an incomplete work item
+    tree and still report success.
+
+    Raises:
+        HTTPException: 404 if there is no such project, 422 if any of its
+            steps or values fail validation.
+    """
+    from core.models import parse_projects
+
+    project = None
+    for stored in get_project_manager().iter_projects():
+        if stored.get("name") == name:
+            project = stored  # The last one wins, as in the snapshot index
+    if project is None:
+        raise HTTPException(status_code=404, detail=f"Project not found: {name}")
+    errors = []
+    parsed = parse_projects(json.dumps([project]), errors)
+    if errors:
+        raise HTTPException(status_code=422, detail={
+            "message": f"Project '{name}' has values that fail validation; fix them before uploading",
+            "errors": [{"step": e["step"], "error": e["error"]} for e in errors],
+        })
+    return parsed[0]
+
+
+def _run_upload(job_id: str, client, project: dict, batched: bool):
+    """Worker-thread body of an upload job; stores the result on the project."""
+    job = _jobs[job_id]
+    job["status"] = "running"
+    try:
+        upload = client.create_structure_batched if batched else client.create_structure_from_json
+        result = upload(project)
+
+        manager = get_project_manager()
+        with _store_lock:
+            projects = manager.load_projects()
+            for stored in projects:
+                if stored.get("name") == project.get("name"):
+                    stored["devops"] = result
+            manager.save_projects(projects)
+
+        job.update(status="done", result=result)
+    except Exception as e:
+        logger.error(f"Upload job {job_id} failed: {e}")
+        job.update(status="failed", error=f"{type(e).__name__}: {e}")
+    finally:
+        job["finished"] = time.time()
+
+
+def _prune_jobs():
+    cutoff = time.time() - JOB_TTL
+    with _jobs_lock:
+        for job_id in [j for j, job in _jobs.items() if job.get("finished", time.time()) < cutoff]:
+            del _jobs[job_id]
+
+
+# ---------- Routes ----------
+
+@app.get("/projects")
+async def list_projects(request: Request, response: Response,
+                        offset: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+                        area: str | None = None, architect: str | None = None):
+    """Paginated project summaries, optionally filtered by area and architect."""
+    _, items, _ = await _snapshot(_projects, request, response)
+    if area or architect:
+        items = [p for p in items
+                 if (not area or p.get("area") == area) and (not architect or p.get("architect") == architect)]
+    return _page(items, offset, limit, _project_summary)
+
+
+@app.get("/projects/{name}")
+async def get_project(name: str, request: Request, response: Response):
+    """Full project document."""
+    _, _, index = await _snapshot(_projects, request, response)
+    if name not in index:
+        raise HTTPException(status_code=404, detail=f"Project not found: {name}")
+    return index[name]
+
+
+@app.get("/projects/{name}/pdf")
+async def get_project_pdf(name: str, request: Request):
+    """PDF estimate for a project (served from the PDF cache when unchanged)."""
+    from core.pdf_cache import project_cache_key, render_pdf_cached
+    from core.batch_export import pdf_filename
+
+    _, _, index = await run_in_threadpool(_projects.load)
+    project = index.get(name)
+    if project is None:
+        raise HTTPException(status_code=404, detail=f"Project not found: {name}")
+
+    etag = f'"{project_cache_key(project)}"'
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    data, _ = await run_in_threadpool(render_pdf_cached, project)
+    return Response(data, media_type="application/pdf", headers={
+        "ETag": etag,
+        "Content-Disposition": f'attachment; filename="{pdf_filename(project)}"',
+    })
+
+
+@app.post("/projects/{name}/upload", status_code=202)
+async def upload_project(name: str, response: Response, batched: bool = True, dry_run: bool = False):
+    """Start a DevOps upload job (or return the validated plan when ``dry_run``).
+
+    Returns 422 without uploading anything if part of the project fails validation.
+    """
+    project = await run_in_threadpool(_project_for_upload, name)
+
+    if dry_run:
+        from core.helpers.upload_plan import build_upload_plan
+        response.status_code = 200
+        return (await run_in_threadpool(build_upload_plan, project)).to_dict()
+
+    client = await run_in_threadpool(_devops_client)
+    _prune_jobs()
+    job_id = uuid.uuid4().hex
+    with _jobs_lock:
+        _jobs[job_id] = {"id": job_id, "project": name, "status": "queued", "created": time.time()}
+    _upload_pool.submit(_run_upload, job_id, client, project, batched)
+    response.headers["Location"] = f"/jobs/{job_id}"
+    return _jobs[job_id]
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of an upload job: queued, running, done (with result) or failed."""
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@app.get("/templates")
+async def list_templates(request: Request, response: Response,
+                         offset: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE)):
+    """Paginated step templates."""
+    _, items, _ = await _snapshot(_templates, request, response)
+    return _page(items, offset, limit)
+
+
+def main(argv=None):
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the Project Estimator REST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
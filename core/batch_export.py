@@ -0,0 +1,139 @@
+"""core/batch_export.py
+
+Batch PDF export for a whole portfolio.
+Reads every project from the ProjectManager and renders one PDF per project
+with core.pdf_generator across a process pool sized to the available cores.
+Progress and per-file errors are reported through a callback.
+
+Command line:
+    python -m core.batch_export OUTPUT_DIR [--workers N]
+"""
+
+import argparse
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from core.pdf_generator import PdfRenderer
+
+logger = logging.getLogger(__name__)
+
+# Below this many projects the process pool start-up costs more than it saves
+MIN_PARALLEL_PROJECTS = 8
+
+_worker_renderer = None
+
+
+def pdf_filename(project: dict) -> str:
+    """Return the PDF file name used for a project (same pattern as the editor)."""
+    name = (project.get("name") or "Untitled Project").strip()
+    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", name)
+    return f"{name.replace(' ', '_')}_estimate.pdf"
+
+
+def _unique_destinations(projects: list, target_dir: Path) -> list:
+    """Return one destination per project, suffixing duplicate file names."""
+    used = {}
+    destinations = []
+    for project in projects:
+        filename = pdf_filename(project)
+        count = used.get(filename.lower(), 0)
+        used[filename.lower()] = count + 1
+        if count:
+            stem, ext = os.path.splitext(filename)
+            filename = f"{stem}_{count + 1}{ext}"
+        destinations.append(str(target_dir / filename))
+    return destinations
+
+
+def _init_worker():
+    """Create one renderer per worker process so the logo is decoded once per core."""
+    global _worker_renderer
+    _worker_renderer = PdfRenderer()
+
+
+def _render_one(project: dict, destination: str) -> tuple:
+    """Render a single project; returns (name, path, error) and never raises."""
+    global _worker_renderer
+    if _worker_renderer is None:
+        _init_worker()
+    name = project.get("name", "Untitled Project")
+    try:
+        return name, _worker_renderer.render_to_file(project, destination), None
+    except Exception as e:
+        return name, destination, f"{type(e).__name__}: {e}"
+
+
+def export_all_pdfs(target_dir, manager=None, workers: int | None = None, progress=None) -> dict:
+    """Render a PDF for every stored project into ``target_dir``.
+
+    Args:
+        target_dir: Output directory (created if missing).
+        manager: ProjectManager to read from; defaults to the application's one.
+        workers: Number of worker processes; defaults to the number of cores.
+        progress: Optional callback ``progress(done, total, name, error)`` called
+            after each file (``error`` is None on success).
+
+    Returns:
+        Dictionary with "written" (list of paths), "errors" (list of
+        {"name", "path", "error"}) and "seconds" (wall time).
+    """
+    if manager is None:
+        from core.helpers.project_utils import get_project_manager
+        manager = get_project_manager()
+
+    started = time.perf_counter()
+    target_dir = Path(target_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    projects = manager.load_project_models()  # Hours already floats; nothing is saved back
+    destinations = _unique_destinations(projects, target_dir)
+    total = len(projects)
+    written, errors = [], []
+
+    def record(done, result):
+        name, path, error = result
+        if error:
+            logger.error(f"Failed to export '{name}' to {path}: {error}")
+            errors.append({"name": name, "path": path, "error": error})
+        else:
+            written.append(path)
+        if progress:
+            progress(done, total, name, error)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or total < MIN_PARALLEL_PROJECTS:
+        for done, (project, destination) in enumerate(zip(projects, destinations), start=1):
+            record(done, _render_one(project, destination))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, total), initializer=_init_worker) as pool:
+            futures = [pool.submit(_render_one, p, d) for p, d in zip(projects, destinations)]
+            for done, future in enumerate(as_completed(futures), start=1):
+                record(done, future.result())
+
+    seconds = time.perf_counter() - started
+    logger.info(f"Exported {len(written)}/{total} PDFs to {target_dir} in {seconds:.1f}s")
+    return {"written": written, "errors": errors, "seconds": seconds}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a PDF for every stored project")
+    parser.add_argument("target_dir", help="Directory that receives the PDF files")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    def progress(done, total, name, error):
+        status = f"FAILED: {error}" if error else "ok"
+        print(f"[{done}/{total}] {name}: {status}")
+
+    result = export_all_pdfs(args.target_dir, workers=args.workers, progress=progress)
+    print(f"Done: {len(result['written'])} written, {len(result['errors'])} failed "
+          f"in {result['seconds']:.1f}s")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
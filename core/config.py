@@ -6,6 +6,8 @@ paths for templates and projects JSON files. If the network path cannot be
 created, the module falls back to a local data directory.
 """
 
+import os
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -45,3 +47,15 @@ except Exception as e:
 # Paths for the JSON files
 TEMPLATES_PATH = DATA_DIR / "templates.json"
 PROJECTS_PATH = DATA_DIR / "projects.json"
+
+
+def _user_cache_dir() -> Path:
+    """Per-user local cache folder: %LOCALAPPDATA% on Windows, XDG_CACHE_HOME or ~/.cache elsewhere."""
+    if sys.platform == "win32" and os.getenv("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "ProjectEstimator" / "Cache"
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "ProjectEstimator"
+
+
+# Machine-local cache directory (never on the network share). Not under PROJECT_ROOT:
+# in the one-file build that is the temporary extraction folder of the current launch.
+CACHE_DIR = _user_cache_dir()
@@ -0,0 +1,328 @@
+"""core/draft_journal.py
+
+Crash-recovery journal for the estimate being edited.
+
+Unsaved work only exists in the editor's controls, and the only way to
+persist it is a full save_projects() rewrite on the (possibly network) data
+folder. The journal instead appends every edit as a one-line JSON record to a
+local file in the user's cache folder (CACHE_DIR/drafts):
+
+    {"t": "begin", "fields": [...], "steps": [[id, [...]], ...]}  # full snapshot
+    {"t": "field", "k": "area", "v": "Finance"}
+    {"t": "step", "id": 12, "v": {"hours": "16"}}                 # changed values only
+    {"t": "add", "id": 13, "v": [...]}
+    {"t": "del", "id": 12}
+
+Records are computed by diffing consecutive editor snapshots
+(core/helpers/history.py), which costs O(changed steps), and are written
+with one small sequential append each; fsync runs on a background thread
+once per second. After ``compact_every`` records the journal is compacted:
+a background thread writes the current snapshot to a new file and the old
+one is deleted, so replay stays short. The snapshot is written lazily, on
+the first edit after a project is loaded or saved; a journal file therefore
+only exists while there is unsaved work.
+
+Every editor instance writes its own file and holds an OS lock on it. On
+startup, files that no running instance holds are unsaved drafts left by a
+crash (or by closing without saving) and can be restored.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from core.config import CACHE_DIR
+from core.helpers.history import PROJECT_FIELDS, EditorState, StepState, StepTrie
+
+try:  # Windows
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DRAFT_DIR = CACHE_DIR / "drafts"
+SUFFIX = ".draft.jsonl"
+COMPACT_EVERY = 2000  # Records before the journal is rewritten as one snapshot
+SYNC_INTERVAL = 1.0   # Seconds between background fsyncs
+
+
+def draft_dir() -> Path:
+    return Path(os.getenv("ESTIMATOR_DRAFT_DIR") or DEFAULT_DRAFT_DIR)
+
+
+def _try_lock(f) -> bool:
+    """Take a non-blocking exclusive lock on an open file; False if another process holds it."""
+    try:
+        if msvcrt is not None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _line(record: dict) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _begin_record(state: EditorState) -> dict:
+    return {"t": "begin", "fields": list(state.fields),
+            "steps": [[step_id, list(step)] for step_id, step in state.steps.items()]}
+
+
+def _edit_records(before: EditorState, after: EditorState) -> list:
+    """Records turning snapshot ``before`` into ``after``."""
+    records = []
+    if before.fields is not after.fields:
+        for name, old, new in zip(PROJECT_FIELDS, before.fields, after.fields):
+            if old != new:
+                records.append({"t": "field", "k": name, "v": new})
+    for step_id, old, new in before.steps.diff(after.steps):
+        if new is None:
+            records.append({"t": "del", "id": step_id})
+        elif old is None:
+            records.append({"t": "add", "id": step_id, "v": list(new)})
+        else:
+            records.append({"t": "step", "id": step_id,
+                            "v": {k: v for k, v, o in zip(StepState._fields, new, old) if v != o}})
+    return records
+
+
+def replay(lines) -> EditorState | None:
+    """Rebuild the editor snapshot from journal lines (None if there is no snapshot).
+
+    A torn last line (the process died mid-write) ends the replay.
+    """
+    state = None
+    for raw in lines:
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            break
+        kind = record.get("t")
+        if kind == "begin":
+            state = EditorState(tuple(record["fields"]),
+                                StepTrie.from_items((i, StepState(*v)) for i, v in record["steps"]))
+        elif state is None:
+            continue
+        elif kind == "field":
+            state = state.with_field(record["k"], record["v"])
+        elif kind == "add":
+            state = state.with_step(record["id"], StepState(*record["v"]))
+        elif kind == "step":
+            old = state.steps.get(record["id"])
+            if old is not None:
+                state = state.with_step(record["id"], old._replace(**record["v"]))
+        elif kind == "del":
+            state = state.without_step(record["id"])
+    return state
+
+
+class DraftJournal:
+    """Append-only journal of one editor session's unsaved edits."""
+
+    def __init__(self, directory=None, compact_every: int = COMPACT_EVERY, sync_interval: float = SYNC_INTERVAL):
+        """
+        Args:
+            directory: Local folder for the journals (default: ESTIMATOR_DRAFT_DIR or CACHE_DIR/drafts).
+            compact_every: Records appended before the journal is compacted.
+            sync_interval: Seconds between fsyncs of the journal file.
+        """
+        self.directory = Path(directory) if directory else draft_dir()
+        self.compact_every = compact_every
+        self.session = f"{os.getpid()}-{time.time_ns()}"
+        self._lock = threading.Lock()
+        self._state = EditorState()
+        self._file = None
+        self._path = None
+        self._records = 0
+        self._generation = 0
+        self._epoch = 0         # Bumped by begin(); an older compaction is abandoned
+        self._pending = None    # Lines appended while a compaction writes the new file
+        self._unsynced = False
+        self._closed = threading.Event()
+        threading.Thread(target=self._sync_loop, args=(sync_interval,), name="draft-journal", daemon=True).start()
+
+    @property
+    def path(self) -> Path | None:
+        """The current journal file (None while there is nothing unsaved)."""
+        return self._path
+
+    # ---------- Writing ----------
+
+    def begin(self, state: EditorState, unsaved: bool = False):
+        """Start from ``state``, e.g. a project just loaded or saved.
+
+        Nothing is written until the next edit, unless ``unsaved`` is set (a
+        restored draft), in which case the snapshot is journaled right away.
+        """
+        with self._lock:
+            self._epoch += 1
+            self._state = state
+            self._pending = [] if unsaved else None
+            self._drop_file()
+            epoch = self._epoch
+        if unsaved:
+            self._compact(state, epoch)
+
+    def update(self, state: EditorState):
+        """Journal the difference between the last state and ``state`` (History on_change hook)."""
+        with self._lock:
+            before, self._state = self._state, state
+            records = _edit_records(before, state)
+            if not records:
+                return
+            if self._file is None and self._pending is None:
+                # First edit since the last begin(): the new file starts from a full snapshot
+                self._start_compaction(state)
+                return
+            for record in records:
+                self._append(_line(record))
+            if self._pending is None and self._records >= self.compact_every:
+                self._start_compaction(state)
+
+    def _append(self, line: bytes):
+        if self._pending is not None:
+            self._pending.append(line)
+            return
+        try:
+            self._file.write(line)
+            self._file.flush()  # One small sequential write; fsync happens in the background
+            self._records += 1
+            self._unsynced = True
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not write draft journal {self._path}: {e}")
+
+    def _start_compaction(self, state: EditorState):
+        self._pending = []
+        threading.Thread(target=self._compact, args=(state, self._epoch), daemon=True).start()
+
+    def _compact(self, state: EditorState, epoch: int):
+        """Write ``state`` as a new journal file, append what arrived meanwhile and swap files."""
+        with self._lock:
+            self._generation += 1
+            path = self.directory / f"{self.session}.{self._generation}{SUFFIX}"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            new_file = open(path, "ab")
+            _try_lock(new_file)
+            new_file.write(_line(_begin_record(state)))
+            new_file.flush()
+            os.fsync(new_file.fileno())
+        except OSError as e:
+            logger.error(f"Could not write draft journal {path}: {e}")
+            with self._lock:
+                if epoch == self._epoch:
+                    self._pending = None  # The next edit tries again with a full snapshot
+            return
+
+        with self._lock:
+            if epoch != self._epoch:  # begin() was called meanwhile: this draft is obsolete
+                new_file.close()
+                path.unlink(missing_ok=True)
+                return
+            pending, self._pending = self._pending or [], None
+            self._drop_file()
+            self._file, self._path, self._records = new_file, path, 0
+            for line in pending:
+                self._append(line)
+        logger.debug(f"Draft journal compacted into {path.name}")
+
+    def _drop_file(self):
+        """Close and delete the current journal file (caller holds the lock)."""
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+            self._path.unlink()
+        except OSError as e:
+            logger.warning(f"Could not remove draft journal {self._path}: {e}")
+        self._file = self._path = None
+        self._records = 0
+        self._unsynced = False
+
+    def _sync_loop(self, interval: float):
+        while not self._closed.wait(interval):
+            self.sync()
+
+    def sync(self):
+        """fsync the journal if anything was written since the last sync."""
+        with self._lock:
+            if self._file is None or not self._unsynced:
+                return
+            self._unsynced = False
+            fd = os.dup(self._file.fileno())  # fsync outside the lock: typing never waits for the disk
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            logger.warning(f"Could not sync draft journal: {e}")
+        finally:
+            os.close(fd)
+
+    def close(self):
+        """Flush and release the journal; an unsaved draft stays on disk for recovery."""
+        self._closed.set()
+        self.sync()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# ---------- Recovery ----------
+
+def find_drafts(directory=None) -> list:
+    """Return the unsaved drafts left by editor sessions that are no longer running.
+
+    Returns:
+        Newest first, ``{"path", "name", "steps", "modified", "state"}``
+        dictionaries; ``state`` is the EditorState to restore.
+    """
+    directory = Path(directory) if directory else draft_dir()
+    sessions = {}
+    for path in directory.glob(f"*{SUFFIX}"):
+        session, _, generation = path.name[:-len(SUFFIX)].rpartition(".")
+        sessions.setdefault(session, []).append((int(generation or 0), path))
+
+    drafts = []
+    for files in sessions.values():
+        files.sort()
+        handles = []
+        try:
+            for _, path in files:
+                f = open(path, "rb")
+                handles.append(f)
+                if not _try_lock(f):
+                    break  # A running editor owns this session
+            else:
+                newest = handles[-1]
+                newest.seek(0)
+                state = replay(newest)
+                for (_, path), f in zip(files[:-1], handles):  # Left over by a compaction cut short
+                    f.close()
+                    path.unlink(missing_ok=True)
+                path = files[-1][1]
+                if state is not None:
+                    drafts.append({"path": path, "name": state.field("name"), "steps": len(state.steps),
+                                   "modified": path.stat().st_mtime, "state": state})
+        except OSError as e:
+            logger.warning(f"Could not read draft journal {files[-1][1]}: {e}")
+        finally:
+            for f in handles:
+                f.close()
+    return sorted(drafts, key=lambda d: d["modified"], reverse=True)
+
+
+def discard_draft(draft: dict):
+    """Delete a recovered draft's journal."""
+    try:
+        Path(draft["path"]).unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not delete draft journal {draft['path']}: {e}")
@@ -0,0 +1,154 @@
+"""core/estimation.py
+
+Three-point (PERT) Monte Carlo estimation.
+A step's ``hours`` is its most likely value; the optional ``hours_optimistic``
+and ``hours_pessimistic`` fields turn it into a Beta-PERT distribution (a
+missing bound defaults to the likely value). Only the leaves of the
+Feature -> User Story -> Task rollup are sampled, since groups are the sum of
+their children.
+
+Sampling is vectorized with NumPy. Each distinct (optimistic, likely,
+pessimistic) triple gets a table of equiprobable quantiles (no SciPy needed).
+A trial then picks one random quantile per step, so a batch of trials is one
+random-byte draw, one gather and one row sum.
+"""
+
+import numpy as np
+
+from core.helpers.rollup import RollupTree
+
+PERCENTILES = (50, 80, 95)
+DEFAULT_TRIALS = 100_000
+# Quantiles per distribution; a trial draws one byte per step to pick one
+QUANTILES = 256
+_GRID = 4096
+_CHUNK_CELLS = 250_000  # trials x sampled steps per batch (keeps buffers in cache)
+
+
+def _to_hours(value, default):
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+def step_range(step: dict) -> tuple:
+    """Return ``(optimistic, likely, pessimistic)`` hours for a step.
+
+    Missing bounds default to the likely value; bounds on the wrong side of
+    the likely value are clamped to it.
+
+    Raises:
+        ValueError: If any of the hour fields is not a number.
+    """
+    likely = _to_hours(step.get("hours"), 0.0)
+    optimistic = min(_to_hours(step.get("hours_optimistic"), likely), likely)
+    pessimistic = max(_to_hours(step.get("hours_pessimistic"), likely), likely)
+    return optimistic, likely, pessimistic
+
+
+def leaf_ranges(steps: list, tree: RollupTree | None = None) -> np.ndarray:
+    """Return an ``(n, 3)`` array of ranges for the rollup leaves of ``steps``.
+
+    Args:
+        steps: The project's steps.
+        tree: ``RollupTree.from_steps(steps)`` if the caller already built it.
+    """
+    tree = tree if tree is not None else RollupTree.from_steps(steps)
+    leaves = [index for index, _, _, is_group in tree.rows() if not is_group]
+    return np.array([step_range(steps[i]) for i in leaves], dtype=np.float64).reshape(-1, 3)
+
+
+def pert_quantiles(ranges: np.ndarray, quantiles: int = QUANTILES) -> np.ndarray:
+    """Return a ``(n, quantiles)`` float32 table of Beta-PERT quantiles per range.
+
+    The Beta(alpha, beta) CDF is integrated numerically on a fixed grid; alpha
+    and beta stay within [1, 5] for PERT, so the density is bounded.
+    """
+    a, m, b = ranges[:, 0:1], ranges[:, 1:2], ranges[:, 2:3]
+    width = b - a
+    safe = np.where(width > 0, width, 1.0)
+    alpha = 1 + 4 * (m - a) / safe
+    beta = 1 + 4 * (b - m) / safe
+
+    x = (np.arange(_GRID) + 0.5) / _GRID
+    log_pdf = (alpha - 1) * np.log(x) + (beta - 1) * np.log1p(-x)
+    pdf = np.exp(log_pdf - log_pdf.max(axis=1, keepdims=True))
+    cdf = np.cumsum(pdf, axis=1)
+    cdf /= cdf[:, -1:]
+
+    levels = (np.arange(quantiles) + 0.5) / quantiles
+    unit = np.empty((len(ranges), quantiles))
+    for row in range(len(ranges)):
+        unit[row] = np.interp(levels, cdf[row], x)
+    return (a + unit * width).astype(np.float32)
+
+
+def simulate_totals(ranges: np.ndarray, trials: int = DEFAULT_TRIALS, seed=None) -> np.ndarray:
+    """Sample ``trials`` project totals for the given leaf ranges.
+
+    Args:
+        ranges: ``(n, 3)`` array of (optimistic, likely, pessimistic) hours.
+        trials: Number of simulated projects.
+        seed: Seed for reproducible results (e.g. in PDF reports).
+
+    Returns:
+        Float64 array with one total per trial.
+    """
+    ranges = np.asarray(ranges, dtype=np.float64).reshape(-1, 3)
+    uncertain = ranges[:, 2] > ranges[:, 0]
+    fixed = float(ranges[~uncertain, 1].sum())
+    totals = np.full(trials, fixed)
+    if not uncertain.any():
+        return totals
+
+    # One quantile table per distinct triple (steps from the same template share it)
+    unique, inverse = np.unique(ranges[uncertain], axis=0, return_inverse=True)
+    table = pert_quantiles(unique).ravel()
+    offsets = (inverse.reshape(-1) * QUANTILES).astype(np.int32)
+
+    rng = np.random.default_rng(seed)
+    n = len(offsets)
+    chunk = max(1, min(trials, _CHUNK_CELLS // n))
+    index = np.empty((chunk, n), dtype=np.int32)
+    values = np.empty((chunk, n), dtype=np.float32)
+    for start in range(0, trials, chunk):
+        rows = min(chunk, trials - start)
+        picks = np.frombuffer(rng.bytes(rows * n), dtype=np.uint8).reshape(rows, n)
+        np.add(picks, offsets, out=index[:rows], casting="unsafe")
+        np.take(table, index[:rows], out=values[:rows])
+        totals[start:start + rows] += values[:rows].sum(axis=1, dtype=np.float64)
+    return totals
+
+
+def estimate_project(project: dict, trials: int = DEFAULT_TRIALS, seed=None,
+                     percentiles=PERCENTILES, tree: RollupTree | None = None) -> dict:
+    """Run the Monte Carlo simulation for a project.
+
+    Without any optimistic / pessimistic range every trial has the same
+    total, so nothing is sampled and all the statistics are that total.
+
+    Args:
+        tree: ``RollupTree.from_steps`` of the project's steps, if already built.
+
+    Returns:
+        Dictionary with "trials", "mean", "min", "max", "has_ranges" and one
+        "p<N>" entry per requested percentile (e.g. "p80").
+    """
+    ranges = leaf_ranges(project.get("steps") or [], tree)
+    has_ranges = bool((ranges[:, 2] > ranges[:, 0]).any())
+    if not has_ranges:
+        total = float(ranges[:, 1].sum()) if trials else 0.0
+        result = {"trials": trials, "has_ranges": False, "mean": total, "min": total, "max": total}
+        result.update((f"p{p}", total) for p in percentiles)
+        return result
+    totals = simulate_totals(ranges, trials, seed)
+    result = {
+        "trials": trials,
+        "has_ranges": has_ranges,
+        "mean": float(totals.mean()) if trials else 0.0,
+        "min": float(totals.min()) if trials else 0.0,
+        "max": float(totals.max()) if trials else 0.0,
+    }
+    for p, value in zip(percentiles, np.percentile(totals, percentiles) if trials else [0.0] * len(percentiles)):
+        result[f"p{p}"] = float(value)
+    return result
@@ -0,0 +1,185 @@
+"""core/helpers/calibration.py
+
+Estimate calibration against the hours actually logged in Azure DevOps.
+Projects uploaded with create_structure_from_json keep a name -> work item ID
+mapping under their "devops" key. This module fetches the completed-work fields
+of all linked items in bulk (with a local TTL cache) and computes
+estimated-versus-actual ratios per template name, which can be used to suggest
+new template hours.
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+
+from core.config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+COMPLETED_WORK = "Microsoft.VSTS.Scheduling.CompletedWork"
+ORIGINAL_ESTIMATE = "Microsoft.VSTS.Scheduling.OriginalEstimate"
+STATE = "System.State"
+ACTUAL_FIELDS = [COMPLETED_WORK, ORIGINAL_ESTIMATE, STATE]
+
+DEFAULT_CACHE_PATH = CACHE_DIR / "devops_actuals.json"
+DEFAULT_TTL = 6 * 3600  # seconds
+
+
+class ActualsCache:
+    """Local JSON cache of work item fields with a time-to-live per entry."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL):
+        """
+        Args:
+            path: JSON file used to persist the cache.
+            ttl: Seconds after which a cached entry is fetched again.
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return {int(k): v for k, v in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable actuals cache {self.path}: {e}")
+            return {}
+
+    def save(self):
+        """Persist the cache to disk."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+        except Exception as e:
+            logger.error(f"Error saving actuals cache {self.path}: {e}")
+
+    def get(self, wid: int, now: float | None = None):
+        """Return the cached fields for ``wid`` or None if missing/expired."""
+        entry = self._entries.get(int(wid))
+        now = time.time() if now is None else now
+        if entry is None or now - entry["fetched"] > self.ttl:
+            return None
+        return entry["fields"]
+
+    def put(self, wid: int, fields: dict, now: float | None = None):
+        self._entries[int(wid)] = {"fetched": time.time() if now is None else now, "fields": fields}
+
+
+def linked_work_item_ids(projects: list) -> list:
+    """Return all work item IDs recorded under the projects' "devops" key."""
+    ids = []
+    for project in projects:
+        ids.extend((project.get("devops") or {}).get("items", {}).values())
+    return ids
+
+
+def fetch_actuals(client, ids, cache: ActualsCache | None = None, max_workers: int = 4) -> dict:
+    """Return {work item id: fields} for ``ids``, using the cache where fresh.
+
+    Only missing or expired entries are requested, in bulk through
+    DevOpsClient.get_work_items_bulk; the cache is saved once at the end.
+
+    Args:
+        client: DevOpsClient used for the requests.
+        ids: Work item IDs to resolve.
+        cache: Optional ActualsCache; a default one is used if omitted.
+        max_workers: Concurrent chunk fetches.
+    """
+    cache = cache or ActualsCache()
+    result, missing = {}, []
+    for wid in dict.fromkeys(int(i) for i in ids):
+        fields = cache.get(wid)
+        if fields is None:
+            missing.append(wid)
+        else:
+            result[wid] = fields
+
+    if missing:
+        logger.debug(f"Fetching {len(missing)} work items from DevOps ({len(result)} cached)")
+        now = time.time()
+        for item in client.get_work_items_bulk(missing, ACTUAL_FIELDS, max_workers=max_workers):
+            fields = item.get("fields", {})
+            cache.put(item["id"], fields, now)
+            result[int(item["id"])] = fields
+        cache.save()
+    return result
+
+
+def compute_calibration(projects: list, actuals: dict) -> dict:
+    """Compute estimated-versus-actual ratios per template (step) name.
+
+    Only steps linked to a work item with completed work logged are counted.
+
+    Args:
+        projects: Project dictionaries with "steps" and a "devops" mapping.
+        actuals: {work item id: fields} as returned by fetch_actuals.
+
+    Returns:
+        {template name (lowercase): {"name", "estimated", "actual", "ratio", "samples"}}
+    """
+    stats = {}
+    for project in projects:
+        links = (project.get("devops") or {}).get("items", {})
+        if not links:
+            continue
+        for step in project.get("steps", []):
+            wid = links.get(step.get("name"))
+            fields = actuals.get(int(wid)) if wid is not None else None
+            if not fields or fields.get(COMPLETED_WORK) is None:
+                continue
+            try:
+                estimated = float(step.get("hours") or 0)
+                actual = float(fields[COMPLETED_WORK] or 0)
+            except (TypeError, ValueError):
+                continue
+            if estimated <= 0:
+                continue
+
+            key = step["name"].strip().lower()
+            entry = stats.setdefault(key, {"name": step["name"].strip(), "estimated": 0.0,
+                                           "actual": 0.0, "samples": 0})
+            entry["estimated"] += estimated
+            entry["actual"] += actual
+            entry["samples"] += 1
+
+    for entry in stats.values():
+        entry["ratio"] = entry["actual"] / entry["estimated"]
+    return stats
+
+
+def suggest_template_hours(templates: list, calibration: dict, min_samples: int = 3) -> list:
+    """Return suggested hours for templates with enough calibration samples.
+
+    Templates are not modified; callers decide whether to apply the suggestions.
+
+    Returns:
+        List of {"name", "hours", "suggested", "ratio", "samples"} dictionaries.
+    """
+    suggestions = []
+    for tpl in templates:
+        entry = calibration.get(tpl.get("name", "").strip().lower())
+        if not entry or entry["samples"] < min_samples:
+            continue
+        try:
+            hours = float(tpl.get("hours") or 0)
+        except (TypeError, ValueError):
+            continue
+        suggestions.append({
+            "name": tpl["name"],
+            "hours": hours,
+            "suggested": round(hours * entry["ratio"], 1),
+            "ratio": round(entry["ratio"], 3),
+            "samples": entry["samples"],
+        })
+    return suggestions
+
+
+def calibrate(client, projects: list, cache: ActualsCache | None = None, max_workers: int = 4) -> dict:
+    """Fetch actuals for every linked project and return the per-template calibration."""
+    actuals = fetch_actuals(client, linked_work_item_ids(projects), cache, max_workers)
+    return compute_calibration(projects, actuals)
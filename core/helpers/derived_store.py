@@ -0,0 +1,235 @@
+"""core/helpers/derived_store.py
+
+Base class for data derived from a projects file and kept current by its
+saves (portfolio analytics, the search index).
+
+The derived state is stored in a JSON file next to the projects file, with
+the version (modification time and size) of the projects file it describes.
+Every ProjectManager save is queued for a background worker so the save
+itself does not wait; the worker derives entries only for projects that are
+not the same objects as in the previous save, applies the names whose entry
+changed and appends just those to a delta log that is folded into the JSON
+file once it grows past a fraction of it. When the projects file was changed
+by something else (another machine on the share, the CLI) its version no
+longer matches and the state is rebuilt from a streaming read; this is
+checked on load and again before queries.
+
+Subclasses keep one entry per project name and implement ``_reset``,
+``_build``, ``_restore``, ``_snapshot``, ``_entries``, ``_changed`` and
+``_apply_changes``.
+"""
+
+import atexit
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from threading import Condition, Lock, Thread
+
+logger = logging.getLogger(__name__)
+
+COMPACT_RATIO = 0.25        # Fold the delta log into the JSON file beyond this fraction of its size
+STALE_CHECK_INTERVAL = 2.0  # Seconds between checks for saves made elsewhere
+
+
+def file_version(path) -> list | None:
+    """Return ``[mtime_ns, size]`` of ``path``, or None if it cannot be read."""
+    try:
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
+
+
+class DerivedStore:
+    """Derived per-project-name state of one projects file, maintained in the background."""
+
+    label = "derived data"  # Used in thread names and log messages
+
+    def __init__(self, manager, path: Path):
+        """
+        Args:
+            manager: ProjectManager whose saves keep the state current.
+            path: JSON file the state is stored in; the delta log uses the ``.log`` suffix.
+        """
+        self.manager = manager
+        self.path = Path(path)
+        self.log_path = self.path.with_suffix(".log")
+        self._lock = Lock()    # Guards the state read by queries
+        self._update = Lock()  # Serializes rebuilds and background updates
+        self._source_version = None  # Version of the projects file the state describes
+        self._checked = 0.0
+        self._seen = {}      # name -> project objects from the last processed save
+        self._queued = None  # (projects, file version) not processed yet; older saves are superseded
+        self._busy = False
+        self._work = Condition()
+        self._reset()
+        self._load()
+        manager.add_save_listener(self.on_save)
+        Thread(target=self._worker, name=self.label.replace(" ", "-"), daemon=True).start()
+        atexit.register(self.flush, 10.0)
+
+    # ---------- Subclass hooks ----------
+
+    def _reset(self):
+        """Clear the state."""
+        raise NotImplementedError
+
+    def _build(self, projects):
+        """Fill the cleared state from an iterable of every project."""
+        raise NotImplementedError
+
+    def _restore(self, stored: dict) -> bool:
+        """Load the state from the stored JSON; False if it has an outdated format."""
+        raise NotImplementedError
+
+    def _snapshot(self) -> dict:
+        """Return the state to store (``source_version`` is added)."""
+        raise NotImplementedError
+
+    def _entries(self) -> dict:
+        """Return the current ``name -> entry`` mapping."""
+        raise NotImplementedError
+
+    def _changed(self, name: str, group: list):
+        """Return the new entry for the projects named ``name``, or None if it did not change."""
+        raise NotImplementedError
+
+    def _apply_changes(self, changed: dict, removed: list):
+        """Replace the entries in ``changed`` and drop the names in ``removed``."""
+        raise NotImplementedError
+
+    # ---------- Maintenance ----------
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if self._restore(stored):
+                self._source_version = self._replay_log(stored.get("source_version"))
+                if self._source_version == file_version(self.manager.path):
+                    return
+            logger.info(f"{self.label.capitalize()} of {self.manager.path} is out of date; rebuilding")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not read {self.label} file {self.path}: {e}")
+        self.rebuild()
+
+    def _replay_log(self, source_version):
+        """Apply the delta log written since the JSON file; returns the newest source version."""
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        delta = json.loads(line)
+                    except ValueError:
+                        break  # Torn last line: that save is missing, so the version will not match
+                    self._apply_changes(delta["set"], delta["del"])
+                    source_version = delta["source_version"]
+        except FileNotFoundError:
+            pass
+        return source_version
+
+    def rebuild(self):
+        """Recompute the whole state from a streaming read of the projects file."""
+        with self._update:
+            with self._lock:
+                self._source_version = file_version(self.manager.path)
+                self._seen = {}
+                self._reset()
+                self._build(self.manager.iter_projects())
+            # The state only changes under self._update, so queries need not wait for the write
+            self._persist()
+        logger.info(f"{self.label.capitalize()} rebuilt: {len(self._entries())} project name(s)")
+
+    def on_save(self, projects: list):
+        """Save listener: queue the saved list for the background worker and return."""
+        version = file_version(self.manager.path)  # The file as this save wrote it
+        with self._work:
+            self._queued = (projects, version)
+            self._work.notify()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued save is applied; False on timeout."""
+        with self._work:
+            return self._work.wait_for(lambda: self._queued is None and not self._busy, timeout)
+
+    def _worker(self):
+        while True:
+            with self._work:
+                self._work.wait_for(lambda: self._queued is not None)
+                (projects, version), self._queued = self._queued, None
+                self._busy = True
+            try:
+                with self._update:
+                    self._apply_save(projects, version)
+            except Exception as e:
+                logger.error(f"{self.label.capitalize()} update failed for {self.manager.path}: {e}")
+            finally:
+                with self._work:
+                    self._busy = False
+                    self._work.notify_all()
+
+    def _apply_save(self, projects: list, source_version):
+        """Apply only the entries that changed and log only those."""
+        groups = {}
+        for project in projects:
+            groups.setdefault(project.get("name") or "", []).append(project)
+
+        # Entries are only derived for project objects not seen in the previous
+        # save (a save replaces edited projects with new dictionaries)
+        changed = {}
+        for name, group in groups.items():
+            previous = self._seen.get(name)
+            if previous is not None and len(previous) == len(group) and all(a is b for a, b in zip(previous, group)):
+                continue
+            entry = self._changed(name, group)
+            if entry is not None:
+                changed[name] = entry
+        self._seen = groups
+
+        with self._lock:
+            removed = [n for n in self._entries() if n not in groups]
+            self._apply_changes(changed, removed)
+            self._source_version = source_version
+        # The state only changes under self._update (held by the caller), so queries need not wait for the write
+        self._append_log({"source_version": source_version, "set": changed, "del": removed})
+        logger.debug(f"{self.label.capitalize()} updated incrementally "
+                     f"({len(changed) + len(removed)} changed project name(s))")
+
+    def _append_log(self, delta: dict):
+        """Append one save's changes; fold the log into the JSON file once it is large."""
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(delta, ensure_ascii=False, separators=(",", ":")) + "\n")
+            if self.log_path.stat().st_size > COMPACT_RATIO * max(self.path.stat().st_size, 1 << 20):
+                self._persist()
+        except OSError as e:
+            logger.warning(f"Could not update {self.label} log {self.log_path}: {e}")
+
+    def _persist(self):
+        """Write the whole state and drop the delta log."""
+        stored = {"source_version": self._source_version, **self._snapshot()}
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(stored, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+            self.log_path.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not save {self.label} file {self.path}: {e}")
+
+    def _refresh_if_stale(self):
+        """Rebuild when the projects file was saved elsewhere (checked every few seconds)."""
+        now = time.monotonic()
+        if now - self._checked < STALE_CHECK_INTERVAL:
+            return
+        self._checked = now
+        with self._work:
+            if self._queued is not None or self._busy:
+                return  # One of our own saves is still being applied
+        if file_version(self.manager.path) != self._source_version:
+            logger.info(f"{self.manager.path} changed elsewhere; rebuilding {self.label}")
+            self.rebuild()
@@ -6,8 +6,19 @@ Provides functionality to upload project data as a structured hierarchy
 """
 
 import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
+from core.helpers.request_scheduler import RequestScheduler, get_request_scheduler
+from core.helpers.upload_plan import build_upload_plan
+from core.metrics import timed
+
+
+# Maximum number of sub-requests accepted by the work item $batch endpoint
+BATCH_LIMIT = 200
+
 
 class DevOpsClient:
     """Client for interacting with Azure DevOps REST API.
@@ -16,19 +27,51 @@ class DevOpsClient:
     management in Azure DevOps.
     """
 
-    def __init__(self, organization: str, project: str, pat: str):
+    def __init__(self, organization: str, project: str, pat: str,
+                 scheduler: RequestScheduler | None = None,
+                 base_url: str = "https://dev.azure.com"):
         """Initialize the DevOps client with organization and authentication details.
 
         Args:
             organization: Azure DevOps organization name.
             project: Azure DevOps project name.
             pat: Personal Access Token for authentication.
+            scheduler: Optional request scheduler; defaults to the shared one so
+                every client in the process respects the same rate limits.
+            base_url: Service root URL (override to target a local stand-in server).
         """
         self.organization = organization
         self.project = project
         self.pat = pat
         self.auth = base64.b64encode(f":{pat}".encode()).decode()
+        self.scheduler = scheduler or get_request_scheduler()
+        self.base_url = base_url.rstrip("/")
+
+    def _headers(self, content_type: str) -> dict:
+        return {
+            "Content-Type": content_type,
+            "Authorization": f"Basic {self.auth}",
+        }
+
+    def _work_item_ops(self, fields: dict, parent_id: int = None) -> list:
+        """Build the JSON-patch operations that create a work item."""
+        ops = [
+            {"op": "add", "path": f"/fields/{key}", "value": value}
+            for key, value in fields.items()
+        ]
+
+        if parent_id:
+            ops.append({
+                "op": "add",
+                "path": "/relations/-",
+                "value": {
+                    "rel": "System.LinkTypes.Hierarchy-Reverse",
+                    "url": f"{self.base_url}/{self.organization}/{self.project}/_apis/wit/workitems/{parent_id}"
+                }
+            })
+        return ops
 
+    @timed("devops.create_work_item")
     def create_work_item(self, w_type: str, fields: dict, parent_id: int = None) -> dict:
         """Create a work item in Azure DevOps.
 
@@ -41,35 +84,19 @@ class DevOpsClient:
             Dictionary containing the created work item details including ID.
 
         Raises:
-            HTTPError: If the DevOps API returns an error status code.
+            HTTPError: If the DevOps API returns an error status code
+                (after throttling retries are exhausted).
         """
         url = (
-            f"https://dev.azure.com/{self.organization}/{self.project}"
+            f"{self.base_url}/{self.organization}/{self.project}"
             f"/_apis/wit/workitems/${w_type}?api-version=7.0"
         )
 
-        ops = [
-            {"op": "add", "path": f"/fields/{key}", "value": value}
-            for key, value in fields.items()
-        ]
-
-        if parent_id:
-            ops.append({
-                "op": "add",
-                "path": "/relations/-",
-                "value": {
-                    "rel": "System.LinkTypes.Hierarchy-Reverse",
-                    "url": f"https://dev.azure.com/{self.organization}/{self.project}/_apis/wit/workitems/{parent_id}"
-                }
-            })
-
-        response = requests.patch(
+        response = self.scheduler.send(
+            "PATCH",
             url,
-            json=ops,
-            headers={
-                "Content-Type": "application/json-patch+json",
-                "Authorization": f"Basic {self.auth}",
-            },
+            json=self._work_item_ops(fields, parent_id),
+            headers=self._headers("application/json-patch+json"),
         )
 
         if response.status_code >= 400:
@@ -79,92 +106,229 @@ class DevOpsClient:
         response.raise_for_status()
         return response.json()
 
-    def create_structure_from_json(self, data: dict) -> dict:
+    @timed("devops.create_work_items_batch")
+    def create_work_items_batch(self, items: list) -> list:
+        """Create several work items with a single call to the $batch endpoint.
+
+        Args:
+            items: List of (w_type, fields, parent_id) tuples, at most
+                BATCH_LIMIT entries.
+
+        Returns:
+            List of created work item dictionaries, in request order.
+
+        Raises:
+            HTTPError: If the batch call or any of its sub-requests fails, or
+                if the response does not hold one result per request.
+        """
+        url = f"{self.base_url}/{self.organization}/_apis/wit/$batch?api-version=7.0"
+        body = [
+            {
+                "method": "PATCH",
+                "uri": f"/{self.project}/_apis/wit/workitems/${w_type}?api-version=7.0",
+                "headers": {"Content-Type": "application/json-patch+json"},
+                "body": self._work_item_ops(fields, parent_id),
+            }
+            for w_type, fields, parent_id in items
+        ]
+
+        response = self.scheduler.send("POST", url, json=body, headers=self._headers("application/json"))
+        if response.status_code >= 400:
+            print("❌ DevOps error:", response.text)
+        response.raise_for_status()
+
+        replies = response.json().get("value", [])
+        if len(replies) != len(items):
+            raise requests.HTTPError(f"DevOps batch returned {len(replies)} result(s) for {len(items)} "
+                                     f"request(s); the missing items may not have been created",
+                                     response=response)
+        results = []
+        for sub in replies:
+            payload = sub.get("body")
+            if isinstance(payload, str):
+                payload = json.loads(payload) if payload else {}
+            if sub.get("code", 200) >= 400:
+                raise requests.HTTPError(f"DevOps batch item failed (HTTP {sub.get('code')}): {payload}",
+                                         response=response)
+            results.append(payload)
+        return results
+
+    def get_work_items(self, ids: list, fields: list | None = None) -> list:
+        """Fetch up to BATCH_LIMIT work items with a single workitemsbatch call.
+
+        Args:
+            ids: Work item IDs to fetch.
+            fields: Optional list of field reference names to return.
+
+        Returns:
+            List of work item dictionaries (items that no longer exist are omitted).
+
+        Raises:
+            HTTPError: If the DevOps API returns an error status code.
+        """
+        url = (
+            f"{self.base_url}/{self.organization}/{self.project}"
+            f"/_apis/wit/workitemsbatch?api-version=7.0"
+        )
+        body = {"ids": list(ids), "errorPolicy": "Omit"}
+        if fields:
+            body["fields"] = list(fields)
+
+        response = self.scheduler.send("POST", url, json=body, headers=self._headers("application/json"))
+        if response.status_code >= 400:
+            print("❌ DevOps error:", response.text)
+        response.raise_for_status()
+        return [item for item in response.json().get("value", []) if item]
+
+    def get_work_items_bulk(self, ids, fields: list | None = None, max_workers: int = 4) -> list:
+        """Fetch any number of work items in BATCH_LIMIT-sized chunks, concurrently.
+
+        Chunks are fetched from a small thread pool; every request still goes
+        through the shared scheduler, so rate limits are respected.
+
+        Args:
+            ids: Iterable of work item IDs (duplicates are ignored).
+            fields: Optional list of field reference names to return.
+            max_workers: Number of chunks fetched in parallel.
+
+        Returns:
+            List of work item dictionaries.
+        """
+        unique = list(dict.fromkeys(int(i) for i in ids))
+        chunks = [unique[i:i + BATCH_LIMIT] for i in range(0, len(unique), BATCH_LIMIT)]
+        if len(chunks) <= 1:
+            return self.get_work_items(chunks[0], fields) if chunks else []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(lambda chunk: self.get_work_items(chunk, fields), chunks)
+            return [item for chunk in results for item in chunk]
+
+    def create_structure_from_json(self, data: dict, dry_run: bool = False) -> dict:
         """Create a hierarchical work item structure in Azure DevOps from project data.
 
-        Creates an Epic at the top level, then creates Features, User Stories, and Tasks
-        based on the project steps, establishing proper parent-child relationships.
+        The project is first validated offline into an upload plan (see
+        core/helpers/upload_plan.py), so broken parent links or duplicate names
+        are reported before the Epic or any other item is created. Then an Epic
+        is created at the top level, followed by Features, User Stories, and
+        Tasks with proper parent-child relationships.
 
         Args:
             data: Project data dictionary containing:
                 - demand: Demand/requirement ID
                 - name: Project name
                 - steps: List of step dictionaries with name, type, parent, and hours
+            dry_run: If True, only build and return the plan; no request is sent.
 
         Returns:
             Dictionary containing:
                 - epic: ID of the created Epic
                 - items: Dictionary mapping step names to their work item IDs
+            In dry-run mode, the plan dictionary (items, request_count,
+            total_hours and errors) is returned instead.
 
         Raises:
-            ValueError: If a User Story or Task references a non-existent parent item.
+            ValueError: If the plan has errors (e.g., a User Story or Task
+                references a non-existent parent item).
         """
-        area_path = f"{self.project}\\Digital Delivery Team"
-        iteration_path = f"{self.project}\\{self.project}"
-
-        # Create Epic automatically
-        epic_title = f"{data['demand']} - {data['name']}"
-        epic = self.create_work_item(
-            "Epic",
-            {
-                "System.Title": epic_title,
-                "System.AreaPath": area_path,
-                "System.IterationPath": iteration_path
-            }
-        )
-
-        print(f"✅ Epic created: #{epic['id']} - {epic_title}")
+        plan = build_upload_plan(data)
+        if dry_run:
+            return plan.to_dict()
+        if not plan.is_valid:
+            raise ValueError("; ".join(plan.errors))
 
+        epic = self._create_epic(plan)
         created = {}  # name -> id mapping
 
-        def create_item(step, parent_id):
-            """Helper to create a work item with the given parent."""
-            fields = {
-                "System.Title": step["name"],
-                "System.AreaPath": area_path,
-                "System.IterationPath": iteration_path,
-            }
-
-            if step["type"] == "Task":
-                fields["Microsoft.VSTS.Scheduling.OriginalEstimate"] = float(step.get("hours", 0))
+        # Plan items are ordered Features -> User Stories -> Tasks,
+        # so every parent already exists when its children are created
+        for item in plan.items:
+            parent_id = created[item.parent] if item.parent else epic["id"]
+            wi = self.create_work_item(item.type, self._item_fields(item), parent_id)
+            created[item.name] = wi["id"]
 
-            wi = self.create_work_item(step["type"], fields, parent_id)
-            created[step["name"]] = wi["id"]
+            print(f"✅ {item.type} created: #{wi['id']} - {item.name}")
 
-            print(f"✅ {step['type']} created: #{wi['id']} - {step['name']}")
-
-        # Step 1: Create Features under Epic
-        for step in data["steps"]:
-            if step["type"] == "Feature":
-                create_item(step, epic["id"])
-
-        # Step 2: Create User Stories under Features
-        for step in data["steps"]:
-            if step["type"] == "User Story":
-                parent_name = step.get("parent")
-                parent_id = created.get(parent_name)
+        return {
+            "epic": epic["id"],
+            "items": created
+        }
 
-                if not parent_id:
-                    raise ValueError(f"User Story '{step['name']}' has no valid parent Feature")
+    def create_structure_batched(self, data: dict, batch_size: int = BATCH_LIMIT) -> dict:
+        """Faster upload mode that creates each hierarchy level through $batch calls.
 
-                create_item(step, parent_id)
+        Produces the same structure as create_structure_from_json, but sends
+        one request for the Epic plus one request per ``batch_size`` items of
+        each level instead of one request per item.
 
-        # Step 3: Create Tasks under User Stories
-        for step in data["steps"]:
-            if step["type"] == "Task":
-                parent_name = step.get("parent")
-                parent_id = created.get(parent_name)
+        Args:
+            data: Project data dictionary (same format as create_structure_from_json).
+            batch_size: Items per $batch call (capped at BATCH_LIMIT).
 
-                if not parent_id:
-                    raise ValueError(f"Task '{step['name']}' has no valid parent User Story")
+        Returns:
+            Dictionary with the Epic ID and a name -> work item ID mapping.
 
-                create_item(step, parent_id)
+        Raises:
+            ValueError: If the upload plan has errors.
+        """
+        plan = build_upload_plan(data)
+        if not plan.is_valid:
+            raise ValueError("; ".join(plan.errors))
+
+        batch_size = max(1, min(batch_size, BATCH_LIMIT))
+        epic = self._create_epic(plan)
+        created = {}
+
+        # Items of one level only depend on the level above, which is complete
+        for level in ("Feature", "User Story", "Task"):
+            items = [item for item in plan.items if item.type == level]
+            for start in range(0, len(items), batch_size):
+                chunk = items[start:start + batch_size]
+                results = self.create_work_items_batch([
+                    (item.type, self._item_fields(item),
+                     created[item.parent] if item.parent else epic["id"])
+                    for item in chunk
+                ])
+                for item, wi in zip(chunk, results, strict=True):
+                    created[item.name] = wi["id"]
+            if items:
+                print(f"✅ {len(items)} {level} item(s) created")
 
         return {
             "epic": epic["id"],
             "items": created
         }
 
+    def _area_paths(self) -> tuple:
+        return f"{self.project}\\Digital Delivery Team", f"{self.project}\\{self.project}"
+
+    def _item_fields(self, item) -> dict:
+        """Build the DevOps fields for an upload plan item."""
+        area_path, iteration_path = self._area_paths()
+        fields = {
+            "System.Title": item.name,
+            "System.AreaPath": area_path,
+            "System.IterationPath": iteration_path,
+        }
+
+        if item.type == "Task":
+            fields["Microsoft.VSTS.Scheduling.OriginalEstimate"] = item.hours
+        return fields
+
+    def _create_epic(self, plan) -> dict:
+        """Create the Epic that roots an upload plan."""
+        area_path, iteration_path = self._area_paths()
+        epic = self.create_work_item(
+            "Epic",
+            {
+                "System.Title": plan.epic_title,
+                "System.AreaPath": area_path,
+                "System.IterationPath": iteration_path
+            }
+        )
+
+        print(f"✅ Epic created: #{epic['id']} - {plan.epic_title}")
+        return epic
+
     # Alias for backwards compatibility with Portuguese method name
     def criar_estrutura_desde_json(self, data: dict) -> dict:
         """Portuguese alias for create_structure_from_json for backwards compatibility."""
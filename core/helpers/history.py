@@ -0,0 +1,274 @@
+"""core/helpers/history.py
+
+Undo / redo for the estimate editor built on persistent snapshots.
+
+An editor state is immutable: the project fields plus a ``StepTrie``, a
+persistent 32-way trie of steps keyed by the editor's step id. Changing one
+step copies only the path to it (three 32-slot tuples for ids below 32768)
+and shares everything else with the previous state, so a snapshot per edit
+costs about a kilobyte whatever the size of the estimate, where a deep copy
+of a 2,000-step project would cost megabytes.
+
+``History`` keeps the snapshots on two bounded stacks; undo and redo only
+move one reference between them (O(1)). Consecutive edits with the same key
+(one field of one step) are coalesced into a single entry until ``seal()``
+is called, which the editor does when the field loses focus. ``diff()``
+compares two snapshots and skips every subtree they share, so applying an
+undo to the UI only touches the steps that actually changed.
+"""
+
+from collections import deque
+from typing import NamedTuple
+
+BITS = 5
+WIDTH = 1 << BITS  # Children per trie node
+MASK = WIDTH - 1
+DEFAULT_LIMIT = 500  # Undo entries kept; the oldest are dropped beyond it
+
+PROJECT_FIELDS = ("name", "architect", "area", "demand", "purpose")
+_EMPTY_NODE = (None,) * WIDTH
+
+
+class StepState(NamedTuple):
+    """Values of one step row, as shown in the editor (hours are field text)."""
+
+    name: str = ""
+    description: str = ""
+    hours: str = ""
+    hours_optimistic: str = ""
+    hours_pessimistic: str = ""
+    type: str = "Feature"
+    parent: str | None = None
+
+
+def _set(node, shift, key, value):
+    """Return a copy of ``node`` with ``key`` set (``value`` None deletes); None when empty."""
+    node = node or _EMPTY_NODE
+    i = (key >> shift) & MASK
+    child = value if shift == 0 else _set(node[i], shift - BITS, key, value)
+    if child is node[i]:
+        return node  # Nothing changed below: keep sharing this node
+    node = node[:i] + (child,) + node[i + 1:]
+    return None if child is None and node == _EMPTY_NODE else node
+
+
+def _items(node, shift):
+    if shift == 0:
+        for value in node:
+            if value is not None:
+                yield value
+        return
+    for child in node:
+        if child is not None:
+            yield from _items(child, shift - BITS)
+
+
+def _key_items(node, shift, base):
+    for i, child in enumerate(node):
+        if child is None:
+            continue
+        key = base | (i << shift)
+        if shift == 0:
+            yield key, child
+        else:
+            yield from _key_items(child, shift - BITS, key)
+
+
+def _diff(a, b, shift, base, out):
+    for i in range(WIDTH):
+        x = a[i] if a is not None else None
+        y = b[i] if b is not None else None
+        if x is y:
+            continue
+        key = base | (i << shift)
+        if shift == 0:
+            if x != y:
+                out.append((key, x, y))
+        else:
+            _diff(x, y, shift - BITS, key, out)
+
+
+class StepTrie:
+    """Persistent mapping of non-negative int keys to steps, iterated in key order.
+
+    Every update returns a new trie; the old one stays valid and shares all
+    untouched nodes with the new one.
+    """
+
+    __slots__ = ("_root", "_shift", "_count")
+
+    def __init__(self, root=None, shift=0, count=0):
+        self._root = root
+        self._shift = shift
+        self._count = count
+
+    @classmethod
+    def from_items(cls, items) -> "StepTrie":
+        trie = cls()
+        for key, value in items:
+            trie = trie.set(key, value)
+        return trie
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        """Yield the values in key order."""
+        if self._root is not None:
+            yield from _items(self._root, self._shift)
+
+    def items(self):
+        if self._root is not None:
+            yield from _key_items(self._root, self._shift, 0)
+
+    def get(self, key, default=None):
+        if key < 0 or key >> (self._shift + BITS):
+            return default
+        node, shift = self._root, self._shift
+        while node is not None and shift > 0:
+            node = node[(key >> shift) & MASK]
+            shift -= BITS
+        value = node[key & MASK] if node is not None else None
+        return default if value is None else value
+
+    def set(self, key: int, value) -> "StepTrie":
+        """Return a trie with ``key`` mapped to ``value`` (O(log32 n) new nodes)."""
+        if value is None:
+            raise ValueError("StepTrie values cannot be None")
+        if key < 0:
+            raise KeyError(key)
+        root, shift = self._root, self._shift
+        while key >> (shift + BITS):  # Grow a level until the key fits
+            root = (root,) + (None,) * (WIDTH - 1) if root is not None else None
+            shift += BITS
+        existed = self.get(key) is not None
+        if existed and self.get(key) is value:
+            return self
+        return StepTrie(_set(root, shift, key, value), shift, self._count + (0 if existed else 1))
+
+    def delete(self, key: int) -> "StepTrie":
+        """Return a trie without ``key`` (the same trie when it is absent)."""
+        if self.get(key) is None:
+            return self
+        return StepTrie(_set(self._root, self._shift, key, None), self._shift, self._count - 1)
+
+    def diff(self, other: "StepTrie") -> list:
+        """Return ``(key, old, new)`` for every key whose value differs, in key order.
+
+        ``old`` is None for keys only in ``other`` and ``new`` is None for keys
+        only in this trie. Subtrees shared by both tries are skipped.
+        """
+        a, b = self._root, other._root
+        shift = max(self._shift, other._shift)
+        for _ in range(self._shift, shift, BITS):  # Bring both roots to the same height
+            a = (a,) + (None,) * (WIDTH - 1) if a is not None else None
+        for _ in range(other._shift, shift, BITS):
+            b = (b,) + (None,) * (WIDTH - 1) if b is not None else None
+        out = []
+        if a is not b:
+            _diff(a, b, shift, 0, out)
+        return out
+
+
+class EditorState(NamedTuple):
+    """Immutable snapshot of the editor: project fields plus steps by id."""
+
+    fields: tuple = ("",) * len(PROJECT_FIELDS)
+    steps: StepTrie = StepTrie()
+
+    def field(self, name: str) -> str:
+        return self.fields[PROJECT_FIELDS.index(name)]
+
+    def with_field(self, name: str, value: str) -> "EditorState":
+        i = PROJECT_FIELDS.index(name)
+        if self.fields[i] == value:
+            return self
+        return self._replace(fields=self.fields[:i] + (value,) + self.fields[i + 1:])
+
+    def with_step(self, step_id: int, step: StepState) -> "EditorState":
+        steps = self.steps.set(step_id, step) if self.steps.get(step_id) != step else self.steps
+        return self if steps is self.steps else self._replace(steps=steps)
+
+    def without_step(self, step_id: int) -> "EditorState":
+        steps = self.steps.delete(step_id)
+        return self if steps is self.steps else self._replace(steps=steps)
+
+
+class History:
+    """Bounded undo / redo stacks of ``EditorState`` snapshots."""
+
+    def __init__(self, state: EditorState = None, limit: int = DEFAULT_LIMIT, on_change=None):
+        """
+        Args:
+            state: Initial snapshot.
+            limit: Undo entries kept.
+            on_change: Called with the new current state after every commit,
+                undo and redo (not after reset()).
+        """
+        self.current = state if state is not None else EditorState()
+        self.on_change = on_change
+        self._undo = deque(maxlen=limit)  # Oldest entries fall off the far end
+        self._redo = []
+        self._open_key = None
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change(self.current)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    def reset(self, state: EditorState):
+        """Start a new history at ``state`` (e.g. after loading another project)."""
+        self.current = state
+        self._undo.clear()
+        self._redo.clear()
+        self._open_key = None
+
+    def commit(self, state: EditorState, key=None):
+        """Make ``state`` current, recording the previous state for undo.
+
+        Args:
+            state: The new snapshot.
+            key: Identifies the edited field; successive commits with the same
+                key replace the open entry instead of adding one, until seal().
+        """
+        if state is self.current:
+            return
+        if key is None or key != self._open_key:
+            self._undo.append(self.current)
+        self.current = state
+        self._redo.clear()
+        self._open_key = key
+        self._changed()
+
+    def seal(self):
+        """Close the open entry so the next edit starts a new one."""
+        self._open_key = None
+
+    def undo(self) -> EditorState | None:
+        """Step back one entry; returns the restored state, or None when there is none."""
+        if not self._undo:
+            return None
+        self._redo.append(self.current)
+        self.current = self._undo.pop()
+        self._open_key = None
+        self._changed()
+        return self.current
+
+    def redo(self) -> EditorState | None:
+        if not self._redo:
+            return None
+        self._undo.append(self.current)
+        self.current = self._redo.pop()
+        self._open_key = None
+        self._changed()
+        return self.current
@@ -0,0 +1,183 @@
+"""core/helpers/pdf_stream.py
+
+Concatenate PDF documents into one output stream without keeping them.
+
+FPDF builds the whole document in memory until output(), so a report with
+thousands of pages is rendered as a series of smaller documents instead.
+``PdfStreamWriter`` copies each one into the destination as soon as it is
+added: its objects are renumbered after the ones already written and its
+pages are re-parented under a single page tree that is written on close().
+Only the byte offset of every object and the list of page references are
+kept, in compact arrays of eight bytes per entry, so memory does not depend
+on the content already written.
+
+Only the dictionaries are rewritten; stream data is copied unchanged. The
+parser expects documents as written by FPDF (classic xref table, no object
+streams), which is all this application produces.
+"""
+
+import re
+from array import array
+
+_STARTXREF = re.compile(rb"startxref\s+(\d+)\s+%%EOF\s*$")
+_OBJ_HEADER = re.compile(rb"(\d+) 0 obj\s")
+_REF = re.compile(rb"\b(\d+) 0 R\b")
+_VERSION = re.compile(rb"%PDF-(\d\.\d)")
+
+PAGES_ID, CATALOG_ID, INFO_ID = 1, 2, 3  # Reserved object numbers of the combined file
+
+
+def _entry(body: bytes, key: bytes) -> bytes | None:
+    """Return the raw value of ``/key`` in a dictionary body (up to the next key)."""
+    match = re.search(rb"/" + key + rb"\s+(\[[^\]]*\]|\d+ 0 R|[^/>\n]+)", body)
+    return match.group(1).strip() if match else None
+
+
+def _renumber(head: bytes, numbers: dict[int, int]) -> bytes:
+    """Rewrite the ``N 0 R`` references of a dictionary, leaving literal strings as they are.
+
+    A link URI or annotation text may well contain "5 0 R"; only references
+    outside ``( ... )`` strings (which nest and use backslash escapes) change.
+    """
+    def renumber(match):
+        return b"%d 0 R" % numbers[int(match.group(1))]
+
+    parts = []
+    position = 0
+    while (start := head.find(b"(", position)) >= 0:
+        parts.append(_REF.sub(renumber, head[position:start]))
+        depth, end = 0, start
+        while end < len(head):
+            char = head[end:end + 1]
+            if char == b"\\":
+                end += 1
+            elif char == b"(":
+                depth += 1
+            elif char == b")":
+                depth -= 1
+                if depth == 0:
+                    break
+            end += 1
+        parts.append(head[start:end + 1])
+        position = end + 1
+    parts.append(_REF.sub(renumber, head[position:]))
+    return b"".join(parts)
+
+
+def _objects(data: bytes):
+    """Yield ``(number, body)`` for every object of an FPDF document, plus the trailer."""
+    match = _STARTXREF.search(data[-64:])
+    if match is None:
+        raise ValueError("Not a PDF document with a classic xref table")
+    xref = int(match.group(1))
+    lines = data[xref:].split(b"\n", 2)
+    count = int(lines[1].split()[1])
+    table = lines[2]
+    offsets = []
+    for n in range(1, count):  # Entry 0 is the free-list head
+        entry = table[n * 20:(n + 1) * 20]
+        if entry[17:18] == b"n":
+            offsets.append((int(entry[:10]), n))
+    offsets.sort()
+    ends = [start for start, _ in offsets[1:]] + [xref]
+    for (start, number), end in zip(offsets, ends):
+        header = _OBJ_HEADER.match(data, start)
+        body = data[header.end():end].rstrip()
+        if body.endswith(b"endobj"):
+            body = body[:-len(b"endobj")].rstrip()
+        yield number, body
+    trailer = data[xref:data.rindex(b"startxref")]
+    yield None, trailer[trailer.index(b"trailer"):]
+
+
+class PdfStreamWriter:
+    """Write several PDF documents into ``stream`` as one document."""
+
+    def __init__(self, stream):
+        """
+        Args:
+            stream: Binary stream the combined PDF is written to (sequentially).
+        """
+        self.stream = stream
+        self._position = 0
+        self._offsets = array("q", [-1] * (INFO_ID + 1))  # byte offset by object number (-1: not written)
+        self._next_id = INFO_ID + 1
+        self._pages = array("q")  # object numbers of the pages, in order
+        self._header = None   # Version written in the file header
+        self._version = None  # Highest version among the added documents
+        self._info = None
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pages)
+
+    def _write(self, chunk: bytes):
+        self.stream.write(chunk)
+        self._position += len(chunk)
+
+    def _write_object(self, number: int, body: bytes):
+        if number >= len(self._offsets):  # Objects are numbered in the order they are written
+            self._offsets.extend([-1] * (number + 1 - len(self._offsets)))
+        self._offsets[number] = self._position
+        self._write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+    def add(self, data: bytes):
+        """Append every page of the PDF document ``data``."""
+        data = bytes(data)
+        version = _VERSION.match(data)
+        version = version.group(1).decode() if version else "1.3"
+        if self._header is None:
+            self._header = self._version = max(version, "1.4")  # 1.4 allows /Version in the catalog
+            self._write(b"%%PDF-%s\n%%\xe9\xeb\xf1\xbf\n" % self._header.encode())
+        self._version = max(self._version, version)
+
+        objects = dict(_objects(data))
+        trailer = objects.pop(None)
+        root = int(_entry(trailer, b"Root").split()[0])
+        info = _entry(trailer, b"Info")
+        info = int(info.split()[0]) if info else None
+        pages_root = int(_entry(objects[root], b"Pages").split()[0])
+        media_box = _entry(objects[pages_root], b"MediaBox")
+        kids = [int(n) for n in _REF.findall(_entry(objects[pages_root], b"Kids") or b"")]
+        page_numbers = set(kids)
+
+        if self._info is None and info is not None:
+            self._info = objects[info]
+        skipped = {root, pages_root, info}
+        numbers = {pages_root: PAGES_ID}
+        for number in objects:
+            if number not in skipped:
+                numbers[number] = self._next_id
+                self._next_id += 1
+
+        for number, body in objects.items():
+            if number in skipped:
+                continue
+            split = body.find(b"\nstream\n")
+            head, tail = (body, b"") if split < 0 else (body[:split], body[split:])
+            head = _renumber(head, numbers)
+            if number in page_numbers and media_box and b"/MediaBox" not in head:
+                head = head.replace(b"<<", b"<<\n/MediaBox " + media_box, 1)  # Was inherited from the old tree
+            self._write_object(numbers[number], head + tail)
+        self._pages.extend(numbers[k] for k in kids)
+
+    def close(self):
+        """Write the page tree, catalog, cross-reference table and trailer."""
+        if self._header is None:
+            raise ValueError("No document was added")
+        kids = b" ".join(b"%d 0 R" % n for n in self._pages)
+        self._write_object(PAGES_ID, b"<<\n/Count %d\n/Kids [%s]\n/Type /Pages\n>>" % (len(self._pages), kids))
+        version = b"\n/Version /%s" % self._version.encode() if self._version > self._header else b""
+        open_action = b"\n/OpenAction [%d 0 R /FitH null]" % self._pages[0] if self._pages else b""
+        self._write_object(CATALOG_ID, b"<<%s\n/PageLayout /OneColumn\n/Pages %d 0 R\n/Type /Catalog%s\n>>"
+                           % (open_action, PAGES_ID, version))
+        self._write_object(INFO_ID, self._info or b"<<\n>>")
+
+        size = self._next_id
+        xref = self._position
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for first in range(1, size, 1000):
+            self._write(b"".join(b"%010d 00000 n \n" % offset if offset >= 0 else b"0000000000 65535 f \n"
+                                 for offset in self._offsets[first:min(first + 1000, size)]))
+        self._write(b"trailer\n<<\n/Size %d\n/Root %d 0 R\n/Info %d 0 R\n>>\nstartxref\n%d\n%%%%EOF\n"
+                    % (size, CATALOG_ID, INFO_ID, xref))
@@ -0,0 +1,228 @@
+"""core/helpers/request_scheduler.py
+
+Shared, rate-limit-aware scheduler for Azure DevOps HTTP traffic.
+Every DevOps request is admitted through a token bucket whose refill rate
+adapts to the throttling headers returned by the service (Retry-After and
+X-RateLimit-*). Throttled responses (429/503) are retried with backoff
+instead of failing the whole upload; a 503 is only retried for idempotent
+methods, since the service may have committed a create before failing.
+"""
+
+import logging
+import random
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Status codes that mean "slow down and try again" rather than a hard failure
+RETRY_STATUSES = (429, 503)
+# A 429 means the request was rejected unprocessed, so it is retried for any
+# method; a 503 may come after the work was done, so only these repeat it
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+def _header_float(response, name):
+    """Return a numeric response header as float, or None if missing/invalid."""
+    value = response.headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """Token-bucket scheduler shared by every DevOps client in the process.
+
+    The bucket refills at ``rate`` tokens per second up to ``burst`` tokens.
+    Each request consumes one token; callers block while the bucket is empty
+    or while the service asked us to pause. The rate follows an AIMD policy:
+    it is halved whenever the service reports throttling and recovers slowly
+    back to the configured base rate on clean responses.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, max_retries: int = 5,
+                 max_backoff: float = 60.0, min_rate: float = 0.5, session=None):
+        """Initialize the scheduler.
+
+        Args:
+            rate: Base number of requests per second admitted.
+            burst: Maximum number of requests that may be sent back-to-back.
+            max_retries: How many times a throttled response is retried.
+            max_backoff: Upper bound in seconds for a single backoff wait.
+            min_rate: Lower bound for the adaptive rate.
+            session: Optional requests.Session used to send the requests.
+        """
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.burst = float(burst)
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self.session = session or requests.Session()
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+        # Metrics
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._throttle_seconds = 0.0
+        self._requests = 0
+        self._retries = 0
+        self._throttled_responses = 0
+
+    # ---------- Token bucket ----------
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def _acquire(self):
+        """Block until a token is available and no service pause is active."""
+        with self._cond:
+            self._queue_depth += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+            started = time.monotonic()
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if now < self._paused_until:
+                        wait = self._paused_until - now
+                    elif self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    else:
+                        wait = (1 - self._tokens) / self.rate
+                    self._cond.wait(wait)
+            finally:
+                self._queue_depth -= 1
+                self._throttle_seconds += time.monotonic() - started
+
+    def _pause(self, seconds):
+        """Stop admitting requests for the given number of seconds."""
+        with self._cond:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                # Drop accumulated tokens so the queue does not burst after the pause
+                self._tokens = 0.0
+            self._cond.notify_all()
+
+    # ---------- Adaptation ----------
+
+    def _observe(self, response):
+        """Adapt the admission rate to the throttling headers of a response."""
+        delay = _header_float(response, "X-RateLimit-Delay")
+        remaining = _header_float(response, "X-RateLimit-Remaining")
+        limit = _header_float(response, "X-RateLimit-Limit")
+
+        throttled = response.status_code in RETRY_STATUSES or bool(delay)
+        if remaining is not None and limit:
+            # Treat the last 10% of the budget as a throttling signal
+            throttled = throttled or remaining <= limit * 0.1
+
+        with self._cond:
+            if throttled:
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+
+        if delay:
+            self._pause(min(delay, self.max_backoff))
+
+    def _backoff_seconds(self, response, attempt):
+        retry_after = _header_float(response, "Retry-After")
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_backoff)
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.max_backoff, 2 ** attempt))
+
+    # ---------- Public API ----------
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send an HTTP request through the scheduler.
+
+        Throttled responses are retried up to ``max_retries`` times, honouring
+        Retry-After when present: 429 for every method, 503 only for
+        idempotent ones (a PATCH that creates a work item is not repeated).
+        The last response is returned, so callers keep using
+        ``raise_for_status`` for error handling.
+
+        Args:
+            method: HTTP method (GET, POST, PATCH, ...).
+            url: Request URL.
+            **kwargs: Extra arguments forwarded to ``requests.Session.request``.
+
+        Returns:
+            The final requests.Response.
+        """
+        attempt = 0
+        while True:
+            self._acquire()
+            response = self.session.request(method, url, **kwargs)
+            with self._cond:
+                self._requests += 1
+            self._observe(response)
+
+            if response.status_code not in RETRY_STATUSES:
+                return response
+
+            with self._cond:
+                self._throttled_responses += 1
+            if response.status_code != 429 and method.upper() not in IDEMPOTENT_METHODS:
+                logger.warning(f"Not retrying {method} {url} (HTTP {response.status_code}): "
+                               f"the request may already have been applied")
+                return response
+            if attempt >= self.max_retries:
+                logger.warning(f"Giving up on {method} {url} after {attempt} retries "
+                               f"(HTTP {response.status_code})")
+                return response
+
+            wait = self._backoff_seconds(response, attempt)
+            logger.info(f"DevOps throttled request (HTTP {response.status_code}); "
+                        f"retrying in {wait:.1f}s")
+            self._pause(wait)
+            attempt += 1
+            with self._cond:
+                self._retries += 1
+
+    def metrics(self) -> dict:
+        """Return a snapshot of the scheduler metrics.
+
+        Returns:
+            Dictionary with queue depth, throttle time and request counters.
+        """
+        with self._cond:
+            return {
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "throttle_seconds": round(self._throttle_seconds, 3),
+                "requests": self._requests,
+                "retries": self._retries,
+                "throttled_responses": self._throttled_responses,
+                "current_rate": self.rate,
+            }
+
+
+_scheduler = RequestScheduler()
+
+
+def get_request_scheduler() -> RequestScheduler:
+    """Return the process-wide scheduler shared by all DevOps clients."""
+    return _scheduler
+
+
+def set_request_scheduler(scheduler: RequestScheduler) -> None:
+    """Replace the shared scheduler (useful for testing or custom limits)."""
+    global _scheduler
+    _scheduler = scheduler
@@ -0,0 +1,234 @@
+"""core/helpers/rollup.py
+
+Incremental hour rollups over the Feature -> User Story -> Task hierarchy.
+A User Story is nested under its parent Feature and a Task under its parent
+User Story (parents are referenced by name, the first step with a name wins).
+Leaves carry their own hours and groups carry the sum of their children, so a
+parent's own hours are never added on top of its children's.
+
+Each node keeps its subtotal; editing a step's hours only walks its ancestors
+(O(depth)) instead of rescanning every step. The editor, the PDF breakdown and
+the DevOps upload plan all read their totals from this tree.
+"""
+
+# Hierarchy levels; a step's parent must be exactly one level above it
+LEVELS = {"Feature": 0, "User Story": 1, "Task": 2}
+PARENT_TYPE = {"User Story": "Feature", "Task": "User Story"}
+DEFAULT_TYPE = "Feature"  # Same default the editor uses for new steps
+
+
+class RollupNode:
+    """A step in the tree with its own hours and its current subtotal."""
+
+    __slots__ = ("key", "name", "type", "parent_name", "own", "total", "parent", "children", "order")
+
+    def __init__(self, key, name, w_type, parent_name, own, order):
+        self.key = key
+        self.name = name
+        self.type = w_type or DEFAULT_TYPE
+        self.parent_name = parent_name  # Kept even for Features, in case the type changes
+        self.own = own
+        self.total = own
+        self.parent = None
+        self.children = []
+        self.order = order
+
+
+class RollupTree:
+    """Hierarchy of steps with subtotals maintained incrementally.
+
+    Nodes are addressed by a caller-chosen key (a list index, a UI step id).
+    ``on_change(key, total)`` is called for every node whose subtotal changes.
+    """
+
+    def __init__(self, on_change=None):
+        self.on_change = on_change
+        self.total = 0.0
+        self._nodes = {}
+        self._by_name = {}    # name -> nodes with that name, first one is the owner
+        self._referrers = {}  # parent name -> nodes that reference it
+        self._roots = set()
+        self._order = 0
+
+    @classmethod
+    def from_steps(cls, steps: list, on_change=None) -> "RollupTree":
+        """Build a tree keyed by list index from project step dictionaries.
+
+        Raises:
+            ValueError: If a step has hours that are not a number.
+        """
+        tree = cls(on_change)
+        for index, step in enumerate(steps):
+            hours = step.get("hours")
+            if type(hours) is not float:  # Validated models (core/models.py) already hold floats
+                hours = float(hours or 0)
+            tree.add(index, step.get("name"), step.get("type"), step.get("parent"), hours)
+        return tree
+
+    # ---------- Queries ----------
+
+    def __contains__(self, key) -> bool:
+        return key in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def subtotal(self, key) -> float:
+        """Return the rolled-up hours of a node (its own hours when it is a leaf)."""
+        return self._nodes[key].total
+
+    def is_group(self, key) -> bool:
+        return bool(self._nodes[key].children)
+
+    def rows(self):
+        """Yield ``(key, depth, subtotal, is_group)`` depth-first in insertion order."""
+        stack = [(node, 0) for node in sorted(self._roots, key=lambda n: n.order, reverse=True)]
+        while stack:
+            node, depth = stack.pop()
+            yield node.key, depth, node.total, bool(node.children)
+            if node.children:
+                stack.extend((kid, depth + 1) for kid in sorted(node.children, key=lambda n: n.order, reverse=True))
+
+    # ---------- Edits ----------
+
+    def clear(self):
+        """Remove every node."""
+        self.__init__(self.on_change)
+
+    def add(self, key, name, w_type=DEFAULT_TYPE, parent_name=None, hours: float = 0.0):
+        """Add a step; it is attached to its parent (or adopts waiting children) right away."""
+        if key in self._nodes:
+            raise KeyError(f"Duplicate rollup key {key!r}")
+        node = RollupNode(key, name, w_type, parent_name, hours, self._order)
+        self._order += 1
+        self._nodes[key] = node
+        self._roots.add(node)
+        self.total += node.total
+        self._reference(node)
+        self._claim_name(node)
+        self._resolve(node)
+
+    def remove(self, key):
+        """Remove a step; its children move to the next owner of its name or to the top level."""
+        node = self._nodes.pop(key)
+        self._unreference(node)
+        self._release_name(node)  # Re-homes the children while the node is still linked
+        self._set_parent(node, None)
+        self._roots.discard(node)
+        self.total -= node.total
+
+    def set_hours(self, key, hours: float):
+        """Change a step's own hours; only its ancestors are updated."""
+        node = self._nodes[key]
+        node.own = hours
+        if not node.children:
+            self._set_total(node, hours)
+
+    def set_name(self, key, name):
+        node = self._nodes[key]
+        if name == node.name:
+            return
+        self._release_name(node)
+        node.name = name
+        self._claim_name(node)
+
+    def set_type(self, key, w_type):
+        node = self._nodes[key]
+        w_type = w_type or DEFAULT_TYPE
+        if w_type == node.type:
+            return
+        self._unreference(node)
+        node.type = w_type
+        self._reference(node)
+        # Detach first so no former ancestor can become its child, then re-link
+        # the children (they may no longer, or now, match its level)
+        self._set_parent(node, None)
+        for child in list(self._referrers.get(node.name, ())):
+            self._resolve(child)
+        self._resolve(node)
+
+    def set_parent(self, key, parent_name):
+        node = self._nodes[key]
+        self._unreference(node)
+        node.parent_name = parent_name
+        self._reference(node)
+        self._resolve(node)
+
+    # ---------- Internals ----------
+
+    def _reference(self, node):
+        if node.type in PARENT_TYPE and node.parent_name is not None:
+            self._referrers.setdefault(node.parent_name, []).append(node)
+
+    def _unreference(self, node):
+        refs = self._referrers.get(node.parent_name)
+        if refs and node in refs:
+            refs.remove(node)
+            if not refs:
+                del self._referrers[node.parent_name]
+
+    def _claim_name(self, node):
+        owners = self._by_name.setdefault(node.name, [])
+        owners.append(node)
+        owners.sort(key=lambda n: n.order)
+        if owners[0] is node:
+            for child in list(self._referrers.get(node.name, ())):
+                self._resolve(child)
+
+    def _release_name(self, node):
+        owners = self._by_name.get(node.name, [])
+        was_owner = bool(owners) and owners[0] is node
+        if node in owners:
+            owners.remove(node)
+        if not owners:
+            self._by_name.pop(node.name, None)
+        if was_owner:
+            for child in list(self._referrers.get(node.name, ())):
+                self._resolve(child)
+
+    def _resolve(self, node):
+        """Attach ``node`` under the current owner of its parent name, if the levels match."""
+        parent = None
+        if node.type in PARENT_TYPE and node.parent_name is not None:
+            owners = self._by_name.get(node.parent_name)
+            candidate = owners[0] if owners else None
+            if candidate is not None and candidate is not node and candidate.type == PARENT_TYPE[node.type]:
+                parent = candidate
+        if parent is not node.parent:
+            self._set_parent(node, parent)
+
+    def _set_parent(self, node, parent):
+        old = node.parent
+        if old is parent:
+            return
+        if old is not None:
+            old.children.remove(node)
+            # Losing the last child turns a group back into a leaf: always notify
+            self._set_total(old, old.total - node.total if old.children else old.own, force=not old.children)
+        else:
+            self._roots.discard(node)
+            self.total -= node.total
+
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+            first = len(parent.children) == 1
+            self._set_total(parent, node.total if first else parent.total + node.total, force=first)
+        else:
+            self._roots.add(node)
+            self.total += node.total
+
+    def _set_total(self, node, value: float, force: bool = False):
+        """Set a subtotal and push the difference up to the root (O(depth))."""
+        delta = value - node.total
+        if not delta:
+            if force and self.on_change:
+                self.on_change(node.key, node.total)
+            return
+        while node is not None:
+            node.total += delta
+            if self.on_change:
+                self.on_change(node.key, node.total)
+            if node.parent is None:
+                self.total += delta
+            node = node.parent
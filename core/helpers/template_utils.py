@@ -38,6 +38,13 @@ def load_templates(manager: ProjectManager | None = None):
         return []
 
 
+def load_template_models(manager: ProjectManager | None = None):
+    """Load templates as validated core.models.Template instances ([] on error)."""
+    from core.models import load_models, parse_templates
+
+    return load_models(_ensure_manager(manager).path, parse_templates)
+
+
 def save_templates(tpls, manager: ProjectManager | None = None):
     """Save templates using the provided manager or the default one."""
     mgr = _ensure_manager(manager)
@@ -0,0 +1,132 @@
+"""core/helpers/upload_plan.py
+
+Offline planning stage for DevOps uploads.
+Turns a project dictionary into an ordered upload plan (Features, then User
+Stories, then Tasks) with resolved parents, duplicate-name detection and hour
+rollups. Building a plan performs no network I/O, so a broken project is
+rejected before anything is created remotely.
+"""
+
+from core.helpers.rollup import DEFAULT_TYPE, LEVELS, PARENT_TYPE, RollupTree
+
+
+class PlanItem:
+    """A single work item to create, with its parent already resolved."""
+
+    __slots__ = ("name", "type", "parent", "hours", "rollup", "description")
+
+    def __init__(self, name: str, w_type: str, parent: str | None, hours: float, description: str = ""):
+        self.name = name
+        self.type = w_type
+        self.parent = parent  # None means "child of the Epic"
+        self.hours = hours
+        self.rollup = 0.0
+        self.description = description
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "parent": self.parent,
+            "hours": self.hours,
+            "rollup": self.rollup,
+        }
+
+
+class UploadPlan:
+    """Topologically ordered list of work items plus validation results."""
+
+    def __init__(self, epic_title: str, items: list, errors: list):
+        self.epic_title = epic_title
+        self.items = items
+        self.errors = errors
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    @property
+    def request_count(self) -> int:
+        """Number of create requests the sequential upload will send (Epic included)."""
+        return 1 + len(self.items)
+
+    @property
+    def total_hours(self) -> float:
+        return sum(item.rollup for item in self.items if item.parent is None)
+
+    def to_dict(self) -> dict:
+        return {
+            "epic": self.epic_title,
+            "items": [item.to_dict() for item in self.items],
+            "request_count": self.request_count,
+            "total_hours": self.total_hours,
+            "errors": list(self.errors),
+        }
+
+
+def _to_hours(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_upload_plan(data: dict) -> UploadPlan:
+    """Validate a project and build its upload plan without any network I/O.
+
+    Steps are read in a single pass and bucketed by hierarchy level; parents are
+    then resolved by name against the level above. All problems are collected
+    instead of stopping at the first one.
+
+    Args:
+        data: Project dictionary with 'demand', 'name' and a 'steps' list.
+
+    Returns:
+        An UploadPlan. Check ``plan.errors`` before uploading.
+    """
+    errors = []
+    epic_title = f"{data.get('demand', 'N/A')} - {data.get('name', '')}"
+
+    buckets = ([], [], [])
+    by_name = {}
+
+    for index, step in enumerate(data.get("steps") or []):
+        name = (step.get("name") or "").strip()
+        w_type = step.get("type") or DEFAULT_TYPE
+
+        if not name:
+            errors.append(f"Step #{index + 1} has no name")
+            continue
+        if w_type not in LEVELS:
+            errors.append(f"Step '{name}' has unsupported type '{w_type}'")
+            continue
+        if name in by_name:
+            errors.append(f"Duplicate step name '{name}'")
+            continue
+
+        hours = _to_hours(step.get("hours"))
+        if hours is None:
+            errors.append(f"Step '{name}' has invalid hours '{step.get('hours')}'")
+            hours = 0.0
+
+        parent = step.get("parent") if w_type in PARENT_TYPE else None
+        item = PlanItem(name, w_type, parent, hours, step.get("description") or "")
+        by_name[name] = item
+        buckets[LEVELS[w_type]].append(item)
+
+    # Resolve parents level by level (every item is visited once)
+    for level in buckets[1:]:
+        for item in level:
+            parent = by_name.get(item.parent)
+            expected = PARENT_TYPE[item.type]
+            if parent is None or parent.type != expected:
+                errors.append(f"{item.type} '{item.name}' has no valid parent {expected}")
+
+    # Rollups: leaves carry their own hours, parents the sum of their children
+    items = buckets[0] + buckets[1] + buckets[2]
+    tree = RollupTree()
+    for item in items:
+        tree.add(item.name, item.name, item.type, item.parent, item.hours)
+    for item in items:
+        item.rollup = tree.subtotal(item.name)
+    return UploadPlan(epic_title, items, errors)
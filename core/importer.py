@@ -0,0 +1,205 @@
+"""core/importer.py
+
+Streaming import of estimate steps from CSV and Excel (.xlsx) files.
+Rows are read one at a time (csv module, or openpyxl in read-only mode), so a
+large workbook is never loaded into memory as a whole. Columns are matched by
+header name (name, type, parent, hours, description and the optional
+optimistic / pessimistic hours). New step names can be merged into the
+templates list in one pass and saved once.
+"""
+
+import csv
+import logging
+import os
+
+from core.helpers.rollup import LEVELS, DEFAULT_TYPE
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx", ".xlsm")
+
+# Accepted header spellings (compared lower-cased, spaces and dashes as underscores)
+COLUMN_ALIASES = {
+    "name": ("name", "step", "task", "title", "step_name"),
+    "type": ("type", "work_item_type", "item_type", "level"),
+    "parent": ("parent", "parent_name", "parent_step"),
+    "hours": ("hours", "estimate", "estimated_hours", "likely", "hours_likely", "most_likely"),
+    "description": ("description", "details", "notes"),
+    "hours_optimistic": ("hours_optimistic", "optimistic", "min", "min_hours"),
+    "hours_pessimistic": ("hours_pessimistic", "pessimistic", "max", "max_hours"),
+}
+
+_TYPES_BY_KEY = {t.lower().replace(" ", ""): t for t in LEVELS}
+
+
+class ImportResult:
+    """Steps read from a file plus per-row problems (rows with errors are skipped)."""
+
+    def __init__(self):
+        self.steps = []
+        self.errors = []
+        self.rows = 0
+
+    def to_dict(self) -> dict:
+        return {"rows": self.rows, "imported": len(self.steps), "errors": list(self.errors)}
+
+
+def _normalize(header) -> str:
+    return str(header or "").strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _column_map(headers) -> dict:
+    """Map each known field to its column index from a header row."""
+    lookup = {alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    columns = {}
+    for index, header in enumerate(headers):
+        field = lookup.get(_normalize(header))
+        if field and field not in columns:
+            columns[field] = index
+    if "name" not in columns:
+        raise ValueError(f"No step name column found (expected one of: {', '.join(COLUMN_ALIASES['name'])})")
+    return columns
+
+
+def _iter_csv(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(f, dialect)
+
+
+def _iter_xlsx(path, sheet=None):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        yield from worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_rows(path, sheet=None):
+    """Yield raw rows (header first) from a CSV or Excel file."""
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext == ".csv":
+        return _iter_csv(path)
+    if ext in (".xlsx", ".xlsm"):
+        return _iter_xlsx(path, sheet)
+    raise ValueError(f"Unsupported file type '{ext}' (expected {', '.join(SUPPORTED_EXTENSIONS)})")
+
+
+def _cell(row, columns, field):
+    index = columns.get(field)
+    if index is None or index >= len(row):
+        return None
+    value = row[index]
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value == "" else value
+
+
+def _hours(value, label):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.replace(",", ".")  # Decimal commas from localized spreadsheets
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid {label} '{value}'")
+
+
+def iter_steps(path, sheet=None):
+    """Yield ``(row_number, step, error)`` for every data row of a file.
+
+    ``step`` is a dictionary in the project step format (name, description,
+    hours, hours_optimistic, hours_pessimistic, type, parent) or None when the
+    row has an ``error``. Blank rows are skipped.
+    """
+    rows = iter_rows(path, sheet)
+    try:
+        columns = _column_map(next(rows))
+    except StopIteration:
+        return
+
+    for number, row in enumerate(rows, start=2):
+        if not row or all(v is None or str(v).strip() == "" for v in row):
+            continue
+        name = _cell(row, columns, "name")
+        if name is None:
+            yield number, None, "missing step name"
+            continue
+        try:
+            raw_type = _cell(row, columns, "type")
+            w_type = DEFAULT_TYPE
+            if raw_type is not None:
+                w_type = _TYPES_BY_KEY.get(str(raw_type).lower().replace(" ", ""))
+                if w_type is None:
+                    raise ValueError(f"unsupported type '{raw_type}'")
+            hours = _hours(_cell(row, columns, "hours"), "hours") or 0.0
+            step = {
+                "name": str(name),
+                "description": str(_cell(row, columns, "description") or ""),
+                "hours": hours,
+                "hours_optimistic": _hours(_cell(row, columns, "hours_optimistic"), "optimistic hours"),
+                "hours_pessimistic": _hours(_cell(row, columns, "hours_pessimistic"), "pessimistic hours"),
+                "type": w_type,
+                "parent": None,
+            }
+            parent = _cell(row, columns, "parent")
+            if parent is not None and w_type != DEFAULT_TYPE:
+                step["parent"] = str(parent)
+        except ValueError as e:
+            yield number, None, str(e)
+            continue
+        yield number, step, None
+
+
+def import_steps(path, sheet=None) -> ImportResult:
+    """Read every valid step of a file into an ImportResult."""
+    result = ImportResult()
+    for number, step, error in iter_steps(path, sheet):
+        result.rows += 1
+        if error:
+            result.errors.append(f"Row {number}: {error}")
+        else:
+            result.steps.append(step)
+    logger.info(f"Imported {len(result.steps)} step(s) from {path} ({len(result.errors)} row error(s))")
+    return result
+
+
+def _format_hours(value) -> str:
+    return "" if value is None else f"{value:g}"
+
+
+def merge_into_templates(steps, templates: list) -> int:
+    """Append a template for every step name not already present (case-insensitive).
+
+    Existing templates are left untouched; duplicate names inside ``steps``
+    are added once. The caller saves the templates list once afterwards.
+
+    Returns:
+        Number of templates added.
+    """
+    known = {(t.get("name") or "").strip().casefold() for t in templates}
+    added = 0
+    for step in steps:
+        name = (step.get("name") or "").strip()
+        key = name.casefold()
+        if not name or key in known:
+            continue
+        known.add(key)
+        templates.append({
+            "name": name,
+            "description": step.get("description") or "",
+            "hours": _format_hours(step.get("hours")) or "0",
+            "hours_optimistic": _format_hours(step.get("hours_optimistic")),
+            "hours_pessimistic": _format_hours(step.get("hours_pessimistic")),
+        })
+        added += 1
+    return added
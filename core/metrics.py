@@ -0,0 +1,255 @@
+"""core/metrics.py
+
+Lightweight timing instrumentation for the hot paths (storage, PDF, DevOps
+and the editor's refresh functions).
+
+Spans are recorded into in-process histograms with fixed buckets. Every
+thread writes to its own histogram shard, so recording takes no lock; shards
+are merged only when metrics are read or exported. When metrics are disabled
+(the default) a decorated function costs one flag check per call.
+
+Enabled through environment variables (a .env file works too; call
+configure() again after load_dotenv):
+
+    ESTIMATOR_METRICS=prometheus|jsonl|memory   # off when unset
+    ESTIMATOR_METRICS_FILE=metrics.prom         # local file for the exporter
+    ESTIMATOR_METRICS_INTERVAL=30               # seconds between exports
+
+The Prometheus exporter rewrites a text-format file (for node_exporter's
+textfile collector or a quick look); the JSON-lines exporter appends one line
+per span name on every export.
+"""
+
+import atexit
+import bisect
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is +Inf
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+FORMATS = ("prometheus", "jsonl", "memory")
+DEFAULT_INTERVAL = 30.0
+
+
+class _Shard:
+    """One thread's histogram for one span name (only that thread writes it)."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class _State:
+    enabled = False
+    fmt = None
+    path = None
+    interval = DEFAULT_INTERVAL
+
+
+_state = _State()
+_local = threading.local()
+_shards = []  # (name, shard) for every thread; appended under _registry_lock
+_registry_lock = threading.Lock()
+_exporter = None
+
+
+def _shard(name: str) -> _Shard:
+    shards = getattr(_local, "shards", None)
+    if shards is None:
+        shards = _local.shards = {}
+    shard = shards.get(name)
+    if shard is None:
+        shard = shards[name] = _Shard()
+        with _registry_lock:  # Once per thread and span name, never on the hot path
+            _shards.append((name, shard))
+    return shard
+
+
+def observe(name: str, seconds: float):
+    """Record one duration for span ``name`` (no-op while metrics are disabled)."""
+    if not _state.enabled:
+        return
+    shard = _shard(name)
+    shard.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+    shard.total += seconds
+    shard.count += 1
+
+
+class span:
+    """Context manager timing a block: ``with span("pdf.render"): ...``"""
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def timed(name: str):
+    """Decorator recording every call of the wrapped function as span ``name``."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started)
+        return wrapper
+
+    return decorator
+
+
+# ---------- Reading ----------
+
+def _quantile(counts, count, q) -> float:
+    """Estimate a quantile as the upper bound of the bucket that contains it."""
+    rank = q * count
+    seen = 0
+    for bound, n in zip(BUCKETS, counts):
+        seen += n
+        if seen >= rank:
+            return bound
+    return float("inf")
+
+
+def snapshot() -> dict:
+    """Return merged histograms: ``{name: {"count", "sum", "buckets", "p50", "p95", "p99"}}``."""
+    with _registry_lock:
+        shards = list(_shards)
+    merged = {}
+    for name, shard in shards:
+        entry = merged.setdefault(name, {"count": 0, "sum": 0.0, "buckets": [0] * (len(BUCKETS) + 1)})
+        entry["count"] += shard.count
+        entry["sum"] += shard.total
+        entry["buckets"] = [a + b for a, b in zip(entry["buckets"], shard.counts)]
+    for entry in merged.values():
+        for q in (50, 95, 99):
+            entry[f"p{q}"] = _quantile(entry["buckets"], entry["count"], q / 100) if entry["count"] else 0.0
+    return merged
+
+
+def reset():
+    """Drop every recorded span (new shards are created on the next observation)."""
+    global _local
+    with _registry_lock:
+        _shards.clear()
+        _local = threading.local()
+
+
+# ---------- Exporters ----------
+
+def _prometheus_text(data: dict) -> str:
+    lines = ["# HELP estimator_span_seconds Duration of instrumented operations.",
+             "# TYPE estimator_span_seconds histogram"]
+    for name in sorted(data):
+        entry = data[name]
+        cumulative = 0
+        for bound, n in zip(BUCKETS + (float("inf"),), entry["buckets"]):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'estimator_span_seconds_bucket{{span="{name}",le="{le}"}} {cumulative}')
+        lines.append(f'estimator_span_seconds_sum{{span="{name}"}} {entry["sum"]:.6f}')
+        lines.append(f'estimator_span_seconds_count{{span="{name}"}} {entry["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def export(path=None, fmt=None) -> str | None:
+    """Write the current metrics to ``path`` in ``fmt`` (defaults: the configured ones).
+
+    Returns:
+        The file written, or None when there is nothing to export to.
+    """
+    fmt = fmt or _state.fmt
+    path = path or _state.path
+    if fmt not in ("prometheus", "jsonl") or not path:
+        return None
+    data = snapshot()
+    try:
+        if fmt == "prometheus":
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(_prometheus_text(data))
+            os.replace(tmp, path)  # Readers never see a half-written file
+        else:
+            now = time.strftime("%Y-%m-%dT%H:%M:%S")
+            with open(path, "a", encoding="utf-8") as f:
+                for name in sorted(data):
+                    f.write(json.dumps({"time": now, "span": name, **data[name]}) + "\n")
+    except OSError as e:
+        logger.error(f"Could not export metrics to {path}: {e}")
+        return None
+    return str(path)
+
+
+class _Exporter(threading.Thread):
+    def __init__(self, interval: float):
+        super().__init__(name="metrics-exporter", daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            export()
+
+
+def configure(fmt=None, path=None, interval=None):
+    """Enable or disable metrics from the arguments or the ESTIMATOR_METRICS* variables.
+
+    Args:
+        fmt: "prometheus", "jsonl" or "memory" (record without exporting);
+            None reads ESTIMATOR_METRICS, and an empty value disables metrics.
+        path: Export file; defaults to ESTIMATOR_METRICS_FILE or a file in the
+            temporary directory.
+        interval: Seconds between background exports.
+    """
+    global _exporter
+    fmt = (fmt if fmt is not None else os.getenv("ESTIMATOR_METRICS", "")).strip().lower()
+    if fmt in ("1", "true", "on", "yes"):
+        fmt = "prometheus"
+    if fmt and fmt not in FORMATS:
+        logger.warning(f"Unknown ESTIMATOR_METRICS value '{fmt}' (expected {', '.join(FORMATS)}); metrics disabled")
+        fmt = ""
+
+    if _exporter is not None:
+        _exporter.stopped.set()
+        _exporter = None
+
+    _state.enabled = bool(fmt)
+    _state.fmt = fmt or None
+    _state.interval = float(interval or os.getenv("ESTIMATOR_METRICS_INTERVAL") or DEFAULT_INTERVAL)
+    default_name = "project_estimator_metrics.prom" if fmt == "prometheus" else "project_estimator_metrics.jsonl"
+    _state.path = path or os.getenv("ESTIMATOR_METRICS_FILE") or os.path.join(tempfile.gettempdir(), default_name)
+
+    if fmt in ("prometheus", "jsonl"):
+        _exporter = _Exporter(_state.interval)
+        _exporter.start()
+        logger.info(f"Metrics enabled ({fmt}) -> {_state.path} every {_state.interval:g}s")
+
+
+def enabled() -> bool:
+    return _state.enabled
+
+
+atexit.register(export)
+configure()
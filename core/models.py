@@ -0,0 +1,204 @@
+"""core/models.py
+
+Typed models for projects, steps and templates, validated by pydantic's
+compiled core straight from the JSON bytes in one pass.
+
+The models are TypedDicts: validation happens in pydantic-core (Rust) and
+produces plain dictionaries, so the result is as cheap to build and to walk
+as json.load() output and every existing caller (editor, PDF, DevOps, rollup)
+keeps working unchanged. Hours are normalized to floats during parsing
+(numeric strings such as "8" included), so code reading validated data can
+skip its own ``float(x or 0)`` conversions. Unknown keys (e.g. the DevOps
+upload result) are kept.
+
+Files saved by the editor validate entirely inside pydantic-core. Older or
+hand-edited files with loose values (blank or null hours, "1,5", null text
+or steps) fail that fast path and are cleaned in Python before validation, so
+they load too, only slower. A step, template or project that still cannot be
+converted (e.g. hours "abc") is left out and logged with every field that
+failed; the rest of the file loads.
+Results with rows left out are for reading only and must never be saved back.
+"""
+
+import json
+import logging
+from typing import Optional
+
+from pydantic import ConfigDict, TypeAdapter, ValidationError
+from typing_extensions import TypedDict
+
+from core.helpers.rollup import DEFAULT_TYPE
+
+logger = logging.getLogger(__name__)
+
+_CONFIG = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+
+class Step(TypedDict, total=False):
+    """One estimate line (Feature, User Story or Task)."""
+
+    __pydantic_config__ = _CONFIG
+
+    name: str
+    description: str
+    hours: float
+    hours_optimistic: Optional[float]
+    hours_pessimistic: Optional[float]
+    type: str
+    parent: Optional[str]
+
+
+class Project(TypedDict, total=False):
+    """A saved estimate with its steps."""
+
+    __pydantic_config__ = _CONFIG
+
+    name: str
+    architect: str
+    area: str
+    demand: str
+    purpose: str
+    date: str
+    steps: list[Step]
+    total: Optional[float]
+
+
+class Template(TypedDict, total=False):
+    """A reusable step from templates.json."""
+
+    __pydantic_config__ = _CONFIG
+
+    name: str
+    description: str
+    hours: float
+    hours_optimistic: Optional[float]
+    hours_pessimistic: Optional[float]
+
+
+ProjectList = TypeAdapter(list[Project])
+TemplateList = TypeAdapter(list[Template])
+_PROJECT = TypeAdapter(Project)
+_TEMPLATE = TypeAdapter(Template)
+_STEP = TypeAdapter(Step)
+
+_TEXT_FIELDS = ("name", "description", "architect", "area", "demand", "purpose", "date")
+_OPTIONAL_HOURS = ("hours_optimistic", "hours_pessimistic", "total")
+
+
+def _number(value):
+    if isinstance(value, str):
+        cleaned = value.strip().replace(",", ".")  # Decimal commas from localized input
+        try:
+            return float(cleaned) if cleaned else None
+        except ValueError:
+            return value  # Left for validation to report
+    return value
+
+
+def _clean(item: dict) -> dict:
+    """Normalize one loose project / step / template dictionary in place."""
+    for key in _TEXT_FIELDS:
+        if key in item and item[key] is None:
+            item[key] = ""
+    if "hours" in item:
+        item["hours"] = _number(item["hours"]) or 0.0
+    for key in _OPTIONAL_HOURS:
+        if key in item:
+            item[key] = _number(item[key])
+    if "type" in item and not item["type"]:
+        item["type"] = DEFAULT_TYPE
+    if "steps" in item and item["steps"] is None:
+        item["steps"] = []
+    for step in item.get("steps") or []:
+        if isinstance(step, dict):
+            _clean(step)
+    return item
+
+
+def _describe(error: ValidationError) -> str:
+    """Name every field that failed, e.g. ``"hours: Input should be a valid number; type: ..."``."""
+    return "; ".join(f"{'.'.join(str(loc) for loc in detail['loc']) or 'value'}: {detail['msg']}"
+                     for detail in error.errors())
+
+
+def _validate_item(adapter, item, index: int, errors: list):
+    """Validate one cleaned item; bad steps are dropped, a bad item returns None."""
+    try:
+        return adapter.validate_python(item)
+    except ValidationError as e:
+        failure = e
+    name = item.get("name") if isinstance(item, dict) else None
+    if isinstance(item, dict) and isinstance(item.get("steps"), list):
+        steps = []
+        for step_index, step in enumerate(item["steps"]):
+            try:
+                steps.append(_STEP.validate_python(step))
+            except ValidationError as e:
+                errors.append({"index": index, "name": name, "step": step_index, "error": _describe(e)})
+        try:
+            return adapter.validate_python({**item, "steps": steps})
+        except ValidationError as e:
+            failure = e
+    errors.append({"index": index, "name": name, "step": None, "error": _describe(failure)})
+    return None
+
+
+def _validate(list_adapter, item_adapter, data, errors: list | None = None) -> list:
+    """Validate a JSON list with ``list_adapter``, falling back to ``item_adapter`` row by row."""
+    try:
+        return list_adapter.validate_json(data)
+    except ValueError:  # pydantic's ValidationError, including malformed JSON
+        items = json.loads(data)  # Raises again if the JSON itself is broken
+        if isinstance(items, dict):  # Legacy {"projects": [...]} layout
+            items = items.get("projects", [])
+        if not isinstance(items, list):
+            raise
+    # Item by item, so one bad value only costs its own row
+    errors = [] if errors is None else errors
+    first_error = len(errors)
+    result = []
+    for index, item in enumerate(items):
+        item = _validate_item(item_adapter, _clean(item) if isinstance(item, dict) else item, index, errors)
+        if item is not None:
+            result.append(item)
+    for error in errors[first_error:]:
+        where = f"step {error['step']} of " if error["step"] is not None else ""
+        logger.warning(f"Skipped {where}item {error['index']} ('{error['name']}'): {error['error']}")
+    return result
+
+
+def parse_projects(data, errors: list | None = None) -> list[Project]:
+    """Validate a JSON document (bytes or str) holding a list of projects.
+
+    Steps or projects whose values cannot be converted even after cleaning
+    (e.g. hours "abc") are left out and logged.
+
+    Args:
+        data: The JSON document.
+        errors: Optional list that receives one ``{"index", "name", "step",
+            "error"}`` dictionary per row left out (``step`` is None when the
+            whole project was left out); ``error`` names every field that failed.
+
+    Raises:
+        ValueError: If the document is not valid JSON or not a list.
+    """
+    return _validate(ProjectList, _PROJECT, data, errors)
+
+
+def parse_templates(data, errors: list | None = None) -> list[Template]:
+    """Validate a JSON document (bytes or str) holding a list of templates (see parse_projects)."""
+    return _validate(TemplateList, _TEMPLATE, data, errors)
+
+
+def load_models(path, parser=parse_projects, errors: list | None = None) -> list:
+    """Read a JSON file and parse it; returns [] (logged) if it cannot be read, like load_projects().
+
+    Rows that fail validation are left out and added to ``errors`` (see
+    parse_projects), so the result must not be saved back over ``path``.
+    """
+    try:
+        with open(path, "rb") as f:
+            return parser(f.read(), errors)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading models from {path}: {e}")
+        return []
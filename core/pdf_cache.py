@@ -0,0 +1,160 @@
+"""core/pdf_cache.py
+
+Content-addressed cache for generated PDF reports.
+Reports are keyed by a stable hash of the canonicalized project dictionary plus
+the renderer version, and stored in a size-bounded local directory with
+least-recently-used eviction. Regenerating an unchanged estimate returns the
+cached bytes instead of rendering again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict
+
+from core.config import CACHE_DIR
+from core.pdf_generator import RENDERER_VERSION, get_renderer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = CACHE_DIR / "pdf"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# Keys that do not affect the rendered report (the save date, the stored total
+# that the report recomputes, DevOps links) and must not invalidate the cache
+IGNORED_KEYS = ("date", "total", "devops")
+
+
+def project_cache_key(project: Dict[str, Any]) -> str:
+    """Return a stable hash of the project content and the renderer version."""
+    canonical = {k: v for k, v in project.items() if k not in IGNORED_KEYS}
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"),
+                         ensure_ascii=False, default=str)
+    digest = hashlib.sha256(f"v{RENDERER_VERSION}:".encode())
+    digest.update(payload.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PdfCache:
+    """Size-bounded directory of cached PDFs with LRU eviction.
+
+    File modification times record the last use; a hit touches the file and
+    eviction removes the least recently used files until the directory is
+    below ``max_bytes``.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory: Local directory that stores the cached PDFs.
+            max_bytes: Maximum total size of the cached files.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(f.stat().st_size for f in self.directory.glob("*.pdf"))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached PDF bytes for ``key`` or None."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read cached PDF {path}: {e}")
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store PDF bytes under ``key`` and evict old entries if needed."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                previous = path.stat().st_size if path.exists() else 0
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)  # Readers never see a partial file
+                self._size += len(data) - previous
+            except Exception as e:
+                logger.warning(f"Could not cache PDF {path}: {e}")
+                return
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        files = []
+        for f in self.directory.glob("*.pdf"):
+            try:
+                st = f.stat()
+                files.append((st.st_mtime, st.st_size, f))
+            except OSError:
+                continue
+        files.sort()
+        self._size = sum(size for _, size, _ in files)
+        for _, size, f in files:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                f.unlink()
+                self._size -= size
+            except OSError:
+                continue
+
+    def clear(self):
+        with self._lock:
+            for f in self.directory.glob("*.pdf"):
+                try:
+                    f.unlink()
+                except OSError:
+                    pass
+            self._size = 0
+
+
+_cache = None
+
+
+def get_pdf_cache() -> PdfCache:
+    """Return the shared PDF cache (created on first use)."""
+    global _cache
+    if _cache is None:
+        _cache = PdfCache()
+    return _cache
+
+
+def render_pdf_cached(project: Dict[str, Any], cache: PdfCache | None = None) -> tuple:
+    """Return ``(pdf_bytes, hit)`` for a project, rendering only on a cache miss."""
+    cache = cache or get_pdf_cache()
+    key = project_cache_key(project)
+    data = cache.get(key)
+    if data is not None:
+        return data, True
+    data = get_renderer().render_bytes(project)
+    cache.put(key, data)
+    return data, False
+
+
+def generate_pdf_cached(project: Dict[str, Any], destination="estimate.pdf",
+                        cache: PdfCache | None = None) -> tuple:
+    """Like generate_pdf, but served from the cache when the project is unchanged.
+
+    Returns:
+        ``(absolute_path, hit)`` where ``hit`` tells whether the cache was used.
+    """
+    data, hit = render_pdf_cached(project, cache)
+    with open(destination, "wb") as f:
+        f.write(data)
+    return os.path.abspath(destination), hit
@@ -2,30 +2,77 @@
 
 Generate a minimal PDF estimate report from project data using FPDF.
 The generated report contains project info and a three-column breakdown: Task,
-Description and Hours (as requested by the user).
+Description and Hours (as requested by the user). The breakdown groups steps by
+the Feature -> User Story -> Task hierarchy, wraps long text and repeats the
+table header on every page.
+
+PdfRenderer keeps the resources that do not change between documents (the
+decoded logo and the layout settings) so repeated and batch generation only
+pay for the per-project work. generate_pdf uses a shared default renderer.
 """
 
 from fpdf import FPDF
+from fpdf.image_datastructures import ImageCache
+from fpdf.image_parsing import preload_image
+import logging
 import os
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, BinaryIO
+
+from core.estimation import PERCENTILES, estimate_project
+from core.helpers.rollup import RollupTree
+from core.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+LOGO_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "BallLogo.png"))
+
+# Bump whenever the report layout changes; cached PDFs are keyed by it
+RENDERER_VERSION = 4
+# Monte Carlo trials behind a report's confidence range (the editor samples DEFAULT_TRIALS)
+REPORT_TRIALS = 10_000
+
+_DEFAULT = object()
+
+
+@lru_cache(maxsize=1)
+def _default_logo_path():
+    """Return LOGO_PATH if the file exists (checked once per process)."""
+    return LOGO_PATH if os.path.exists(LOGO_PATH) else None
 
 
 class BallMinimalPDF(FPDF):
     """Small helper subclass to render common header/footer elements."""
+
+    def __init__(self, *args, logo_path=_DEFAULT, report_title="Project Estimate", page_offset=0, **kwargs):
+        """
+        Args:
+            logo_path: Logo drawn in the header; defaults to BallLogo.png when
+                present. Pass None to render without a logo.
+            report_title: Title printed in the page header.
+            page_offset: Added to the page numbers in the footer (for a
+                document that continues a previous one).
+        """
+        super().__init__(*args, **kwargs)
+        self.logo_path = _default_logo_path() if logo_path is _DEFAULT else logo_path
+        self.report_title = report_title
+        self.page_offset = page_offset
+
     def header(self):
         # --- LOGO ---
-        try:
-            logo_path = os.path.join(os.path.dirname(__file__), "..", "BallLogo.png")
-            if os.path.exists(logo_path):
-                self.image(logo_path, x=170, y=10, w=25)
-        except:
-            pass
+        if self.logo_path:
+            try:
+                # Decoded once per document (or shared by PdfRenderer), then referenced
+                self.image(self.logo_path, x=170, y=10, w=25)
+            except Exception as e:
+                logger.warning(f"Could not draw logo {self.logo_path}: {e}")
+                self.logo_path = None
 
         # --- TITLE ---
         self.set_xy(10, 15)
         self.set_font("Arial", "B", 18)
         self.set_text_color(0, 0, 0)
-        self.cell(0, 12, "Project Estimate", ln=1, align="L")
+        self.cell(0, 12, self.report_title, ln=1, align="L")
 
         # --- SUBTITLE ---
         self.set_font("Arial", "", 10)
@@ -43,7 +90,330 @@ class BallMinimalPDF(FPDF):
         self.set_y(-12)
         self.set_font("Arial", "I", 8)
         self.set_text_color(130, 130, 130)
-        self.cell(0, 10, f"Page {self.page_no()}", 0, 0, "C")
+        self.cell(0, 10, f"Page {self.page_no() + self.page_offset}", 0, 0, "C")
+
+
+class PdfRenderer:
+    """Reusable report renderer that loads shared resources once.
+
+    The logo is located and decoded when the renderer is created; every
+    document it renders reuses the decoded image instead of checking the file
+    system and parsing the PNG again. Core fonts (Arial/Helvetica) are built
+    into FPDF, so there is no font file to load.
+    """
+
+    # Column widths (clean Ball style)
+    w_task = 60
+    w_desc = 80
+    w_hours = 30
+
+    def __init__(self, logo_path=_DEFAULT):
+        """
+        Args:
+            logo_path: Logo file for the page header; defaults to BallLogo.png
+                when present. Pass None to render without a logo.
+        """
+        self.logo_path = _default_logo_path() if logo_path is _DEFAULT else logo_path
+        self._logo_cache = ImageCache()  # Keeps the logo's embedded ICC profile, if any
+        self._logo_info = self._preload_logo()
+
+    def _preload_logo(self):
+        """Decode the logo once; returns FPDF image info or None."""
+        if not self.logo_path:
+            return None
+        try:
+            _, _, info = preload_image(self._logo_cache, self.logo_path)
+            return info
+        except Exception as e:
+            logger.warning(f"Could not load logo {self.logo_path}: {e}")
+            self.logo_path = None
+            return None
+
+    def new_document(self, report_title: str = "Project Estimate", page_offset: int = 0) -> BallMinimalPDF:
+        """Create an empty document that shares this renderer's resources."""
+        pdf = BallMinimalPDF(logo_path=self.logo_path, report_title=report_title, page_offset=page_offset)
+        if self._logo_info is not None:
+            # Seed the per-document image cache with the already decoded logo
+            info = self._logo_info.__class__(self._logo_info)
+            info["i"] = len(pdf.image_cache.images) + 1
+            info["usages"] = 0
+            if info.get("iccp_i") is not None:
+                # iccp_i indexes the renderer's cache: register the profile in this document's
+                profile = next(p for p, i in self._logo_cache.icc_profiles.items() if i == info["iccp_i"])
+                icc_profiles = pdf.image_cache.icc_profiles
+                info["iccp_i"] = icc_profiles.setdefault(profile, len(icc_profiles))
+            pdf.image_cache.images[self.logo_path] = info
+        pdf.set_auto_page_break(auto=True, margin=15)
+        return pdf
+
+    def render(self, project: Dict[str, Any]) -> BallMinimalPDF:
+        """Render a project into a new FPDF document (not yet written out)."""
+        pdf = self.new_document()
+        self.render_into(pdf, project)
+        return pdf
+
+    def render_into(self, pdf: BallMinimalPDF, project: Dict[str, Any]) -> float:
+        """Append a project section (starting on a new page) to an existing document.
+
+        Returns:
+            The project's total estimated hours.
+        """
+        pdf.add_page()
+
+        # Extract input
+        name = project.get("name", "Untitled Project")
+        architect = project.get("architect", "N/A")
+        area = project.get("area", "N/A")
+        demand = project.get("demand", "N/A")
+        purpose = project.get("purpose", "No purpose specified")
+        steps = project.get("steps", []) or []
+
+        # --- PROJECT NAME ---
+        pdf.set_font("Arial", "B", 15)
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(0, 10, name, ln=1)
+        pdf.ln(4)
+
+        # --- PROJECT INFO ---
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, "Project Information", ln=1)
+        pdf.ln(1)
+
+        pdf.set_font("Arial", "", 11)
+        line_height = 6
+
+        def info_row(label, value):
+            pdf.set_font("Arial", "B", 11)
+            pdf.cell(45, line_height, f"{label}:", ln=0)
+            pdf.set_font("Arial", "", 11)
+            pdf.cell(0, line_height, value, ln=1)
+
+        info_row("Demand ID", demand)
+        info_row("Area", area)
+        info_row("Solution Architect", architect)
+
+        pdf.ln(6)
+
+        # --- PURPOSE ---
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, "Purpose", ln=1)
+
+        pdf.set_font("Arial", "", 11)
+        pdf.multi_cell(0, 6, purpose)
+        pdf.ln(4)
+
+        # --- BREAKDOWN ---
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, "Project Breakdown", ln=1)
+        pdf.ln(1)
+
+        w_task, w_desc, w_hours = self.w_task, self.w_desc, self.w_hours
+        tree = RollupTree.from_steps(steps)  # Shared by the table and the confidence range
+        total_hours = self._draw_breakdown(pdf, steps, tree)
+
+        pdf.ln(4)
+
+        # --- TOTAL ---
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(w_task + w_desc, 8, "Total Estimated Hours")
+        pdf.cell(w_hours, 8, f"{total_hours:.1f}", ln=1, align="R")
+
+        # --- CONFIDENCE (only when steps carry optimistic / pessimistic hours) ---
+        # Fixed seed: identical reports for identical projects; nothing is sampled without ranges
+        estimate = estimate_project(project, trials=REPORT_TRIALS, seed=0, tree=tree)
+        if estimate["has_ranges"]:
+            pdf.set_font("Arial", "", 11)
+            pdf.set_text_color(60, 60, 60)
+            pdf.cell(0, 7, f"Confidence range (PERT Monte Carlo, {estimate['trials']:,} trials)", ln=1)
+            for p in PERCENTILES:
+                pdf.cell(w_task + w_desc, 6, f"P{p} - {p}% chance of finishing within")
+                pdf.cell(w_hours, 6, f"{estimate[f'p{p}']:.1f}", ln=1, align="R")
+            pdf.set_text_color(0, 0, 0)
+
+        pdf.ln(10)
+
+        # --- DISCLAIMER ---
+        pdf.set_font("Arial", "I", 9)
+        pdf.set_text_color(120, 120, 120)
+        pdf.multi_cell(
+            0,
+            5,
+            "This estimate represents the projected hours for task execution. "
+            "Actual requirements may vary depending on process complexity."
+        )
+        return total_hours
+
+    # ---------- Breakdown table ----------
+
+    line_h = 5        # Height of one wrapped text line
+    row_pad = 1.2     # Vertical padding above and below each row
+    indent = 4        # Indentation per hierarchy level in the Task column
+    row_styles = {
+        # depth: (font style, font size, fill color or None)
+        0: ("B", 10, (236, 240, 245)),
+        1: ("B", 10, None),
+        2: ("", 10, None),
+    }
+
+    def _table_header(self, pdf):
+        pdf.set_font("Arial", "B", 11)
+        pdf.set_text_color(0, 0, 0)
+        pdf.set_draw_color(160, 160, 160)
+        pdf.set_line_width(0.25)
+
+        pdf.cell(self.w_task, 8, "Task", border="B")
+        pdf.cell(self.w_desc, 8, "Description", border="B")
+        pdf.cell(self.w_hours, 8, "Hours", border="B", ln=1, align="R")
+
+    @staticmethod
+    def _wrap_width(pdf, word, widths):
+        """Return the width of ``word`` in the current font, memoized in ``widths``."""
+        key = (pdf.font_style, pdf.font_size_pt, word)
+        w = widths.get(key)
+        if w is None:
+            w = widths[key] = pdf.get_string_width(word)
+        return w
+
+    @staticmethod
+    def _wrap(pdf, text, width, widths):
+        """Greedy word wrap of ``text`` into lines no wider than ``width`` (mm).
+
+        Word widths are memoized in ``widths`` (keyed by font and word), so
+        repeated vocabulary is measured once per document.
+        """
+        def measure(word):
+            return PdfRenderer._wrap_width(pdf, word, widths)
+
+        space = measure(" ")
+        lines = []
+        for paragraph in str(text).splitlines() or [""]:
+            line, line_w = "", 0.0
+            for word in paragraph.split():
+                word_w = measure(word)
+                while word_w > width:
+                    # Hard-break words longer than the column
+                    cut = max(1, int(len(word) * width / word_w))
+                    head, word = word[:cut], word[cut:]
+                    if line:
+                        lines.append(line)
+                    lines.append(head)
+                    line, line_w = "", 0.0
+                    word_w = measure(word)
+                if not line:
+                    line, line_w = word, word_w
+                elif line_w + space + word_w <= width:
+                    line, line_w = f"{line} {word}", line_w + space + word_w
+                else:
+                    lines.append(line)
+                    line, line_w = word, word_w
+            lines.append(line)
+        return lines
+
+    def _draw_breakdown(self, pdf, steps, tree: RollupTree | None = None) -> float:
+        """Draw the hierarchical breakdown table and return the total hours.
+
+        Rows are grouped Feature -> User Story -> Task; group rows show the
+        subtotal of their children. Each row is measured once (wrapped to the
+        column widths), a new page with a repeated header is started whenever
+        the row would not fit, and the row is then drawn line by line with the
+        low-level text() primitive (text is already laid out, so cell() would
+        only repeat the work).
+        """
+        self._table_header(pdf)
+        widths = {}
+        x0 = pdf.l_margin
+        table_w = self.w_task + self.w_desc + self.w_hours
+        # A single row may use at most most of a page (header and margins excluded)
+        max_lines = max(1, int((pdf.h - pdf.t_margin - pdf.b_margin - 50) / self.line_h))
+        total_hours = 0.0
+
+        for step, depth, hours, is_group in breakdown_rows(steps, tree):
+            if depth == 0:
+                total_hours += hours
+            style, size, fill = self.row_styles[min(depth, 2)]
+            pdf.set_font("Arial", style, size)
+
+            indent = self.indent * depth
+            name_lines = self._wrap(pdf, step.get("name", ""), self.w_task - indent - 4, widths)
+            desc_lines = self._wrap(pdf, step.get("description", "") or "-", self.w_desc - 4, widths)
+            name_lines = name_lines[:max_lines]
+            if len(desc_lines) > max_lines:
+                desc_lines = desc_lines[:max_lines - 1] + [desc_lines[max_lines - 1] + " ..."]
+            row_h = max(len(name_lines), len(desc_lines)) * self.line_h + 2 * self.row_pad
+
+            if pdf.will_page_break(row_h):
+                pdf.add_page()
+                self._table_header(pdf)
+                pdf.set_font("Arial", style, size)
+
+            y = pdf.get_y()
+            if fill:
+                pdf.set_fill_color(*fill)
+                pdf.rect(x0, y, table_w, row_h, style="F")
+
+            # Baseline of the first line, vertically centred like cell() does
+            base = y + self.row_pad + 0.5 * self.line_h + 0.3 * pdf.font_size
+            pad = pdf.c_margin
+            for i, line in enumerate(name_lines):
+                pdf.text(x0 + indent + pad, base + i * self.line_h, line)
+            for i, line in enumerate(desc_lines):
+                pdf.text(x0 + self.w_task + pad, base + i * self.line_h, line)
+            hours_text = f"{hours:.1f}"
+            pdf.text(x0 + table_w - pad - self._wrap_width(pdf, hours_text, widths), base, hours_text)
+
+            pdf.set_draw_color(225, 225, 225)
+            pdf.line(x0, y + row_h, x0 + table_w, y + row_h)
+            pdf.set_xy(x0, y + row_h)
+
+        return total_hours
+
+    # Every report (generate_pdf, PDF cache misses, batch export, API) ends in one of these
+    @timed("pdf.generate_pdf")
+    def render_to_file(self, project: Dict[str, Any], destination="estimate.pdf") -> str:
+        """Render a project and save it; returns the absolute destination path."""
+        self.render(project).output(destination)
+        return os.path.abspath(destination)
+
+    @timed("pdf.generate_pdf")
+    def render_bytes(self, project: Dict[str, Any]) -> bytes:
+        """Render a project and return the PDF document as bytes (no file involved)."""
+        return bytes(self.render(project).output())
+
+    @timed("pdf.generate_pdf")
+    def render_to_stream(self, project: Dict[str, Any], stream: BinaryIO) -> int:
+        """Render a project into a caller-supplied binary stream.
+
+        Returns:
+            Number of bytes written.
+        """
+        data = self.render(project).output()
+        stream.write(data)
+        return len(data)
+
+
+def breakdown_rows(steps: list, tree: RollupTree | None = None):
+    """Yield ``(step, depth, hours, is_group)`` in Feature -> User Story -> Task order.
+
+    A User Story is nested under its parent Feature and a Task under its parent
+    User Story (parents are referenced by name). Steps without a valid parent
+    are listed at the top level. Leaf rows carry their own hours; group rows
+    carry the sum of their children, so hours are never counted twice. Pass
+    ``tree`` when ``RollupTree.from_steps(steps)`` was already built.
+    """
+    tree = tree if tree is not None else RollupTree.from_steps(steps)
+    for index, depth, hours, is_group in tree.rows():
+        yield steps[index], depth, hours, is_group
+
+
+_renderer = None
+
+
+def get_renderer() -> PdfRenderer:
+    """Return the shared default renderer (created on first use)."""
+    global _renderer
+    if _renderer is None:
+        _renderer = PdfRenderer()
+    return _renderer
 
 
 def generate_pdf(project: Dict[str, Any], destination="estimate.pdf") -> str:
@@ -59,103 +429,31 @@ def generate_pdf(project: Dict[str, Any], destination="estimate.pdf") -> str:
     Returns:
         Absolute path to the saved PDF file.
     """
-    pdf = BallMinimalPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-
-    # Extract input
-    name = project.get("name", "Untitled Project")
-    architect = project.get("architect", "N/A")
-    area = project.get("area", "N/A")
-    demand = project.get("demand", "N/A")
-    purpose = project.get("purpose", "No purpose specified")
-    steps = project.get("steps", []) or []
-
-    # --- PROJECT NAME ---
-    pdf.set_font("Arial", "B", 15)
-    pdf.set_text_color(0, 0, 0)
-    pdf.cell(0, 10, name, ln=1)
-    pdf.ln(4)
-
-    # --- PROJECT INFO ---
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 8, "Project Information", ln=1)
-    pdf.ln(1)
-
-    pdf.set_font("Arial", "", 11)
-    line_height = 6
-
-    def info_row(label, value):
-        pdf.set_font("Arial", "B", 11)
-        pdf.cell(45, line_height, f"{label}:", ln=0)
-        pdf.set_font("Arial", "", 11)
-        pdf.cell(0, line_height, value, ln=1)
+    return get_renderer().render_to_file(project, destination)
+
 
-    info_row("Demand ID", demand)
-    info_row("Area", area)
-    info_row("Solution Architect", architect)
+def generate_pdf_bytes(project: Dict[str, Any]) -> bytes:
+    """Generate the PDF report in memory and return it as bytes.
 
-    pdf.ln(6)
+    Useful to zip, serve over HTTP or assert on reports without touching disk.
 
-    # --- PURPOSE ---
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 8, "Purpose", ln=1)
+    Args:
+        project: Dictionary containing project fields and a 'steps' list.
 
-    pdf.set_font("Arial", "", 11)
-    pdf.multi_cell(0, 6, purpose)
-    pdf.ln(4)
+    Returns:
+        The PDF document as bytes.
+    """
+    return get_renderer().render_bytes(project)
 
-    # --- BREAKDOWN ---
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 8, "Project Breakdown", ln=1)
-    pdf.ln(1)
 
-    # Column widths (clean Ball style)
-    w_task = 60
-    w_desc = 80
-    w_hours = 30
+def write_pdf(project: Dict[str, Any], stream: BinaryIO) -> int:
+    """Write the PDF report into a binary stream (file object, BytesIO, socket wrapper...).
+
+    Args:
+        project: Dictionary containing project fields and a 'steps' list.
+        stream: Writable binary stream; it is not closed.
 
-    # HEADER
-    pdf.set_font("Arial", "B", 11)
-    pdf.set_draw_color(160, 160, 160)
-    pdf.set_line_width(0.25)
-
-    pdf.cell(w_task, 8, "Task", border="B")
-    pdf.cell(w_desc, 8, "Description", border="B")
-    pdf.cell(w_hours, 8, "Hours", border="B", ln=1, align="R")
-
-    # BODY
-    pdf.set_font("Arial", "", 11)
-    total_hours = 0
-
-    for step in steps:
-        task = step.get("name", "")
-        desc = step.get("description", "") or "-"
-        hours = float(step.get("hours") or 0)
-        total_hours += hours
-
-        pdf.cell(w_task, 7, task)
-        pdf.cell(w_desc, 7, desc)
-        pdf.cell(w_hours, 7, f"{hours:.1f}", ln=1, align="R")
-
-    pdf.ln(4)
-
-    # --- TOTAL ---
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(w_task + w_desc, 8, "Total Estimated Hours")
-    pdf.cell(w_hours, 8, f"{total_hours:.1f}", ln=1, align="R")
-
-    pdf.ln(10)
-
-    # --- DISCLAIMER ---
-    pdf.set_font("Arial", "I", 9)
-    pdf.set_text_color(120, 120, 120)
-    pdf.multi_cell(
-        0,
-        5,
-        "This estimate represents the projected hours for task execution. "
-        "Actual requirements may vary depending on process complexity."
-    )
-
-    pdf.output(destination)
-    return os.path.abspath(destination)
+    Returns:
+        Number of bytes written.
+    """
+    return get_renderer().render_to_stream(project, stream)
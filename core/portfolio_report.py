@@ -0,0 +1,172 @@
+"""core/portfolio_report.py
+
+Combined portfolio PDF built on core.pdf_generator.
+The report opens with a summary section (total estimated hours by area,
+architect and demand) followed by one section per project. Projects are
+streamed from the ProjectManager twice (once to aggregate, once to render), so
+no more than one project is held in memory at a time.
+
+FPDF keeps every page of a document until it is written out, so the report is
+rendered as a series of documents of about PAGES_PER_DOCUMENT pages, each
+copied into the output by core.helpers.pdf_stream as soon as it is full. The
+summary tables list the SUMMARY_ROWS largest groups and fold the rest into one
+row. Memory therefore stays bounded whatever the size of the portfolio.
+
+Command line:
+    python -m core.portfolio_report portfolio.pdf
+"""
+
+import argparse
+import logging
+import os
+
+from core.helpers.pdf_stream import PdfStreamWriter
+from core.helpers.rollup import RollupTree
+from core.pdf_generator import PdfRenderer, get_renderer
+
+logger = logging.getLogger(__name__)
+
+PAGES_PER_DOCUMENT = 40  # Pages rendered before a document is written out
+SUMMARY_ROWS = 30        # Rows per summary table; smaller groups are folded into one row
+REPORT_TITLE = "Portfolio Estimate"
+
+
+def project_total(project: dict) -> float:
+    """Return a project's total hours (sum of the top-level hierarchy rollups)."""
+    return RollupTree.from_steps(project.get("steps") or []).total
+
+
+def summarize_portfolio(projects) -> dict:
+    """Aggregate total hours by area, architect and demand from an iterable of projects.
+
+    Returns:
+        Dictionary with "projects" (count), "hours" (grand total) and
+        "by_area" / "by_architect" / "by_demand" mappings of {key: [count, hours]}.
+    """
+    summary = {"projects": 0, "hours": 0.0, "by_area": {}, "by_architect": {}, "by_demand": {}}
+    for project in projects:
+        try:
+            hours = project_total(project)
+        except (TypeError, ValueError):
+            logger.warning(f"Skipping hours of project '{project.get('name')}': invalid step hours")
+            hours = 0.0
+        summary["projects"] += 1
+        summary["hours"] += hours
+        for group, field in (("by_area", "area"), ("by_architect", "architect"), ("by_demand", "demand")):
+            key = project.get(field) or "N/A"
+            entry = summary[group].setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += hours
+    return summary
+
+
+def _summary_table(pdf, title, groups):
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(0, 8, title, ln=1)
+
+    pdf.set_font("Arial", "B", 10)
+    pdf.set_draw_color(160, 160, 160)
+    pdf.set_line_width(0.25)
+    pdf.cell(110, 7, "Name", border="B")
+    pdf.cell(30, 7, "Projects", border="B", align="R")
+    pdf.cell(30, 7, "Hours", border="B", ln=1, align="R")
+
+    pdf.set_font("Arial", "", 10)
+    rows = sorted(groups.items(), key=lambda kv: -kv[1][1])
+    if len(rows) > SUMMARY_ROWS:
+        rest = rows[SUMMARY_ROWS - 1:]
+        rows = rows[:SUMMARY_ROWS - 1] + [(f"Other ({len(rest)} more)",
+                                           (sum(c for _, (c, _) in rest), sum(h for _, (_, h) in rest)))]
+    for key, (count, hours) in rows:
+        pdf.cell(110, 6, str(key)[:70])
+        pdf.cell(30, 6, str(count), align="R")
+        pdf.cell(30, 6, f"{hours:.1f}", ln=1, align="R")
+    pdf.ln(6)
+
+
+def render_portfolio(manager=None, renderer: PdfRenderer | None = None,
+                     pages_per_document: int = PAGES_PER_DOCUMENT):
+    """Render the portfolio report as a sequence of FPDF documents (not yet written out).
+
+    Each document holds about ``pages_per_document`` pages (a project is never
+    split) and continues the page numbering of the previous one.
+
+    Args:
+        manager: ProjectManager to stream projects from; defaults to the app's one.
+        renderer: PdfRenderer to use; defaults to the shared one.
+        pages_per_document: Pages after which a document is yielded.
+    """
+    if manager is None:
+        from core.helpers.project_utils import get_project_manager
+        manager = get_project_manager()
+    renderer = renderer or get_renderer()
+
+    # Pass 1: aggregates only (projects are discarded as soon as they are counted)
+    summary = summarize_portfolio(manager.iter_projects())
+
+    pdf = renderer.new_document(report_title=REPORT_TITLE)
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 15)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(0, 10, "Portfolio Summary", ln=1)
+    pdf.set_font("Arial", "", 11)
+    pdf.cell(0, 6, f"Projects: {summary['projects']}", ln=1)
+    pdf.cell(0, 6, f"Total Estimated Hours: {summary['hours']:.1f}", ln=1)
+    pdf.ln(6)
+
+    _summary_table(pdf, "Hours by Area", summary["by_area"])
+    _summary_table(pdf, "Hours by Solution Architect", summary["by_architect"])
+    _summary_table(pdf, "Hours by Demand", summary["by_demand"])
+
+    # Pass 2: one section per project, streamed again from storage
+    for project in manager.iter_projects():
+        try:
+            project_total(project)  # Validate hours before drawing a partial section
+        except (TypeError, ValueError) as e:
+            logger.error(f"Skipping project '{project.get('name')}' in portfolio report: {e}")
+            continue
+        if pdf.page >= pages_per_document:
+            yield pdf
+            pdf = renderer.new_document(report_title=REPORT_TITLE, page_offset=pdf.page_offset + pdf.page)
+        renderer.render_into(pdf, project)
+    yield pdf
+
+
+def write_portfolio(stream, manager=None, renderer: PdfRenderer | None = None) -> int:
+    """Render the portfolio report into a binary stream, one document at a time.
+
+    Returns:
+        Number of pages written.
+    """
+    writer = PdfStreamWriter(stream)
+    for pdf in render_portfolio(manager, renderer):
+        writer.add(pdf.output())
+    writer.close()
+    return writer.page_count
+
+
+def generate_portfolio_pdf(destination="portfolio.pdf", manager=None,
+                           renderer: PdfRenderer | None = None) -> str:
+    """Generate the portfolio report into ``destination`` (a path or a binary stream).
+
+    Returns:
+        Absolute path of the written file, or an empty string for streams.
+    """
+    if hasattr(destination, "write"):
+        write_portfolio(destination, manager, renderer)
+        return ""
+    with open(destination, "wb") as f:
+        write_portfolio(f, manager, renderer)
+    return os.path.abspath(destination)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a combined portfolio PDF")
+    parser.add_argument("destination", nargs="?", default="portfolio.pdf")
+    args = parser.parse_args(argv)
+    print(f"Portfolio report saved at {generate_portfolio_pdf(args.destination)}")
+
+
+if __name__ == "__main__":
+    main()
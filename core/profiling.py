@@ -0,0 +1,176 @@
+"""core/profiling.py
+
+Opt-in cProfile hooks for UI event handlers, so a user whose data makes the
+editor slow can send a profile instead of a description.
+
+Enabled through environment variables (read when the handlers are wrapped,
+after load_dotenv, so a .env file works):
+
+    ESTIMATOR_PROFILE=1                 # off when unset
+    ESTIMATOR_PROFILE_DIR=C:\\Temp\\prof  # default: <temp>/project_estimator_profiles
+    ESTIMATOR_PROFILE_MIN_MS=50         # only keep invocations at least this slow
+    ESTIMATOR_PROFILE_SAMPLE=1.0        # fraction of invocations to profile
+    ESTIMATOR_PROFILE_KEEP=50           # newest .prof files kept (older ones are deleted)
+
+Each profiled invocation is written as ``<time>-<pid>-<n>_<handler>_<ms>ms.prof``
+(pstats format, readable with snakeviz or ``python -m pstats``), and
+summary.json keeps per-handler counts and timings. Print the slowest handlers
+and the hottest functions of the slowest invocation with:
+
+    python -m core.profiling [PROFILE_DIR]
+
+When profiling is off the handlers are returned unwrapped. Work a handler
+hands to page.run_thread runs on another thread and is not captured.
+"""
+
+import argparse
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+from itertools import count
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEEP = 50
+DEFAULT_MIN_MS = 50.0
+SUMMARY_FILE = "summary.json"
+
+_local = threading.local()
+_summary_lock = threading.Lock()
+_sequence = count(1)  # Keeps profile names unique within a second (next() is atomic)
+
+
+def profile_dir() -> Path:
+    return Path(os.getenv("ESTIMATOR_PROFILE_DIR") or Path(tempfile.gettempdir()) / "project_estimator_profiles")
+
+
+def is_enabled() -> bool:
+    return os.getenv("ESTIMATOR_PROFILE", "").strip().lower() in ("1", "true", "on", "yes")
+
+
+def _settings() -> dict:
+    return {
+        "dir": profile_dir(),
+        "min_ms": float(os.getenv("ESTIMATOR_PROFILE_MIN_MS") or DEFAULT_MIN_MS),
+        "sample": float(os.getenv("ESTIMATOR_PROFILE_SAMPLE") or 1.0),
+        "keep": int(os.getenv("ESTIMATOR_PROFILE_KEEP") or DEFAULT_KEEP),
+    }
+
+
+def profiled(name: str):
+    """Decorator profiling each call of a UI event handler when ESTIMATOR_PROFILE is set.
+
+    The environment is checked when the handler is wrapped; with profiling off
+    the original function is returned, so there is no overhead at all.
+    """
+
+    def decorator(handler):
+        if not is_enabled():
+            return handler
+        settings = _settings()
+        settings["dir"].mkdir(parents=True, exist_ok=True)
+        logger.info(f"Profiling handler {name} -> {settings['dir']}")
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            # cProfile allows one active profiler per thread: nested handlers run unprofiled
+            if getattr(_local, "active", False) or random.random() >= settings["sample"]:
+                return handler(*args, **kwargs)
+            profiler = cProfile.Profile()
+            _local.active = True
+            started = time.perf_counter()
+            try:
+                return profiler.runcall(handler, *args, **kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                _local.active = False
+                try:
+                    _record(name, profiler, elapsed_ms, settings)
+                except Exception as e:  # Profiling must never break the UI
+                    logger.error(f"Could not write profile for {name}: {e}")
+
+        return wrapper
+
+    return decorator
+
+
+def _record(name, profiler, elapsed_ms, settings):
+    directory = settings["dir"]
+    path = None
+    if elapsed_ms >= settings["min_ms"]:
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_sequence)}"
+        path = directory / f"{stamp}_{re.sub(r'[^A-Za-z0-9_]+', '_', name)}_{elapsed_ms:.0f}ms.prof"
+        profiler.dump_stats(str(path))
+        _rotate(directory, settings["keep"])
+
+    with _summary_lock:
+        summary_path = directory / SUMMARY_FILE
+        try:
+            summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            summary = {}
+        entry = summary.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "slowest": None})
+        entry["calls"] += 1
+        entry["total_ms"] = round(entry["total_ms"] + elapsed_ms, 3)
+        if elapsed_ms > entry["max_ms"]:
+            entry["max_ms"] = round(elapsed_ms, 3)
+            if path is not None:
+                entry["slowest"] = path.name
+        tmp = summary_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        os.replace(tmp, summary_path)
+
+
+def _rotate(directory: Path, keep: int):
+    """Delete the oldest profiles beyond ``keep``."""
+    files = sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime)
+    for old in files[:max(0, len(files) - keep)]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+def summarize(directory=None, top: int = 15) -> str:
+    """Return a text report: handlers by worst time, then the hottest functions of the slowest profile."""
+    directory = Path(directory) if directory else profile_dir()
+    try:
+        summary = json.loads((directory / SUMMARY_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return f"No profiles found in {directory}"
+
+    lines = [f"Profiles in {directory}", "", f"{'handler':<24} {'calls':>6} {'mean ms':>9} {'max ms':>9}  slowest profile"]
+    ranked = sorted(summary.items(), key=lambda kv: kv[1]["max_ms"], reverse=True)
+    for name, entry in ranked:
+        mean = entry["total_ms"] / entry["calls"] if entry["calls"] else 0.0
+        lines.append(f"{name:<24} {entry['calls']:>6} {mean:>9.1f} {entry['max_ms']:>9.1f}  {entry['slowest'] or '-'}")
+
+    slowest = next((directory / e["slowest"] for _, e in ranked
+                    if e["slowest"] and (directory / e["slowest"]).exists()), None)
+    if slowest is not None:
+        stream = io.StringIO()
+        pstats.Stats(str(slowest), stream=stream).sort_stats("cumulative").print_stats(top)
+        lines += ["", f"Hottest functions in {slowest.name}:", stream.getvalue()]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize UI handler profiles")
+    parser.add_argument("directory", nargs="?", help="Profile directory (default: ESTIMATOR_PROFILE_DIR)")
+    parser.add_argument("--top", type=int, default=15, help="Functions listed for the slowest profile")
+    args = parser.parse_args(argv)
+    print(summarize(args.directory, args.top))
+
+
+if __name__ == "__main__":
+    main()
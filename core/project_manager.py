@@ -9,6 +9,8 @@ import logging
 from pathlib import Path
 from threading import Lock
 
+from core.metrics import timed
+
 logger = logging.getLogger(__name__)
 lock = Lock()
 
@@ -28,6 +30,7 @@ class ProjectManager:
             path: Path to a JSON file used to store the projects (network or local).
         """
         self.path = Path(path)
+        self._save_listeners = []
         self._ensure_directory()
         self._ensure_file_exists()
 
@@ -50,6 +53,7 @@ class ProjectManager:
             logger.error(f"Error creating file {self.path}: {e}")
             raise
 
+    @timed("storage.load_projects")
     def load_projects(self):
         """
         Load projects from the JSON file.
@@ -80,6 +84,87 @@ class ProjectManager:
             logger.error(f"Error loading projects from {self.path}: {e}")
             return []
 
+    @timed("storage.load_project_models")
+    def load_project_models(self):
+        """
+        Load projects validated against core.models.Project in one pass.
+
+        Hours are already floats and the values have the documented types, so
+        callers can skip their own conversions. Steps or projects that fail
+        validation are left out and logged, so the result is for reading only:
+        never pass it to save_projects().
+
+        Returns:
+            A list of project dictionaries. Returns an empty list if the file
+            cannot be read.
+        """
+        from core.models import load_models
+
+        return load_models(self.path)
+
+    def iter_projects(self, chunk_size: int = 1 << 16):
+        """
+        Yield projects one at a time while reading the JSON file incrementally.
+
+        Only the project being decoded (plus one read chunk) is held in memory,
+        so callers can walk very large files with bounded memory. Files using
+        the legacy dict layout fall back to load_projects().
+
+        Args:
+            chunk_size: Number of characters read from the file per chunk.
+
+        Yields:
+            Project dictionaries in file order. Stops (with an error logged) on
+            malformed JSON.
+        """
+        decoder = json.JSONDecoder()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                buf = f.read(chunk_size)
+                pos = len(buf) - len(buf.lstrip())
+                if buf[pos:pos + 1] != "[":
+                    yield from self.load_projects() if buf.strip() else []
+                    return
+                pos += 1
+                eof = False
+                count = 0
+
+                while True:
+                    # Skip separators between array items
+                    while True:
+                        while pos < len(buf) and buf[pos] in " \t\r\n,":
+                            pos += 1
+                        if pos < len(buf) or eof:
+                            break
+                        buf, pos = f.read(chunk_size), 0
+                        eof = not buf
+
+                    if pos >= len(buf) or buf[pos] == "]":
+                        logger.debug(f"Projects streamed from {self.path}: {count} items")
+                        return
+
+                    try:
+                        project, end = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        # Item spans the chunk boundary: drop consumed text and read more
+                        more = f.read(chunk_size)
+                        eof = not more
+                        buf, pos = buf[pos:] + more, 0
+                        continue
+
+                    count += 1
+                    yield project
+                    pos = end
+                    if pos > chunk_size:
+                        buf, pos = buf[pos:], 0
+        except json.JSONDecodeError as e:
+            logger.error(f"Error decoding JSON from {self.path}: {e}")
+        except Exception as e:
+            logger.error(f"Error streaming projects from {self.path}: {e}")
+
+    @timed("storage.save_projects")
     def save_projects(self, projects):
         """
         Save the projects list to the JSON file in a thread-safe manner.
@@ -96,6 +181,21 @@ class ProjectManager:
                 logger.error(f"Error saving projects to {self.path}: {e}")
                 raise
 
+        for listener in self._save_listeners:
+            try:
+                listener(projects)
+            except Exception as e:
+                logger.error(f"Save listener {listener!r} failed for {self.path}: {e}")
+
+    def add_save_listener(self, callback):
+        """
+        Register a callback invoked with the projects list after every successful save.
+
+        Args:
+            callback: Callable taking the saved list of project dictionaries.
+        """
+        self._save_listeners.append(callback)
+
     def export_project_to_json(self):
         """
         Export the currently loaded project to JSON format for external use (e.g., DevOps upload).
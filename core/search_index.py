@@ -0,0 +1,300 @@
+"""core/search_index.py
+
+Full-text search over every saved project: name, purpose, area, architect,
+step names and step descriptions.
+
+The index keeps, per project, the weighted frequency of each term (a match in
+the project or step name counts more than one in a description) and the
+inverted postings built from them. It is stored in a JSON file next to the
+projects file and updated incrementally after every save, on a background
+thread so the save itself does not wait: projects passed as the same objects
+as in the previous save are not hashed again, only projects whose indexed
+text changed are re-tokenized, and only their entries are appended to a
+delta log (``<projects>_search.log``) that is folded into the JSON file once
+it grows past a fraction of it. Queries rank projects with BM25 over
+the postings alone, so no project body is read to answer them; each term's
+postings are scored as NumPy arrays (cached until the term changes). The last
+query word also matches as a prefix, which suits search-as-you-type.
+Saving, logging and the staleness checks are shared with the portfolio
+analytics (core/helpers/derived_store.py).
+"""
+
+import hashlib
+import logging
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from threading import Lock
+
+import numpy as np
+
+from core.helpers.derived_store import DerivedStore
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+FIELD_WEIGHTS = {"name": 3.0, "area": 1.5, "architect": 1.5, "purpose": 1.0,
+                 "step_name": 2.0, "step_description": 1.0}
+MAX_PREFIX_TERMS = 50  # Prefix expansions kept for the last query word
+K1 = 1.2
+B = 0.75
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text) -> list:
+    """Lower-case, accent-folded words of ``text`` (``"Migração SAP"`` -> ``["migracao", "sap"]``)."""
+    if not text:
+        return []
+    text = str(text).casefold()
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return _WORD_RE.findall(text)
+
+
+def _fields(project: dict):
+    yield "name", project.get("name")
+    yield "area", project.get("area")
+    yield "architect", project.get("architect")
+    yield "purpose", project.get("purpose")
+    for step in project.get("steps") or []:
+        yield "step_name", step.get("name")
+        yield "step_description", step.get("description")
+
+
+def _fingerprint(project: dict) -> str:
+    """Hash of a project's indexed text."""
+    digest = hashlib.blake2b(digest_size=12)
+    for field, value in _fields(project):
+        digest.update(f"{field}\x1f{value or ''}\x1e".encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def _document(project: dict, merge_into: dict | None = None) -> dict:
+    """Build the stored entry for a project, or add it to the entry of an earlier one with its name."""
+    doc = merge_into or {
+        "fingerprint": "",
+        "area": project.get("area") or "",
+        "architect": project.get("architect") or "",
+        "steps": 0,
+        "length": 0.0,
+        "terms": {},
+    }
+    weights = doc["terms"]
+    for field, value in _fields(project):
+        weight = FIELD_WEIGHTS[field]
+        for term in tokenize(value):
+            weights[term] = weights.get(term, 0.0) + weight
+            doc["length"] += weight
+    doc["steps"] += len(project.get("steps") or [])
+    fingerprint = _fingerprint(project)
+    doc["fingerprint"] = f"{doc['fingerprint']},{fingerprint}" if doc["fingerprint"] else fingerprint
+    return doc
+
+
+class SearchIndex(DerivedStore):
+    """Persistent, incrementally maintained inverted index for one projects file.
+
+    Projects with the same name are indexed as one document, matching how the
+    editor selects projects by name. Saves made elsewhere are picked up
+    before queries, as in the portfolio analytics.
+    """
+
+    label = "search index"
+
+    def __init__(self, manager, path=None):
+        """
+        Args:
+            manager: ProjectManager whose saves keep the index current.
+            path: Index file; defaults to ``<projects>_search.json``.
+        """
+        super().__init__(manager, path or manager.path.with_name(f"{manager.path.stem}_search.json"))
+
+    # ---------- Maintenance ----------
+
+    def _reset(self):
+        self._docs = {}      # name -> stored document (fingerprint, metadata, term weights)
+        self._ids = {}       # name -> integer id used in the postings
+        self._names = []     # id -> name (None for free ids)
+        self._free = []
+        self._lengths = np.zeros(0)
+        self._postings = {}  # term -> {id: weight}
+        self._arrays = {}    # term -> (ids, weights) arrays, dropped when the term changes
+        self._total_length = 0.0
+        self._vocabulary = None  # Sorted terms for prefix search, rebuilt lazily
+
+    def _add(self, name: str, doc: dict):
+        if self._free:
+            doc_id = self._free.pop()
+            self._names[doc_id] = name
+        else:
+            doc_id = len(self._names)
+            self._names.append(name)
+            if doc_id >= len(self._lengths):
+                self._lengths = np.concatenate([self._lengths, np.zeros(max(1024, len(self._lengths)))])
+        self._docs[name] = doc
+        self._ids[name] = doc_id
+        self._lengths[doc_id] = doc["length"]
+        self._total_length += doc["length"]
+        for term, weight in doc["terms"].items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary = None
+            postings[doc_id] = weight
+            self._arrays.pop(term, None)
+
+    def _remove(self, name: str):
+        doc = self._docs.pop(name)
+        doc_id = self._ids.pop(name)
+        self._names[doc_id] = None
+        self._free.append(doc_id)
+        self._lengths[doc_id] = 0.0
+        self._total_length -= doc["length"]
+        for term in doc["terms"]:
+            postings = self._postings[term]
+            del postings[doc_id]
+            self._arrays.pop(term, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+
+    def _term_arrays(self, term: str):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings[term]
+            arrays = self._arrays[term] = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings)),
+            )
+        return arrays
+
+    def _build(self, projects):
+        docs = {}
+        for project in projects:
+            name = project.get("name") or ""
+            docs[name] = _document(project, docs.get(name))
+        for name, doc in docs.items():
+            self._add(name, doc)
+
+    def _restore(self, stored: dict) -> bool:
+        if stored.get("version") != INDEX_VERSION:
+            return False
+        for name, doc in stored["docs"].items():
+            self._add(name, doc)
+        return True
+
+    def _snapshot(self) -> dict:
+        return {"version": INDEX_VERSION, "docs": self._docs}
+
+    def _entries(self) -> dict:
+        return self._docs
+
+    def _changed(self, name: str, group: list):
+        fingerprint = ",".join(_fingerprint(p) for p in group)
+        doc = self._docs.get(name)
+        if doc is not None and doc["fingerprint"] == fingerprint:
+            return None
+        doc = None
+        for project in group:
+            doc = _document(project, doc)
+        return doc
+
+    def _apply_changes(self, changed: dict, removed: list):
+        for name in removed:
+            if name in self._docs:
+                self._remove(name)
+        for name, doc in changed.items():
+            if name in self._docs:
+                self._remove(name)
+            self._add(name, doc)
+
+    # ---------- Queries ----------
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _expand(self, word: str, prefix: bool) -> list:
+        if word in self._postings and not prefix:
+            return [word]
+        if not prefix:
+            return []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, word)
+        terms = []
+        for term in vocabulary[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(word):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query: str, limit: int = 20, prefix: bool = True) -> list:
+        """Rank projects for ``query`` with BM25.
+
+        Every query word adds to the score; projects matching more of the
+        words rank first. With ``prefix`` the last word also matches longer
+        terms ("conn" finds "connector").
+
+        Returns:
+            Up to ``limit`` ``{"name", "area", "architect", "steps", "score",
+            "matched"}`` dictionaries, best first.
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return []
+        self._refresh_if_stale()
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs:
+                return []
+            size = len(self._names)
+            norms = K1 * (1 - B + B * self._lengths[:size] / (self._total_length / n_docs or 1.0))
+            scores = np.zeros(size)
+            matched = np.zeros(size, dtype=np.int64)
+            for position, word in enumerate(words):
+                word_scores = np.zeros(size)
+                for term in self._expand(word, prefix and position == len(words) - 1):
+                    ids, weights = self._term_arrays(term)
+                    idf = math.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+                    term_scores = idf * weights * (K1 + 1) / (weights + norms[ids])
+                    # Best expansion of a prefix counts once per project
+                    word_scores[ids] = np.maximum(word_scores[ids], term_scores)
+                scores += word_scores
+                matched += word_scores > 0
+
+            candidates = np.flatnonzero(matched)
+            if not len(candidates):
+                return []
+            # Projects matching more query words first, then by score
+            rank = matched[candidates] * (scores.max() + 1.0) + scores[candidates]
+            if len(candidates) > limit:
+                top = np.argpartition(-rank, limit - 1)[:limit]
+                candidates, rank = candidates[top], rank[top]
+            best = candidates[np.argsort(-rank, kind="stable")]
+            return [{
+                "name": self._names[i],
+                "area": self._docs[self._names[i]]["area"],
+                "architect": self._docs[self._names[i]]["architect"],
+                "steps": self._docs[self._names[i]]["steps"],
+                "score": round(float(scores[i]), 4),
+                "matched": int(matched[i]),
+            } for i in best]
+
+
+_instances = {}
+_instances_lock = Lock()
+
+
+def get_search_index(manager=None) -> SearchIndex:
+    """Return the search index for ``manager`` (the app's manager by default)."""
+    if manager is None:
+        from core.helpers.project_utils import get_project_manager
+        manager = get_project_manager()
+    key = str(manager.path.resolve())
+    with _instances_lock:  # The editor warms the index on a background thread
+        if key not in _instances:
+            _instances[key] = SearchIndex(manager)
+        return _instances[key]
@@ -0,0 +1,217 @@
+"""core/tabular_export.py
+
+Streaming export of the whole portfolio as flat tables for spreadsheets and
+analytics tools: one project-level table (one row per project) and one
+step-level table (one row per step, with its hierarchy subtotal).
+
+Projects are read with ProjectManager.iter_projects() and written in chunks,
+so memory stays bounded by the chunk size whatever the portfolio size. CSV
+needs nothing beyond the standard library; the compact columnar format is
+Parquet (one row group per chunk), written with pyarrow, which is imported
+only when Parquet is requested.
+
+Command line:
+    python -m core.tabular_export OUTPUT_DIR [--format csv|parquet]
+"""
+
+import argparse
+import csv
+import logging
+import os
+import time
+from pathlib import Path
+
+from core.analytics import project_hours
+from core.helpers.rollup import RollupTree
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "parquet")
+DEFAULT_CHUNK_ROWS = 10_000
+
+PROJECT_COLUMNS = ("project", "area", "architect", "demand", "date", "steps", "total_hours")
+STEP_COLUMNS = ("project", "position", "name", "type", "parent", "hours", "hours_optimistic",
+                "hours_pessimistic", "subtotal", "is_group", "description")
+
+# Parquet column types (pyarrow type names); everything else is a string
+_NUMERIC = {"steps": "int64", "total_hours": "float64", "position": "int64", "hours": "float64",
+            "hours_optimistic": "float64", "hours_pessimistic": "float64", "subtotal": "float64",
+            "is_group": "bool_"}
+
+
+def _number(value):
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def project_row(project: dict) -> tuple:
+    """Return a project's row in PROJECT_COLUMNS order."""
+    return (
+        project.get("name", ""),
+        project.get("area", ""),
+        project.get("architect", ""),
+        project.get("demand", ""),
+        project.get("date", ""),
+        len(project.get("steps") or []),
+        project_hours(project),
+    )
+
+
+def step_rows(project: dict):
+    """Yield one row per step in STEP_COLUMNS order (subtotals from the hierarchy rollup)."""
+    steps = project.get("steps") or []
+    try:
+        tree = RollupTree.from_steps(steps)
+    except (TypeError, ValueError):
+        tree = None  # Non-numeric hours: export the raw values without subtotals
+
+    name = project.get("name", "")
+    for position, step in enumerate(steps, start=1):
+        hours = _number(step.get("hours"))
+        yield (
+            name,
+            position,
+            step.get("name", ""),
+            step.get("type") or "Feature",
+            step.get("parent") or "",
+            hours,
+            _number(step.get("hours_optimistic")),
+            _number(step.get("hours_pessimistic")),
+            tree.subtotal(position - 1) if tree is not None else hours,
+            tree.is_group(position - 1) if tree is not None else False,
+            step.get("description", ""),
+        )
+
+
+class _CsvTable:
+    def __init__(self, path, columns):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows):
+        self._writer.writerows(("" if v is None else v for v in row) for row in rows)
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetTable:
+    def __init__(self, path, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([(c, getattr(pa, _NUMERIC.get(c, "string"))()) for c in columns])
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, rows):
+        arrays = []
+        for values, field in zip(zip(*rows), self._schema):
+            if self._pa.types.is_string(field.type):
+                # Loose JSON values (e.g. a numeric demand) are written as text, as in the CSV
+                values = [None if v is None else str(v) for v in values]
+            arrays.append(self._pa.array(list(values), type=field.type))
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def _open_table(path, columns, fmt):
+    if fmt == "csv":
+        return _CsvTable(path, columns)
+    if fmt == "parquet":
+        try:
+            return _ParquetTable(path, columns)
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow (pip install -r requirements.txt)")
+    raise ValueError(f"Unsupported export format '{fmt}' (expected {', '.join(FORMATS)})")
+
+
+def export_tables(manager, output_dir, fmt: str = "csv", chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+    """Write ``projects.<fmt>`` and ``steps.<fmt>`` for every stored project.
+
+    Args:
+        manager: ProjectManager to read projects from.
+        output_dir: Directory for the two files (created if missing).
+        fmt: "csv" or "parquet".
+        chunk_rows: Rows buffered per table before they are written.
+
+    Returns:
+        Dictionary with "projects_path", "steps_path", the "projects" and
+        "steps" row counts and the elapsed "seconds".
+
+    Raises:
+        ValueError: If the format is unknown.
+        RuntimeError: If Parquet is requested and pyarrow is not installed.
+    """
+    started = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    projects_path = str(output_dir / f"projects.{fmt}")
+    steps_path = str(output_dir / f"steps.{fmt}")
+
+    projects_table = _open_table(projects_path, PROJECT_COLUMNS, fmt)
+    try:
+        steps_table = _open_table(steps_path, STEP_COLUMNS, fmt)
+    except Exception:
+        projects_table.close()
+        raise
+
+    counts = {"projects": 0, "steps": 0}
+    project_buffer, step_buffer = [], []
+    try:
+        for project in manager.iter_projects():
+            project_buffer.append(project_row(project))
+            step_buffer.extend(step_rows(project))
+            if len(project_buffer) >= chunk_rows:
+                projects_table.write(project_buffer)
+                counts["projects"] += len(project_buffer)
+                project_buffer = []
+            if len(step_buffer) >= chunk_rows:
+                steps_table.write(step_buffer)
+                counts["steps"] += len(step_buffer)
+                step_buffer = []
+        if project_buffer:
+            projects_table.write(project_buffer)
+            counts["projects"] += len(project_buffer)
+        if step_buffer:
+            steps_table.write(step_buffer)
+            counts["steps"] += len(step_buffer)
+    finally:
+        projects_table.close()
+        steps_table.close()
+
+    seconds = time.perf_counter() - started
+    logger.info(f"Exported {counts['projects']} project(s) and {counts['steps']} step(s) as {fmt} "
+                f"to {output_dir} in {seconds:.2f}s")
+    return {"projects_path": projects_path, "steps_path": steps_path, **counts, "seconds": seconds}
+
+
+def main(argv=None):
+    from core.helpers.project_utils import get_project_manager
+
+    parser = argparse.ArgumentParser(description="Export every project and step as flat tables")
+    parser.add_argument("output_dir")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    try:
+        result = export_tables(get_project_manager(), args.output_dir, args.format, args.chunk_rows)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Done: {result['projects']} project(s) -> {os.path.abspath(result['projects_path'])}")
+    print(f"      {result['steps']} step(s) -> {os.path.abspath(result['steps_path'])} "
+          f"in {result['seconds']:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
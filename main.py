@@ -4,12 +4,16 @@ Entry point for the Project Estimator Flet application.
 This module sets up the main window and starts the Flet app.
 """
 
+import multiprocessing
+
 import flet as ft
 from dotenv import load_dotenv
+from core import metrics
 from core.helpers.project_utils import get_project_manager
 from ui.main_view import main_view
 
 load_dotenv()
+metrics.configure()  # ESTIMATOR_METRICS may come from the .env file
 
 
 def main(page: ft.Page):
@@ -44,5 +48,7 @@ def main(page: ft.Page):
 
 
 if __name__ == "__main__":
+    # Required for the batch PDF export process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     # Start the Flet application when run as a script
     ft.app(target=main)
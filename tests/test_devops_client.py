@@ -0,0 +1,67 @@
+"""tests/test_devops_client.py
+
+A $batch response must hold one result per request; a short one is an error,
+never a silently incomplete upload.
+"""
+
+import itertools
+
+import pytest
+import requests
+
+from core.helpers.devops_client import DevOpsClient
+
+PROJECT = {
+    "name": "Ledger",
+    "demand": "DEM-1",
+    "steps": [
+        {"name": "Core", "type": "Feature", "hours": 0},
+        {"name": "Import", "type": "User Story", "parent": "Core", "hours": 0},
+        {"name": "Parse", "type": "Task", "parent": "Import", "hours": 4},
+        {"name": "Load", "type": "Task", "parent": "Import", "hours": 2},
+    ],
+}
+
+
+class _Response:
+    def __init__(self, payload: dict):
+        self.status_code = 200
+        self.payload = payload
+        self.text = ""
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+
+class _Scheduler:
+    """Answers every request itself; ``drop`` results are left out of each $batch reply."""
+
+    def __init__(self, drop: int = 0):
+        self.drop = drop
+        self.ids = itertools.count(100)
+
+    def send(self, method, url, json=None, **kwargs):
+        if "$batch" in url:
+            replies = [{"code": 200, "body": {"id": next(self.ids)}} for _ in json]
+            return _Response({"value": replies[:len(replies) - self.drop]})
+        return _Response({"id": next(self.ids)})
+
+
+def _client(drop: int = 0) -> DevOpsClient:
+    return DevOpsClient("org", "proj", "pat", scheduler=_Scheduler(drop))
+
+
+def test_batched_upload_creates_every_item():
+    result = _client().create_structure_batched(PROJECT)
+    assert result["epic"] == 100
+    assert sorted(result["items"]) == ["Core", "Import", "Load", "Parse"]
+
+
+def test_short_batch_response_fails_the_upload():
+    with pytest.raises(requests.HTTPError, match="1 result.*for 2 request"):
+        _client(drop=1).create_work_items_batch([("Task", {}, 1), ("Task", {}, 1)])
+    with pytest.raises(requests.HTTPError):
+        _client(drop=1).create_structure_batched(PROJECT)
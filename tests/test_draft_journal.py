@@ -0,0 +1,133 @@
+"""tests/test_draft_journal.py
+
+The draft journal must replay to the last complete record, keep edits made
+while a compaction runs, never leave a stale file behind when begin() cuts a
+compaction short, and only offer drafts that no running editor holds.
+"""
+
+import threading
+import time
+
+import pytest
+
+from core import draft_journal
+from core.draft_journal import DraftJournal, _begin_record, _edit_records, _line, find_drafts, replay
+from core.helpers.history import EditorState, StepState
+
+
+def _state(name: str, *steps: str) -> EditorState:
+    state = EditorState().with_field("name", name)
+    for step_id, step in enumerate(steps):
+        state = state.with_step(step_id, StepState(name=step, hours="8"))
+    return state
+
+
+def _plain(state: EditorState | None):
+    """Comparable form of a snapshot (StepTrie compares by identity)."""
+    return None if state is None else (state.fields, list(state.steps.items()))
+
+
+def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = DraftJournal(tmp_path, sync_interval=60.0)
+    yield journal
+    journal.close()
+
+
+@pytest.fixture
+def blocked_compaction(monkeypatch):
+    """Hold every compaction after it opened its new file, until the event is set."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_begin_record(state):
+        started.set()
+        release.wait(5.0)
+        return _begin_record(state)
+
+    monkeypatch.setattr(draft_journal, "_begin_record", slow_begin_record)
+    yield started, release
+    release.set()
+
+
+def test_replay_stops_at_a_torn_last_line():
+    first = _state("Ledger", "Build")
+    second = first.with_step(1, StepState(name="Test", hours="4")).with_field("area", "Finance")
+    third = second.without_step(0)
+    lines = [_line(_begin_record(first))]
+    lines += [_line(r) for r in _edit_records(first, second)]
+    torn = [_line(r) for r in _edit_records(second, third)]
+
+    assert _plain(replay(lines)) == _plain(second)
+    assert _plain(replay(lines + torn)) == _plain(third)
+    assert _plain(replay(lines + [torn[0][:-7]])) == _plain(second)
+    assert _plain(replay(lines + [torn[0][:-7]] + torn)) == _plain(second)  # Nothing after a torn line is trusted
+    assert replay([_line(r) for r in _edit_records(first, second)]) is None  # No snapshot to start from
+
+
+def test_journal_replays_to_the_current_state(journal):
+    state = _state("Ledger", "Build")
+    journal.begin(state)
+    assert journal.path is None  # Nothing unsaved yet
+
+    for hours in ("1", "12", "16"):
+        state = state.with_step(0, StepState(name="Build", hours=hours))
+        journal.update(state)
+        _wait_for(lambda: journal.path is not None)
+    state = state.with_field("area", "Finance").without_step(0)
+    journal.update(state)
+
+    assert _plain(replay(journal.path.read_bytes().splitlines(keepends=True))) == _plain(state)
+
+
+def test_edits_made_during_a_compaction_are_kept(journal, blocked_compaction):
+    started, release = blocked_compaction
+    state = _state("Ledger", "Build")
+    journal.begin(state)
+    state = state.with_field("area", "Finance")
+    journal.update(state)  # First edit: the snapshot is written in the background
+    assert started.wait(5.0)
+
+    for step_id in range(1, 4):
+        state = state.with_step(step_id, StepState(name=f"Step {step_id}"))
+        journal.update(state)
+    release.set()
+    _wait_for(lambda: journal.path is not None)
+
+    assert _plain(replay(journal.path.read_bytes().splitlines(keepends=True))) == _plain(state)
+
+
+def test_begin_during_a_compaction_leaves_no_stale_file(tmp_path, journal, blocked_compaction):
+    started, release = blocked_compaction
+    journal.begin(_state("Ledger", "Build"))
+    journal.update(_state("Ledger", "Build", "Test"))
+    assert started.wait(5.0)
+    assert len(list(tmp_path.glob("*.draft.jsonl"))) == 1  # The compaction's new file
+
+    journal.begin(_state("Saved"))  # e.g. the project was saved meanwhile
+    release.set()
+    _wait_for(lambda: not list(tmp_path.glob("*.draft.jsonl")))
+    assert journal.path is None
+    assert find_drafts(tmp_path) == []
+
+
+def test_find_drafts_skips_open_journals_and_restores_closed_ones(tmp_path, journal):
+    state = _state("Ledger", "Build")
+    journal.begin(state)
+    state = state.with_field("purpose", "Close the books")
+    journal.update(state)
+    _wait_for(lambda: journal.path is not None)
+
+    assert find_drafts(tmp_path) == []  # Another editor still owns it
+    journal.close()
+
+    (draft,) = find_drafts(tmp_path)
+    assert draft["path"] == journal.path
+    assert (draft["name"], draft["steps"], _plain(draft["state"])) == ("Ledger", 1, _plain(state))
@@ -0,0 +1,120 @@
+"""tests/test_history.py
+
+StepTrie must behave like a dict under any sequence of edits, diff() must
+report exactly the keys two versions disagree on, and History must undo and
+redo coalesced entries as one.
+"""
+
+import random
+
+import pytest
+
+from core.helpers.history import EditorState, History, StepState, StepTrie
+
+
+def _dict_diff(old: dict, new: dict) -> list:
+    return [(k, old.get(k), new.get(k)) for k in sorted(old.keys() | new.keys()) if old.get(k) != new.get(k)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits_match_a_dict(seed):
+    rng = random.Random(seed)
+    trie, expected = StepTrie(), {}
+    versions = [(trie, dict(expected))]
+    for _ in range(3000):
+        # Mostly small ids, with some large enough to grow the trie by several levels
+        key = rng.randrange(40) if rng.random() < 0.7 else rng.randrange(1 << rng.choice((10, 15, 20)))
+        if rng.random() < 0.35:
+            trie = trie.delete(key)
+            expected.pop(key, None)
+        else:
+            value = StepState(name=f"step {rng.randrange(5)}")
+            trie = trie.set(key, value)
+            expected[key] = value
+        if rng.random() < 0.05:
+            versions.append((trie, dict(expected)))
+    versions.append((trie, dict(expected)))
+
+    for version, snapshot in versions:  # Older versions are unchanged by later edits
+        assert len(version) == len(snapshot)
+        assert list(version.items()) == sorted(snapshot.items())
+        assert list(version) == [v for _, v in sorted(snapshot.items())]
+        for key in list(snapshot)[:50] + [rng.randrange(1 << 20) for _ in range(50)]:
+            assert version.get(key) == snapshot.get(key)
+
+    for _ in range(50):
+        (a, old), (b, new) = rng.choice(versions), rng.choice(versions)
+        assert a.diff(b) == _dict_diff(old, new)
+
+
+def test_deleting_every_key_empties_the_trie():
+    keys = list(range(0, 5000, 7))
+    trie = StepTrie.from_items((k, StepState(name=str(k))) for k in keys)
+    for key in keys:
+        trie = trie.delete(key)
+    assert len(trie) == 0 and list(trie.items()) == []
+    assert trie.diff(StepTrie()) == []
+
+
+def test_unchanged_updates_share_the_trie():
+    trie = StepTrie.from_items([(3, StepState(name="a")), (40, StepState(name="b"))])
+    assert trie.set(3, trie.get(3)) is trie
+    assert trie.delete(99) is trie
+    assert trie.diff(trie.set(40, StepState(name="c"))) == [(40, StepState(name="b"), StepState(name="c"))]
+    with pytest.raises(ValueError):
+        trie.set(1, None)
+    with pytest.raises(KeyError):
+        trie.set(-1, StepState())
+
+
+def _typed(history: History, step_id: int, text: str):
+    """Commit one keystroke per character of ``text`` into the name of ``step_id``."""
+    for end in range(1, len(text) + 1):
+        history.commit(history.current.with_step(step_id, StepState(name=text[:end])), key=(step_id, "name"))
+
+
+def test_coalesced_edits_undo_and_redo_as_one_entry():
+    changes = []
+    history = History(on_change=changes.append)
+    start = history.current
+
+    _typed(history, 1, "Build")
+    assert len(history) == 1
+    history.seal()
+    _typed(history, 1, "Build API")  # Same key, but sealed: a new entry
+    history.commit(history.current.with_field("name", "Project"), key="name")
+    assert len(history) == 3
+    typed, named = history.current.steps.get(1).name, history.current.field("name")
+    assert (typed, named) == ("Build API", "Project")
+
+    assert history.undo().field("name") == ""
+    assert history.undo().steps.get(1).name == "Build"
+    assert history.undo() is start
+    assert history.undo() is None and not history.can_undo
+
+    assert history.redo().steps.get(1).name == "Build"
+    # An undo closes the open entry: typing again starts a new one and drops the redo stack
+    _typed(history, 1, "Deploy")
+    assert not history.can_redo
+    assert len(history) == 2
+    assert history.undo().steps.get(1).name == "Build"
+    assert history.redo().steps.get(1).name == "Deploy"
+    assert history.redo() is None
+    assert changes[-1] is history.current
+
+
+def test_limit_drops_the_oldest_entries():
+    history = History(limit=3)
+    for i in range(5):
+        history.commit(history.current.with_field("name", str(i)))
+    assert len(history) == 3
+    while history.undo() is not None:
+        pass
+    assert history.current.field("name") == "1"
+
+
+def test_commit_of_the_current_state_is_ignored():
+    history = History(EditorState())
+    history.commit(history.current.with_step(0, StepState()))
+    history.commit(history.current.with_step(0, StepState()))  # Equal step: same state
+    assert len(history) == 1
@@ -0,0 +1,77 @@
+"""tests/test_models.py
+
+Files that fail the fast validation path are cleaned and validated row by
+row: loose values load, and every row left out is reported and logged with
+the fields that failed.
+"""
+
+import json
+import logging
+
+from core.models import parse_projects, parse_templates
+
+
+def _project(name: str, **fields) -> dict:
+    return {"name": name, "architect": "Ana", "area": "Finance",
+            "steps": [{"name": "Build", "hours": 8, "type": "Feature"}], **fields}
+
+
+def test_clean_file_validates_in_one_pass():
+    errors = []
+    projects = parse_projects(json.dumps([_project("A")]), errors)
+    assert errors == []
+    assert projects[0]["steps"][0]["hours"] == 8.0
+
+
+def test_loose_values_are_cleaned():
+    loose = _project("A", purpose=None, total="12,5", steps=[
+        {"name": "Build", "hours": "1,5", "hours_pessimistic": "", "type": ""},
+        {"name": None, "hours": None, "type": "Task"},
+    ])
+    errors = []
+    (project,) = parse_projects(json.dumps([loose]), errors)
+
+    assert errors == []
+    assert project["purpose"] == "" and project["total"] == 12.5
+    assert project["steps"][0] == {"name": "Build", "hours": 1.5, "hours_pessimistic": None, "type": "Feature"}
+    assert project["steps"][1] == {"name": "", "hours": 0.0, "type": "Task"}
+
+
+def test_null_steps_load_as_an_empty_list():
+    errors = []
+    projects = parse_projects(json.dumps([_project("A", steps=None), _project("B")]), errors)
+    assert [p["name"] for p in projects] == ["A", "B"]
+    assert projects[0]["steps"] == []
+    assert errors == []
+
+
+def test_bad_step_is_left_out_and_logged(caplog):
+    bad = _project("A", steps=[{"name": "Ok", "hours": 2}, {"name": "Bad", "hours": "abc", "hours_optimistic": "x"}])
+    errors = []
+    with caplog.at_level(logging.WARNING, logger="core.models"):
+        project, other = parse_projects(json.dumps([bad, _project("B")]), errors)
+
+    assert [s["name"] for s in project["steps"]] == ["Ok"]
+    assert other["name"] == "B"
+    assert [(e["index"], e["name"], e["step"]) for e in errors] == [(0, "A", 1)]
+    assert "hours:" in errors[0]["error"] and "hours_optimistic:" in errors[0]["error"]
+    assert "Skipped step 1 of item 0 ('A')" in caplog.text
+
+
+def test_bad_project_is_left_out_with_every_failing_field(caplog):
+    errors = [{"earlier": True}]  # Entries already in the list are neither changed nor logged again
+    with caplog.at_level(logging.WARNING, logger="core.models"):
+        projects = parse_projects(json.dumps([_project("A", total="abc", steps="none"), _project("B"), 7]), errors)
+
+    assert [p["name"] for p in projects] == ["B"]
+    assert errors[0] == {"earlier": True}
+    assert [(e["index"], e["name"], e["step"]) for e in errors[1:]] == [(0, "A", None), (2, None, None)]
+    assert "steps:" in errors[1]["error"] and "total:" in errors[1]["error"]
+    assert caplog.text.count("Skipped") == 2
+
+
+def test_templates_fall_back_to_the_template_model():
+    errors = []
+    templates = parse_templates(json.dumps([{"name": "T", "hours": "2,5"}, {"name": "U", "hours": "abc"}]), errors)
+    assert templates == [{"name": "T", "hours": 2.5}]
+    assert [(e["index"], e["name"], e["step"]) for e in errors] == [(1, "U", None)]
@@ -0,0 +1,58 @@
+"""tests/test_pdf_generator.py
+
+PdfRenderer reuses the logo decoded at construction in every document; a logo
+with an embedded ICC profile must still render. The confidence range is only
+sampled for projects with ranges, with the report's smaller trial count.
+"""
+
+import io
+
+import pytest
+from PIL import Image, ImageCms
+
+from core import estimation
+from core.pdf_generator import REPORT_TRIALS, PdfRenderer
+
+PROJECT = {
+    "name": "ICC logo",
+    "architect": "A",
+    "area": "B",
+    "demand": "DEM-1",
+    "purpose": "Render twice with one renderer",
+    "steps": [{"name": "Build", "description": "", "hours": 8.0, "type": "Feature"}],
+}
+
+
+@pytest.fixture
+def icc_logo(tmp_path):
+    profile = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    path = tmp_path / "logo_icc.png"
+    Image.new("RGB", (40, 20), (200, 30, 30)).save(path, icc_profile=profile)
+    return str(path)
+
+
+def test_logo_with_icc_profile_renders_in_every_document(icc_logo):
+    renderer = PdfRenderer(logo_path=icc_logo)
+    assert renderer._logo_info.get("iccp_i") is not None
+
+    for _ in range(2):  # The second document must not inherit the first one's state
+        stream = io.BytesIO()
+        renderer.render(PROJECT).output(stream)
+        data = stream.getvalue()
+        assert data.startswith(b"%PDF")
+        assert b"/ICCBased" in data
+
+
+def test_confidence_range_is_sampled_only_when_steps_have_ranges(monkeypatch):
+    trials = []
+    simulate_totals = estimation.simulate_totals
+    monkeypatch.setattr(estimation, "simulate_totals",
+                        lambda ranges, n, seed: trials.append(n) or simulate_totals(ranges, n, seed))
+    renderer = PdfRenderer(logo_path=None)
+
+    renderer.render(PROJECT)
+    assert trials == []
+
+    ranged = dict(PROJECT, steps=[dict(PROJECT["steps"][0], hours_optimistic=4.0, hours_pessimistic=20.0)])
+    renderer.render(ranged)
+    assert trials == [REPORT_TRIALS]
@@ -0,0 +1,60 @@
+"""tests/test_pdf_stream.py
+
+PdfStreamWriter renumbers the objects of every added document; the combined
+file must parse, keep every page in order, and leave "N 0 R" inside literal
+strings alone.
+"""
+
+import io
+
+import pytest
+from fpdf import FPDF
+
+from core.helpers.pdf_stream import PdfStreamWriter
+
+pypdf = pytest.importorskip("pypdf")
+
+URI = "https://example.com/ref/5 0 R/(nested (parens))"
+
+
+def _document(label: str, pages: int) -> bytes:
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=12)
+    for page in range(pages):
+        pdf.add_page()
+        pdf.cell(text=f"{label} page {page + 1}: see 3 0 R", link=URI)
+    return bytes(pdf.output())
+
+
+def _combine(*documents: bytes) -> pypdf.PdfReader:
+    stream = io.BytesIO()
+    writer = PdfStreamWriter(stream)
+    for data in documents:
+        writer.add(data)
+    writer.close()
+    assert writer.page_count == len(pypdf.PdfReader(stream).pages)
+    return pypdf.PdfReader(io.BytesIO(stream.getvalue()), strict=True)
+
+
+def test_documents_are_concatenated_in_order():
+    reader = _combine(_document("A", 2), _document("B", 1), _document("C", 3))
+
+    texts = [page.extract_text() for page in reader.pages]
+    assert len(texts) == 6
+    assert [text.split(":")[0] for text in texts] == [
+        "A page 1", "A page 2", "B page 1", "C page 1", "C page 2", "C page 3"]
+    assert reader.trailer["/Root"]["/Pages"]["/Count"] == 6
+
+
+def test_references_inside_literal_strings_are_not_renumbered():
+    reader = _combine(_document("A", 1), _document("B", 2))
+
+    for page in reader.pages:
+        assert page.extract_text().endswith("see 3 0 R")
+        (annotation,) = page["/Annots"]
+        assert annotation.get_object()["/A"]["/URI"] == URI
+
+
+def test_close_without_documents_fails():
+    with pytest.raises(ValueError):
+        PdfStreamWriter(io.BytesIO()).close()
@@ -0,0 +1,50 @@
+"""tests/test_request_scheduler.py
+
+Throttled requests are retried, except a 503 to a non-idempotent request:
+the service may have created the work item before failing.
+"""
+
+import pytest
+
+from core.helpers.request_scheduler import RequestScheduler
+
+
+class _Response:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.headers = {"Retry-After": "0"}
+
+
+class _Session:
+    def __init__(self, *status_codes: int):
+        self.status_codes = list(status_codes)
+        self.methods = []
+
+    def request(self, method, url, **kwargs):
+        self.methods.append(method)
+        return _Response(self.status_codes.pop(0))
+
+
+@pytest.mark.parametrize("method, first, status, attempts", [
+    ("GET", 503, 200, 2),
+    ("PATCH", 429, 200, 2),
+    ("POST", 429, 200, 2),
+    ("PATCH", 503, 503, 1),
+    ("POST", 503, 503, 1),
+])
+def test_retries(method, first, status, attempts):
+    session = _Session(first, 200)
+    scheduler = RequestScheduler(session=session)
+
+    assert scheduler.send(method, "https://dev.azure.com/x").status_code == status
+    assert len(session.methods) == attempts
+    assert scheduler.metrics()["throttled_responses"] == 1
+
+
+def test_gives_up_after_max_retries():
+    session = _Session(*[429] * 4)
+    scheduler = RequestScheduler(max_retries=3, session=session)
+
+    assert scheduler.send("PATCH", "https://dev.azure.com/x").status_code == 429
+    assert len(session.methods) == 4
+    assert scheduler.metrics()["retries"] == 3
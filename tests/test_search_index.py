@@ -0,0 +1,43 @@
+"""tests/test_search_index.py
+
+The search index follows saves made through its manager in the background and
+picks up saves made elsewhere (another machine on the share) before a query.
+"""
+
+import pytest
+
+from core.helpers import derived_store
+from core.project_manager import ProjectManager
+from core.search_index import SearchIndex
+
+
+def _project(name: str, purpose: str) -> dict:
+    return {"name": name, "area": "Finance", "architect": "Ana", "purpose": purpose,
+            "steps": [{"name": "Build", "description": "connector", "hours": 8.0, "type": "Feature"}]}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ProjectManager(tmp_path / "projects.json")
+    manager.save_projects([_project("Ledger", "invoice matching")])
+    return manager
+
+
+def test_saves_through_the_manager_are_indexed(manager):
+    index = SearchIndex(manager)
+    manager.save_projects([_project("Ledger", "invoice matching"), _project("Payroll", "salary run")])
+    assert index.flush(5.0)
+
+    assert [hit["name"] for hit in index.search("salary")] == ["Payroll"]
+    assert SearchIndex(manager, index.path).search("salar")[0]["name"] == "Payroll"  # Reloaded from file and log
+
+
+def test_saves_made_elsewhere_are_found_before_the_next_query(manager, monkeypatch):
+    monkeypatch.setattr(derived_store, "STALE_CHECK_INTERVAL", 0.0)
+    index = SearchIndex(manager)
+    assert index.search("payroll") == []
+
+    other_machine = ProjectManager(manager.path)
+    other_machine.save_projects([_project("Ledger", "invoice matching"), _project("Payroll", "salary run")])
+
+    assert [hit["name"] for hit in index.search("payroll")] == ["Payroll"]
@@ -0,0 +1,45 @@
+"""tests/test_tabular_export.py
+
+CSV and Parquet exports must accept the same loose JSON values, e.g. a
+numeric demand or area in a hand-edited projects file.
+"""
+
+import csv
+
+import pytest
+
+from core.project_manager import ProjectManager
+from core.tabular_export import export_tables
+
+PROJECTS = [
+    {"name": "Ledger", "area": 42, "architect": "Ana", "demand": 1234, "date": "2026-01-05",
+     "steps": [{"name": "Core", "type": "Feature", "hours": "8"},
+               {"name": 7, "type": "User Story", "parent": "Core", "hours": 2.5, "description": None}]},
+    {"name": "Payroll", "architect": None, "steps": []},
+]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ProjectManager(tmp_path / "projects.json")
+    manager.save_projects(PROJECTS)
+    return manager
+
+
+def test_csv_export(manager, tmp_path):
+    result = export_tables(manager, tmp_path / "out", "csv")
+    with open(result["projects_path"], encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert (rows[0]["area"], rows[0]["demand"], rows[0]["total_hours"]) == ("42", "1234", "2.5")
+    assert (result["projects"], result["steps"]) == (2, 2)
+
+
+def test_parquet_export_writes_loose_values_as_text(manager, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    result = export_tables(manager, tmp_path / "out", "parquet")
+
+    projects = pq.read_table(result["projects_path"]).to_pylist()
+    assert (projects[0]["area"], projects[0]["demand"], projects[0]["total_hours"]) == ("42", "1234", 2.5)
+    assert projects[1]["architect"] is None
+    steps = pq.read_table(result["steps_path"]).to_pylist()
+    assert [(s["name"], s["subtotal"], s["is_group"]) for s in steps] == [("Core", 2.5, True), ("7", 2.5, False)]
@@ -5,7 +5,9 @@ This module defines the main_view function which composes the UI and connects
 it to the ProjectManager for loading/saving projects and templates.
 """
 import os
+from bisect import bisect_left
 from datetime import datetime
+from itertools import count
 import flet as ft
 from dotenv import load_dotenv
 from core.project_manager import ProjectManager
@@ -13,6 +15,14 @@ from core.helpers.dialog_utils import auto_close_dialog
 from core.helpers.template_utils import load_templates, save_templates
 from core.helpers.devops_client import DevOpsClient
 from core.helpers.ui_utils import show_snackbar
+from core.helpers.rollup import RollupTree
+from core.helpers.history import PROJECT_FIELDS, EditorState, History, StepState, StepTrie
+from core.draft_journal import DraftJournal, discard_draft, find_drafts
+from core.estimation import PERCENTILES, estimate_project
+from core.analytics import get_analytics
+from core.search_index import get_search_index
+from core.metrics import timed
+from core.profiling import profiled
 
 # Load environment variables from .env file
 load_dotenv()
@@ -97,6 +107,7 @@ def main_view(page: ft.Page, manager: ProjectManager):
     demand = ft.TextField(label="Demand Number", expand=True, color=ft.Colors.BLACK)
     purpose = ft.TextField(label="Purpose", multiline=True, min_lines=2, expand=True, color=ft.Colors.BLACK)
 
+    @profiled("on_select_project")
     def on_select_project(e):
         sel = existing_projects_dropdown.value
         if not sel or sel == "Create New Project":
@@ -107,6 +118,11 @@ def main_view(page: ft.Page, manager: ProjectManager):
             purpose.value = ""
             steps.clear()
             steps_column.controls.clear()
+            rollup.clear()
+            steps_by_id.clear()
+            history.reset(editor_snapshot())
+            refresh_history_buttons()
+            journal.begin(history.current)
             update_total_hours()
             page.update()
             return
@@ -120,20 +136,91 @@ def main_view(page: ft.Page, manager: ProjectManager):
                 purpose.value = p.get("purpose", "")
                 steps.clear()
                 steps_column.controls.clear()
+                rollup.clear()
+                steps_by_id.clear()
                 for s in p.get("steps", []):
                     # Ensure we pass strings for textfields; hours may be float or str
-                    add_step(s.get("name", ""), s.get("description", ""), str(s.get("hours", "")))
+                    # Bulk load: parent options are built when a dropdown is opened
+                    add_step(s.get("name", ""), s.get("description", ""), str(s.get("hours", "")),
+                             s.get("type") or "Feature", s.get("parent"),
+                             s.get("hours_optimistic"), s.get("hours_pessimistic"), refresh=False)
+                history.reset(editor_snapshot())
+                refresh_history_buttons()
+                journal.begin(history.current)
                 update_total_hours()
                 page.update()
                 break
 
     existing_projects_dropdown.on_change = on_select_project
 
+    # ---------- Project search ----------
+    project_search = ft.TextField(
+        hint_text="Search all projects, steps and descriptions...",
+        prefix_icon=ft.Icons.SEARCH,
+        color=ft.Colors.BLACK,
+    )
+    search_results = ft.Column(spacing=2)
+
+    def open_search_result(name):
+        existing_projects_dropdown.value = name
+        project_search.value = ""
+        search_results.controls.clear()
+        on_select_project(None)
+
+    @profiled("project_search")
+    def on_project_search(e):
+        """Show the best matching projects below the search box."""
+        search_results.controls.clear()
+        query = (project_search.value or "").strip()
+        if query:
+            for hit in get_search_index(manager).search(query, limit=8):
+                details = " · ".join(x for x in (hit["area"], hit["architect"], f"{hit['steps']} steps") if x)
+                search_results.controls.append(ft.ListTile(
+                    leading=ft.Icon(ft.Icons.FOLDER_OPEN, color=ft.Colors.BLUE_600),
+                    title=ft.Text(hit["name"], color=ft.Colors.BLACK),
+                    subtitle=ft.Text(details, size=12, color=ft.Colors.GREY_700),
+                    dense=True,
+                    on_click=lambda e, name=hit["name"]: open_search_result(name),
+                ))
+            if not search_results.controls:
+                search_results.controls.append(ft.Text("No matching projects", italic=True, color=ft.Colors.GREY_600))
+        page.update()
+
+    project_search.on_change = on_project_search
+    project_search.on_submit = on_project_search
+    # Load (or build) the index off the UI thread so the first keystroke does not wait for it
+    page.run_thread(get_search_index, manager)
+
     # ---------- Steps ----------
     steps_column = ft.Column(spacing=8)
     total_hours_text = ft.Text("0.0 h", size=18, weight=ft.FontWeight.BOLD, color=ft.Colors.BLACK)
+    step_ids = count(1)
+    steps_by_id = {}
+
+    def on_subtotal_change(step_id, subtotal):
+        """Show the rolled-up hours next to Features / User Stories that have children."""
+        s = steps_by_id.get(step_id)
+        if s is not None:
+            s["subtotal"].value = f"= {subtotal:.1f} h"
+            s["subtotal"].visible = rollup.is_group(step_id)
+
+    # Subtotals per Feature / User Story; an edit only updates the edited step's ancestors
+    rollup = RollupTree(on_change=on_subtotal_change)
+
+    def parse_hours(value):
+        try:
+            return float(value or 0)
+        except (TypeError, ValueError):
+            return 0.0
 
-    def auto_save_step_as_template(name, description, hours):
+    def optional_hours(value):
+        """Return a float for an optional hours field, or None when empty/invalid."""
+        try:
+            return float(value) if (value or "").strip() else None
+        except ValueError:
+            return None
+
+    def auto_save_step_as_template(name, description, hours, hours_optimistic="", hours_pessimistic=""):
         """Automatically save a step as a template when the user leaves a field.
 
         If a template with the same name exists, it updates the existing one.
@@ -142,7 +229,9 @@ def main_view(page: ft.Page, manager: ProjectManager):
         Args:
             name: Template/step name
             description: Optional description
-            hours: Estimated hours as string
+            hours: Estimated (most likely) hours as string
+            hours_optimistic: Optional optimistic hours as string
+            hours_pessimistic: Optional pessimistic hours as string
         """
         name = (name or "").strip()
         if not name:
@@ -150,11 +239,15 @@ def main_view(page: ft.Page, manager: ProjectManager):
 
         description = (description or "").strip()
         hours = (hours or "0").strip() or "0"
+        hours_optimistic = (hours_optimistic or "").strip()
+        hours_pessimistic = (hours_pessimistic or "").strip()
 
         for tpl in templates:
             if tpl["name"].lower() == name.lower():
                 tpl["description"] = description
                 tpl["hours"] = hours
+                tpl["hours_optimistic"] = hours_optimistic
+                tpl["hours_pessimistic"] = hours_pessimistic
                 save_templates(templates)
                 refresh_templates()
                 return
@@ -162,34 +255,153 @@ def main_view(page: ft.Page, manager: ProjectManager):
         templates.append({
             "name": name,
             "description": description,
-            "hours": hours
+            "hours": hours,
+            "hours_optimistic": hours_optimistic,
+            "hours_pessimistic": hours_pessimistic
         })
 
         save_templates(templates)
         refresh_templates()
 
+    @timed("ui.update_total_hours")
     def update_total_hours():
-        """Recalculate the total hours from the steps and update the UI."""
-        total = 0.0
-        for s in steps:
-            try:
-                # s["hours"] is a TextField
-                h = float(s["hours"].value or 0)
-            except Exception:
-                h = 0.0
-            total += h
-        total_hours_text.value = f"{total:.1f} h"
+        """Show the project total (sum of the top-level rollups) in the UI."""
+        total_hours_text.value = f"{rollup.total:.1f} h"
+        confidence_text.value = ""  # Any previous simulation is now out of date
+        page.update()
+
+    confidence_text = ft.Text("", size=13, color=ft.Colors.GREY_700)
+
+    def on_simulate(e):
+        """Run the PERT Monte Carlo simulation in the background and show P50/P80/P95."""
+        try:
+            data = collect_project_data()
+        except ValueError:
+            show_snackbar(page, "⚠ Some steps have invalid hours.", ft.Colors.ORANGE, 3000)
+            return
+        confidence_text.value = "Simulating..."
         page.update()
 
-    def add_step(name="", description="", hours="", step_type="Feature", parent=None):
+        def run():
+            result = estimate_project(data)
+            if result["has_ranges"]:
+                confidence_text.value = "  ·  ".join(f"P{p} {result[f'p{p}']:.1f} h" for p in PERCENTILES)
+            else:
+                confidence_text.value = "Add Min/Max hours to steps to see a confidence range"
+            print(f"🎲 Simulation ({result['trials']:,} trials): {confidence_text.value}")
+            page.update()
+
+        page.run_thread(run)
+
+    # ---------- Undo / redo ----------
+    # Persistent snapshots: each edit shares every unchanged step with the previous state.
+    # Every change is also appended to the local draft journal for crash recovery.
+    journal = DraftJournal()
+    history = History(on_change=journal.update)
+    project_fields = dict(zip(PROJECT_FIELDS, (project_name, architect, area, demand, purpose)))
+
+    def step_state(s):
+        return StepState(s["name"].value or "", s["description"].value or "", s["hours"].value or "",
+                         s["hours_optimistic"].value or "", s["hours_pessimistic"].value or "",
+                         s["type"].value or "Feature", s["parent"].value)
+
+    def editor_snapshot():
+        return EditorState(tuple(f.value or "" for f in project_fields.values()),
+                           StepTrie.from_items((s["id"], step_state(s)) for s in steps))
+
+    def refresh_history_buttons():
+        """Enable / disable the undo and redo buttons; returns True when one changed."""
+        changed = undo_btn.disabled != (not history.can_undo) or redo_btn.disabled != (not history.can_redo)
+        undo_btn.disabled = not history.can_undo
+        redo_btn.disabled = not history.can_redo
+        return changed
+
+    def record_step(step_id, key=None):
+        """Record the current values of a step (or its removal).
+
+        Edits with the same key (one field of one step) are merged into one
+        undo entry until the field loses focus.
+        """
+        s = steps_by_id.get(step_id)
+        state = history.current.with_step(step_id, step_state(s)) if s else history.current.without_step(step_id)
+        history.commit(state, key)
+        refresh_history_buttons()
+
+    def record_field(name):
+        history.commit(history.current.with_field(name, project_fields[name].value or ""), ("project", name))
+        if refresh_history_buttons():
+            page.update()
+
+    for field_name, field in project_fields.items():
+        field.on_change = lambda e, name=field_name: record_field(name)
+        field.on_blur = lambda e: history.seal()
+
+    def set_step_values(step_id, values):
+        s = steps_by_id[step_id]
+        for key in ("name", "description", "hours", "hours_optimistic", "hours_pessimistic", "type"):
+            s[key].value = getattr(values, key)
+        s["parent"].options = [ft.dropdown.Option(values.parent)] if values.parent else []
+        s["parent"].value = values.parent
+        rollup.set_name(step_id, values.name)
+        rollup.set_type(step_id, values.type)
+        rollup.set_parent(step_id, values.parent)
+        rollup.set_hours(step_id, parse_hours(values.hours))
+
+    def apply_state(before, state):
+        """Bring the controls from snapshot ``before`` to ``state``, touching only what differs."""
+        for name, value in zip(PROJECT_FIELDS, state.fields):
+            project_fields[name].value = value
+        for step_id, old, new in before.steps.diff(state.steps):
+            if new is None:
+                steps_by_id[step_id]["detach"]()
+            elif old is None:
+                add_step(new.name, new.description, new.hours, new.type, new.parent,
+                         new.hours_optimistic, new.hours_pessimistic, refresh=False, step_id=step_id)
+            else:
+                set_step_values(step_id, new)
+        refresh_history_buttons()
+        update_total_hours()
+
+    def on_undo(e):
+        before = history.current
+        state = history.undo()
+        if state is not None:
+            apply_state(before, state)
+
+    def on_redo(e):
+        before = history.current
+        state = history.redo()
+        if state is not None:
+            apply_state(before, state)
+
+    def on_keyboard(e: ft.KeyboardEvent):
+        if not (e.ctrl or e.meta):
+            return
+        if e.key == "Z":
+            (on_redo if e.shift else on_undo)(e)
+        elif e.key == "Y":
+            on_redo(e)
+
+    page.on_keyboard_event = on_keyboard
+
+    undo_btn = ft.IconButton(icon=ft.Icons.UNDO, icon_color=ft.Colors.BLUE_600, icon_size=22, tooltip="Undo (Ctrl+Z)", on_click=on_undo, disabled=True)
+    redo_btn = ft.IconButton(icon=ft.Icons.REDO, icon_color=ft.Colors.BLUE_600, icon_size=22, tooltip="Redo (Ctrl+Y)", on_click=on_redo, disabled=True)
+
+    def add_step(name="", description="", hours="", step_type="Feature", parent=None,
+                 hours_optimistic="", hours_pessimistic="", refresh=True, step_id=None):
         """Add a new step (task/feature/user story) to the project.
 
         Each step can have:
         - name: The task/feature name
         - description: Optional detailed description of the step
-        - hours: Estimated hours for completion
+        - hours: Estimated (most likely) hours for completion
+        - hours_optimistic / hours_pessimistic: Optional range used for the
+          P50/P80/P95 confidence simulation
+        - refresh: Pass False for bulk loads; the caller updates the page once
+          and parent options are built when the dropdown is opened
         - step_type: Type of work item (Feature, User Story, Task)
         - parent: Parent task reference for hierarchical organization
+        - step_id: Only for undo / redo, which puts a removed step back with its old id
 
         Steps are auto-saved as templates when the user leaves a field.
         Users can optionally add or edit the description by clicking the description button.
@@ -221,16 +433,39 @@ def main_view(page: ft.Page, manager: ProjectManager):
             border_color=ft.Colors.GREY_400
         )
 
+        optimistic_field = ft.TextField(
+            value="" if hours_optimistic is None else str(hours_optimistic),
+            hint_text="Min",
+            tooltip="Optimistic hours (optional)",
+            width=70,
+            color=ft.Colors.BLACK,
+            border_color=ft.Colors.GREY_300
+        )
+
+        pessimistic_field = ft.TextField(
+            value="" if hours_pessimistic is None else str(hours_pessimistic),
+            hint_text="Max",
+            tooltip="Pessimistic hours (optional)",
+            width=70,
+            color=ft.Colors.BLACK,
+            border_color=ft.Colors.GREY_300
+        )
+
         def on_step_blur(e):
+            history.seal()
             auto_save_step_as_template(
                 name_field.value,
                 description_field.value,
-                hours_field.value
+                hours_field.value,
+                optimistic_field.value,
+                pessimistic_field.value
             )
 
         name_field.on_blur = on_step_blur
         description_field.on_blur = on_step_blur
         hours_field.on_blur = on_step_blur
+        optimistic_field.on_blur = on_step_blur
+        pessimistic_field.on_blur = on_step_blur
 
         # Note: Epic type was removed from the UI
         type_dropdown = ft.Dropdown(
@@ -245,20 +480,29 @@ def main_view(page: ft.Page, manager: ProjectManager):
 
         parent_dropdown = ft.Dropdown(
             width=200,
-            hint_text="Parent"
+            hint_text="Parent",
+            value=parent
         )
 
+        subtotal_text = ft.Text("", size=12, color=ft.Colors.GREY_600, visible=False, tooltip="Sum of child items")
+
         step = {
             "name": name_field,
             "description": description_field,
             "hours": hours_field,
+            "hours_optimistic": optimistic_field,
+            "hours_pessimistic": pessimistic_field,
             "type": type_dropdown,
             "parent": parent_dropdown,
-            "id": None
+            "subtotal": subtotal_text,
+            "id": step_id if step_id is not None else next(step_ids)
         }
+        steps_by_id[step["id"]] = step
+        rollup.add(step["id"], name, step_type, parent, parse_hours(hours))
 
         def refresh_parent_options():
             options = []
+            current = parent_dropdown.value
 
             for s in steps:
                 if s is step:
@@ -273,16 +517,43 @@ def main_view(page: ft.Page, manager: ProjectManager):
                     options.append(ft.dropdown.Option(s["name"].value))
 
             parent_dropdown.options = options
-            parent_dropdown.value = None
-
-        type_dropdown.on_change = lambda e: (refresh_parent_options(), page.update())
+            # Keep the selected parent while it is still a valid option
+            parent_dropdown.value = current if any(o.key == current for o in options) else None
+            rollup.set_parent(step["id"], parent_dropdown.value)
+
+        def on_type_change(e):
+            rollup.set_type(step["id"], type_dropdown.value)
+            refresh_parent_options()
+            record_step(step["id"])
+            update_total_hours()
 
-        def remove_step(e):
+        step["refresh_parents"] = refresh_parent_options
+        type_dropdown.on_change = on_type_change
+        parent_dropdown.on_change = lambda e: (rollup.set_parent(step["id"], parent_dropdown.value),
+                                               record_step(step["id"]), update_total_hours())
+        name_field.on_change = lambda e: (rollup.set_name(step["id"], name_field.value),
+                                          record_step(step["id"], (step["id"], "name")), update_total_hours())
+        description_field.on_change = lambda e: record_step(step["id"], (step["id"], "description"))
+        optimistic_field.on_change = lambda e: record_step(step["id"], (step["id"], "hours_optimistic"))
+        pessimistic_field.on_change = lambda e: record_step(step["id"], (step["id"], "hours_pessimistic"))
+        # Steps added after this one become selectable parents when the dropdown opens
+        # (an invalid parent is cleared there, which is recorded like any edit)
+        parent_dropdown.on_focus = lambda e: (refresh_parent_options(), record_step(step["id"]), page.update())
+
+        def detach():
             steps.remove(step)
             steps_column.controls.remove(step_container)
+            steps_by_id.pop(step["id"], None)
+            rollup.remove(step["id"])
+
+        def remove_step(e):
+            detach()
+            record_step(step["id"])
             update_total_hours()
             page.update()
 
+        step["detach"] = detach
+
         def toggle_description(e):
             """Show/hide the description field"""
             description_field.visible = not description_field.visible
@@ -308,7 +579,10 @@ def main_view(page: ft.Page, manager: ProjectManager):
                 name_field,
                 type_dropdown,
                 parent_dropdown,
+                optimistic_field,
                 hours_field,
+                pessimistic_field,
+                subtotal_text,
                 description_btn,
                 remove_btn
             ],
@@ -320,17 +594,93 @@ def main_view(page: ft.Page, manager: ProjectManager):
             spacing=4
         )
 
-        steps.append(step)
-        steps_column.controls.append(step_container)
-
-        hours_field.on_change = lambda e: update_total_hours()
-        refresh_parent_options()
+        if steps and steps[-1]["id"] > step["id"]:
+            # A step restored by undo goes back to its old position (steps are kept in id order)
+            index = bisect_left(steps, step["id"], key=lambda s: s["id"])
+            steps.insert(index, step)
+            steps_column.controls.insert(index, step_container)
+        else:
+            steps.append(step)
+            steps_column.controls.append(step_container)
+
+        hours_field.on_change = lambda e: (rollup.set_hours(step["id"], parse_hours(hours_field.value)),
+                                           record_step(step["id"], (step["id"], "hours")), update_total_hours())
+        if not refresh:
+            parent_dropdown.options = [ft.dropdown.Option(parent)] if parent else []
+            return
+        if parent is None:
+            refresh_parent_options()
+        record_step(step["id"])
         update_total_hours()
 
     def on_add_step(e):
         add_step()
         page.update()
 
+    # ---------- Spreadsheet import ----------
+
+    def on_import_steps_result(e: ft.FilePickerResultEvent):
+        if not e.files:
+            return
+        path = e.files[0].path
+        merge_checkbox = ft.Checkbox(label="Add new step names to templates", value=True)
+
+        def do_import(ev):
+            from core.importer import import_steps, merge_into_templates
+
+            page.close(import_dlg)
+            try:
+                result = import_steps(path)
+            except Exception as ex:
+                show_snackbar(page, f"❌ Import failed: {ex}", ft.Colors.RED, 5000)
+                return
+
+            for s in result.steps:
+                add_step(s["name"], s["description"], s["hours"], s["type"], s["parent"],
+                         s["hours_optimistic"], s["hours_pessimistic"], refresh=False)
+            # The whole import is one undo entry
+            state = history.current
+            for s in steps[len(steps) - len(result.steps):]:
+                state = state.with_step(s["id"], step_state(s))
+            history.commit(state)
+            refresh_history_buttons()
+
+            added = 0
+            if merge_checkbox.value:
+                added = merge_into_templates(result.steps, templates)
+                if added:
+                    save_templates(templates)  # One write for the whole file
+                    refresh_templates()
+
+            update_total_hours()
+            for err in result.errors:
+                print(f"⚠ {err}")
+            message = f"✔ {len(result.steps)} step(s) imported"
+            if added:
+                message += f", {added} new template(s)"
+            if result.errors:
+                message += f"; {len(result.errors)} row(s) skipped (see log)"
+            show_snackbar(page, message, ft.Colors.ORANGE if result.errors else ft.Colors.GREEN, 5000)
+
+        import_dlg = ft.AlertDialog(
+            modal=True,
+            bgcolor=DIALOG_BG,
+            title=dialog_text("Import Steps"),
+            content=ft.Column([dialog_text(os.path.basename(path)), merge_checkbox], tight=True, spacing=10),
+            actions=[
+                dialog_button("Import", do_import),
+                dialog_button("Cancel", lambda ev: page.close(import_dlg))
+            ]
+        )
+        page.open(import_dlg)
+
+    import_steps_dialog = ft.FilePicker(on_result=on_import_steps_result)
+    page.overlay.append(import_steps_dialog)
+
+    def import_steps_click(e):
+        import_steps_dialog.pick_files(dialog_title="Import steps from CSV / Excel",
+                                       allowed_extensions=["csv", "xlsx", "xlsm"])
+
     # ---------- Templates ----------
 
     template_search = ft.TextField(
@@ -357,7 +707,9 @@ def main_view(page: ft.Page, manager: ProjectManager):
             multiline=True,
             min_lines=2
         )
-        hours_input = dialog_textfield(label="Hours", value="0")
+        hours_input = dialog_textfield(label="Hours (most likely)", value="0")
+        optimistic_input = dialog_textfield(label="Optimistic hours (optional)")
+        pessimistic_input = dialog_textfield(label="Pessimistic hours (optional)")
 
         def save_template(ev, dlg=None):
             name = (name_input.value or "").strip()
@@ -375,7 +727,9 @@ def main_view(page: ft.Page, manager: ProjectManager):
             templates.append({
                 "name": name,
                 "description": (description_input.value or "").strip(),
-                "hours": (hours_input.value or "0").strip() or "0"
+                "hours": (hours_input.value or "0").strip() or "0",
+                "hours_optimistic": (optimistic_input.value or "").strip(),
+                "hours_pessimistic": (pessimistic_input.value or "").strip()
             })
 
             save_templates(templates)
@@ -387,7 +741,7 @@ def main_view(page: ft.Page, manager: ProjectManager):
             bgcolor=DIALOG_BG,
             title=dialog_text("New Template"),
             content=ft.Column(
-                [name_input, description_input, hours_input],
+                [name_input, description_input, hours_input, optimistic_input, pessimistic_input],
                 tight=True,
                 spacing=10
             ),
@@ -398,6 +752,7 @@ def main_view(page: ft.Page, manager: ProjectManager):
         )
         page.open(dlg)
 
+    @timed("ui.refresh_templates")
     def refresh_templates():
         """Refresh the templates UI from the loaded templates list.
 
@@ -424,8 +779,12 @@ def main_view(page: ft.Page, manager: ProjectManager):
                 expand=True
             )
 
+            hours_range = ""
+            if t.get("hours_optimistic") or t.get("hours_pessimistic"):
+                hours_range = f" ({t.get('hours_optimistic') or t.get('hours', '0')}-{t.get('hours_pessimistic') or t.get('hours', '0')})"
+
             hours_text = ft.Text(
-                f"{t.get('hours', '0')}h",
+                f"{t.get('hours', '0')}h{hours_range}",
                 size=14,
                 color=ft.Colors.GREY_700,
                 weight=ft.FontWeight.BOLD
@@ -436,7 +795,9 @@ def main_view(page: ft.Page, manager: ProjectManager):
                 add_step(
                     temp["name"],
                     temp.get("description", ""),
-                    temp.get("hours", "0")
+                    temp.get("hours", "0"),
+                    hours_optimistic=temp.get("hours_optimistic", ""),
+                    hours_pessimistic=temp.get("hours_pessimistic", "")
                 )
 
                 dlg = ft.AlertDialog(
@@ -473,14 +834,24 @@ def main_view(page: ft.Page, manager: ProjectManager):
                     min_lines=2
                 )
                 hours_input = dialog_textfield(
-                    label="Hours",
+                    label="Hours (most likely)",
                     value=str(temp.get("hours", "0"))
                 )
+                optimistic_input = dialog_textfield(
+                    label="Optimistic hours (optional)",
+                    value=str(temp.get("hours_optimistic", ""))
+                )
+                pessimistic_input = dialog_textfield(
+                    label="Pessimistic hours (optional)",
+                    value=str(temp.get("hours_pessimistic", ""))
+                )
 
                 def save_edit(ev):
                     temp["name"] = (name_input.value or "").strip()
                     temp["description"] = (description_input.value or "").strip()
                     temp["hours"] = (hours_input.value or "0").strip() or "0"
+                    temp["hours_optimistic"] = (optimistic_input.value or "").strip()
+                    temp["hours_pessimistic"] = (pessimistic_input.value or "").strip()
 
                     save_templates(templates)
                     refresh_templates()
@@ -491,7 +862,7 @@ def main_view(page: ft.Page, manager: ProjectManager):
                     bgcolor=DIALOG_BG,
                     title=dialog_text("Edit Template"),
                     content=ft.Column(
-                        [name_input, description_input, hours_input],
+                        [name_input, description_input, hours_input, optimistic_input, pessimistic_input],
                         tight=True,
                         spacing=10
                     ),
@@ -568,11 +939,36 @@ def main_view(page: ft.Page, manager: ProjectManager):
 
         page.update()
 
-    template_search.on_change = lambda e: refresh_templates()
+    template_search.on_change = profiled("template_search")(lambda e: refresh_templates())
     refresh_templates()
 
     # ---------- Save & PDF ----------
 
+    def collect_project_data():
+        """Build the project dictionary (fields, steps with hierarchy, total) from the UI."""
+        return {
+            "name": project_name.value,
+            "architect": architect.value or "N/A",
+            "area": area.value or "N/A",
+            "demand": demand.value or "N/A",
+            "purpose": purpose.value or "",
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "steps": [
+                {
+                    "name": s["name"].value,
+                    "description": s["description"].value,
+                    "hours": float(s["hours"].value or 0),
+                    "hours_optimistic": optional_hours(s["hours_optimistic"].value),
+                    "hours_pessimistic": optional_hours(s["hours_pessimistic"].value),
+                    "type": s["type"].value,
+                    "parent": s["parent"].value
+                }
+                for s in steps
+            ],
+            "total": rollup.total,
+        }
+
+    @profiled("on_upload_devops")
     def on_upload_devops(e):
         try:
             # Validate that we have a project to upload
@@ -585,34 +981,7 @@ def main_view(page: ft.Page, manager: ProjectManager):
                 return
 
             # Build the project data to upload
-            total = 0.0
-            for s in steps:
-                try:
-                    h = float(s["hours"].value or 0)
-                except Exception:
-                    h = 0.0
-                total += h
-
-            data = {
-                "name": project_name.value,
-                "architect": architect.value or "N/A",
-                "area": area.value or "N/A",
-                "demand": demand.value or "N/A",
-                "purpose": purpose.value or "",
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "steps": [
-                    {
-                        "name": s["name"].value,
-                        "description": s["description"].value,
-                        "hours": float(s["hours"].value or 0),
-                        "type": s["type"].value,
-                        "parent": s["parent"].value
-                    }
-                    for s in steps
-                ],
-
-                "total": total,
-            }
+            data = collect_project_data()
 
             print(f"📤 Uploading to DevOps: {data['name']}")
             print(f"📋 Steps count: {len(data['steps'])}")
@@ -640,6 +1009,13 @@ def main_view(page: ft.Page, manager: ProjectManager):
             print("📌 Work Items created:")
             for name, wid in result["items"].items():
                 print(f"   {name}: #{wid}")
+            print(f"📊 DevOps scheduler: {devops.scheduler.metrics()}")
+
+            # Keep the work item links so actual hours can be fetched later for calibration
+            saved = next((p for p in projects if p.get("name") == data["name"]), None)
+            if saved is not None:
+                saved["devops"] = result
+                save_projects(projects)
 
             show_snackbar(page, f"✔ Upload concluído! Epic #{result['epic']} criada.", ft.Colors.GREEN, 4000)
 
@@ -667,6 +1043,7 @@ def main_view(page: ft.Page, manager: ProjectManager):
         on_click=on_upload_devops,
     )
 
+    @profiled("save_project")
     def save_project(e):
         """Validate and save the current project data to storage."""
         if not project_name.value:
@@ -674,39 +1051,17 @@ def main_view(page: ft.Page, manager: ProjectManager):
             page.open(error_dlg)
             return
 
-        # Calculate total before saving
-        total = 0.0
-        for s in steps:
-            try:
-                h = float(s["hours"].value or 0)
-            except Exception:
-                h = 0.0
-            total += h
-
-        project_data = {
-            "name": project_name.value,
-            "architect": architect.value or "N/A",
-            "area": area.value or "N/A",
-            "demand": demand.value or "N/A",
-            "purpose": purpose.value or "",
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "steps": [
-                {
-                    "name": s["name"].value,
-                    "description": s["description"].value,
-                    "hours": float(s["hours"].value or 0)
-                }
-                for s in steps
-            ],
-            "total": total,
-        }
+        project_data = collect_project_data()
 
         existing = next((p for p in projects if p["name"] == project_data["name"]), None)
         if existing:
+            if "devops" in existing:
+                project_data["devops"] = existing["devops"]
             projects.remove(existing)
         projects.append(project_data)
 
         save_projects(projects)
+        journal.begin(history.current)  # Saved: the draft journal is no longer needed
         existing_projects_dropdown.options = [ft.dropdown.Option("Create New Project")] + [ft.dropdown.Option(p["name"]) for p in projects]
         page.update()
 
@@ -714,43 +1069,20 @@ def main_view(page: ft.Page, manager: ProjectManager):
         page.open(success_dlg)
 
     # FilePicker to save PDF
+    @profiled("on_save_pdf_result")
     def on_save_pdf_result(e: ft.FilePickerResultEvent):
         if not e.path:
             return
 
         try:
-            from core.pdf_generator import generate_pdf as pdf_gen
+            from core.pdf_cache import generate_pdf_cached
 
-            # Calculate total just before PDF generation
-            total = 0.0
-            for s in steps:
-                try:
-                    h = float(s["hours"].value or 0)
-                except Exception:
-                    h = 0.0
-                total += h
-
-            project_data = {
-                "name": project_name.value,
-                "architect": architect.value or "N/A",
-                "area": area.value or "N/A",
-                "demand": demand.value or "N/A",
-                "purpose": purpose.value or "",
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "steps": [
-                    {
-                        "name": s["name"].value,
-                        "description": s["description"].value,
-                        "hours": float(s["hours"].value or 0)
-                    }
-                    for s in steps
-                ],
-                "total": total,
-            }
+            project_data = collect_project_data()
 
-            pdf_path = pdf_gen(project_data, e.path)
+            pdf_path, cache_hit = generate_pdf_cached(project_data, e.path)
+            source = "unchanged estimate, served from cache" if cache_hit else "rendered"
 
-            success_dlg = ft.AlertDialog(modal=True, title=ft.Text("Success", color=ft.Colors.GREEN_700), content=ft.Text(f"PDF generated successfully!\n\nSaved at:\n{pdf_path}"), actions=[ft.TextButton("OK", on_click=lambda e: page.close(success_dlg))], actions_alignment=ft.MainAxisAlignment.END)
+            success_dlg = ft.AlertDialog(modal=True, title=ft.Text("Success", color=ft.Colors.GREEN_700), content=ft.Text(f"PDF generated successfully ({source})!\n\nSaved at:\n{pdf_path}"), actions=[ft.TextButton("OK", on_click=lambda e: page.close(success_dlg))], actions_alignment=ft.MainAxisAlignment.END)
             page.open(success_dlg)
 
         except Exception as ex:
@@ -775,6 +1107,54 @@ def main_view(page: ft.Page, manager: ProjectManager):
         pdf_filename = f"{project_name.value.replace(' ', '_')}_estimate.pdf"
         save_pdf_dialog.save_file(file_name=pdf_filename, allowed_extensions=["pdf"], dialog_title="Save PDF As")
 
+    # ---------- Batch export ----------
+
+    def on_export_all_result(e: ft.FilePickerResultEvent):
+        if not e.path:
+            return
+
+        from core.batch_export import export_all_pdfs
+
+        progress_bar = ft.ProgressBar(width=360, value=0)
+        progress_text = dialog_text("Starting export...")
+        progress_dlg = ft.AlertDialog(
+            modal=True,
+            bgcolor=DIALOG_BG,
+            title=dialog_text("Exporting PDFs"),
+            content=ft.Column([progress_bar, progress_text], tight=True, spacing=10),
+        )
+        page.open(progress_dlg)
+
+        def progress(done, total, name, error):
+            progress_bar.value = done / total if total else 1
+            progress_text.value = f"{done}/{total}: {name}" + (" (failed)" if error else "")
+            page.update()
+
+        def run_export():
+            try:
+                result = export_all_pdfs(e.path, manager=manager, progress=progress)
+                page.close(progress_dlg)
+                if result["errors"]:
+                    for err in result["errors"]:
+                        print(f"❌ PDF export failed for {err['name']}: {err['error']}")
+                    show_snackbar(page, f"⚠ {len(result['written'])} PDFs exported, "
+                                        f"{len(result['errors'])} failed.", ft.Colors.ORANGE, 5000)
+                else:
+                    show_snackbar(page, f"✔ {len(result['written'])} PDFs exported in "
+                                        f"{result['seconds']:.1f}s.", ft.Colors.GREEN, 4000)
+            except Exception as ex:
+                page.close(progress_dlg)
+                show_snackbar(page, f"❌ Batch export failed: {ex}", ft.Colors.RED, 5000)
+
+        # Keep the UI responsive while the process pool renders
+        page.run_thread(run_export)
+
+    export_all_dialog = ft.FilePicker(on_result=on_export_all_result)
+    page.overlay.append(export_all_dialog)
+
+    def export_all_pdfs_click(e):
+        export_all_dialog.get_directory_path(dialog_title="Export all project PDFs to...")
+
     save_btn = ft.ElevatedButton("Save", icon=ft.Icons.SAVE, bgcolor=ft.Colors.BLUE_600, color=ft.Colors.WHITE, on_click=save_project)
     pdf_btn = ft.ElevatedButton("Generate PDF", icon=ft.Icons.PICTURE_AS_PDF, bgcolor=ft.Colors.BLUE_600, color=ft.Colors.WHITE, on_click=generate_pdf)
     devops_btn = ft.ElevatedButton(
@@ -784,6 +1164,69 @@ def main_view(page: ft.Page, manager: ProjectManager):
         color=ft.Colors.WHITE,
         on_click=on_upload_devops
     )
+    export_all_btn = ft.ElevatedButton("Export All PDFs", icon=ft.Icons.FOLDER_ZIP, bgcolor=ft.Colors.BLUE_600, color=ft.Colors.WHITE, on_click=export_all_pdfs_click)
+
+    # ---------- Dashboard ----------
+    analytics = get_analytics(manager)
+
+    dashboard_dimension = ft.Dropdown(
+        label="Group by",
+        value="area",
+        options=[
+            ft.dropdown.Option("area", "Area"),
+            ft.dropdown.Option("architect", "Solution Architect"),
+            ft.dropdown.Option("demand", "Demand"),
+            ft.dropdown.Option("month", "Month"),
+        ],
+        width=240,
+        color=ft.Colors.BLACK,
+    )
+    dashboard_totals = ft.Text("", size=14, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_700)
+    dashboard_table = ft.DataTable(
+        columns=[
+            ft.DataColumn(ft.Text("Group")),
+            ft.DataColumn(ft.Text("Projects"), numeric=True),
+            ft.DataColumn(ft.Text("Estimated Hours"), numeric=True),
+        ],
+        rows=[],
+    )
+
+    def refresh_dashboard(e=None):
+        """Fill the dashboard from the precomputed analytics aggregates."""
+        analytics.flush(2.0)  # Include a save made just before switching tabs
+        totals = analytics.totals()
+        dashboard_totals.value = f"{totals['projects']} projects - {totals['hours']:.1f} estimated hours"
+        dashboard_table.columns[0].label = ft.Text(next(o.text for o in dashboard_dimension.options if o.key == dashboard_dimension.value))
+        dashboard_table.rows = [
+            ft.DataRow(cells=[
+                ft.DataCell(ft.Text(str(row["key"]), color=ft.Colors.BLACK)),
+                ft.DataCell(ft.Text(str(row["projects"]), color=ft.Colors.BLACK)),
+                ft.DataCell(ft.Text(f"{row['hours']:.1f}", color=ft.Colors.BLACK)),
+            ])
+            for row in analytics.by(dashboard_dimension.value)
+        ]
+        page.update()
+
+    dashboard_dimension.on_change = refresh_dashboard
+
+    dashboard_card = ft.Container(
+        content=ft.Column([
+            ft.Row([
+                ft.Text("Portfolio Dashboard", size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_700),
+                ft.Container(expand=True),
+                dashboard_dimension,
+                ft.IconButton(icon=ft.Icons.REFRESH, icon_color=ft.Colors.BLUE_600, tooltip="Refresh", on_click=refresh_dashboard),
+            ]),
+            ft.Divider(height=1, color=ft.Colors.GREY_300),
+            dashboard_totals,
+            ft.Column([dashboard_table], scroll=ft.ScrollMode.AUTO, expand=True),
+        ], spacing=8, expand=True),
+        padding=12,
+        border_radius=8,
+        bgcolor=ft.Colors.WHITE,
+        border=ft.border.all(1, ft.Colors.GREY_300),
+        expand=True,
+    )
 
     # ---------- Layout ----------
     header = ft.Container(
@@ -806,6 +1249,8 @@ def main_view(page: ft.Page, manager: ProjectManager):
         content=ft.Column([
             ft.Text("Project Details", size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_700),
             ft.Divider(height=1, color=ft.Colors.GREY_300),
+            project_search,
+            search_results,
             existing_projects_dropdown,
             project_name,
             ft.ResponsiveRow([
@@ -826,6 +1271,13 @@ def main_view(page: ft.Page, manager: ProjectManager):
             ft.Row([
                 ft.Text("Steps", size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_700),
                 ft.Container(expand=True),
+                confidence_text,
+                ft.IconButton(icon=ft.Icons.QUERY_STATS, icon_color=ft.Colors.BLUE_600, icon_size=22, tooltip="Confidence range (P50 / P80 / P95)", on_click=on_simulate),
+                ft.Text("Total:", size=14, color=ft.Colors.GREY_700),
+                total_hours_text,
+                undo_btn,
+                redo_btn,
+                ft.IconButton(icon=ft.Icons.UPLOAD_FILE, icon_color=ft.Colors.BLUE_600, icon_size=22, tooltip="Import steps from CSV / Excel", on_click=import_steps_click),
                 ft.IconButton(icon=ft.Icons.ADD_CIRCLE, icon_color=ft.Colors.BLUE_600, icon_size=24, tooltip="Add step", on_click=on_add_step),
             ]),
             ft.Divider(height=1, color=ft.Colors.GREY_300),
@@ -856,12 +1308,20 @@ def main_view(page: ft.Page, manager: ProjectManager):
         expand=True,
     )
 
-    footer = ft.Container(content=ft.Row([save_btn, pdf_btn, devops_btn], spacing=12, alignment=ft.MainAxisAlignment.END), padding=12, bgcolor=ft.Colors.GREY_50, border_radius=ft.border_radius.only(bottom_left=8, bottom_right=8))
+    footer = ft.Container(content=ft.Row([save_btn, pdf_btn, export_all_btn, devops_btn], spacing=12, alignment=ft.MainAxisAlignment.END), padding=12, bgcolor=ft.Colors.GREY_50, border_radius=ft.border_radius.only(bottom_left=8, bottom_right=8))
 
     main_container = ft.Container(
         content=ft.Column([
             header,
-            ft.Container(content=ft.Column([project_details_card, ft.Container(content=ft.ResponsiveRow([ft.Container(steps_card, col={"sm": 12, "md": 12, "lg": 8}), ft.Container(templates_card, col={"sm": 12, "md": 12, "lg": 4})]), expand=True), footer], spacing=12, expand=True), padding=12, bgcolor=ft.Colors.GREY_50, expand=True),
+            ft.Tabs(
+                selected_index=0,
+                expand=True,
+                on_change=lambda e: refresh_dashboard() if e.control.selected_index == 1 else None,
+                tabs=[
+                    ft.Tab(text="Estimate", icon=ft.Icons.EDIT_NOTE, content=ft.Container(content=ft.Column([project_details_card, ft.Container(content=ft.ResponsiveRow([ft.Container(steps_card, col={"sm": 12, "md": 12, "lg": 8}), ft.Container(templates_card, col={"sm": 12, "md": 12, "lg": 4})]), expand=True), footer], spacing=12, expand=True), padding=12, bgcolor=ft.Colors.GREY_50, expand=True)),
+                    ft.Tab(text="Dashboard", icon=ft.Icons.INSIGHTS, content=ft.Container(content=dashboard_card, padding=12, bgcolor=ft.Colors.GREY_50, expand=True)),
+                ],
+            ),
         ], spacing=0, expand=True),
         bgcolor=ft.Colors.WHITE,
         border_radius=8,
@@ -871,3 +1331,65 @@ def main_view(page: ft.Page, manager: ProjectManager):
 
     page.add(main_container)
     page.update()
+
+    # ---------- Draft recovery ----------
+
+    def restore_draft(draft):
+        """Load an unsaved draft into the editor; it stays journaled until saved."""
+        state = draft["state"]
+        for name, value in zip(PROJECT_FIELDS, state.fields):
+            project_fields[name].value = value
+        existing_projects_dropdown.value = None
+        steps.clear()
+        steps_column.controls.clear()
+        rollup.clear()
+        steps_by_id.clear()
+        for s in state.steps:
+            add_step(s.name, s.description, s.hours, s.type, s.parent,
+                     s.hours_optimistic, s.hours_pessimistic, refresh=False)
+        history.reset(editor_snapshot())
+        refresh_history_buttons()
+        journal.begin(history.current, unsaved=True)
+        discard_draft(draft)
+        update_total_hours()
+        print(f"📝 Draft restored: {state.field('name') or '(unnamed)'} ({len(state.steps)} steps)")
+
+    def offer_drafts():
+        """Offer to restore the unsaved drafts left by a crashed or closed editor."""
+        drafts = find_drafts(journal.directory)
+        if not drafts:
+            return
+
+        def on_restore(e, draft):
+            page.close(drafts_dlg)
+            restore_draft(draft)
+            show_snackbar(page, "✔ Draft restored. Save the project to keep it.", ft.Colors.GREEN, 4000)
+
+        def on_discard_all(e):
+            for draft in drafts:
+                discard_draft(draft)
+            page.close(drafts_dlg)
+
+        rows = [
+            ft.ListTile(
+                title=dialog_text(d["name"] or "(unnamed project)"),
+                subtitle=dialog_text(f"{d['steps']} steps · last edit {datetime.fromtimestamp(d['modified']):%Y-%m-%d %H:%M}",
+                                     size=12, color=ft.Colors.GREY_400),
+                trailing=dialog_button("Restore", lambda e, d=d: on_restore(e, d)),
+            )
+            for d in drafts
+        ]
+        drafts_dlg = ft.AlertDialog(
+            modal=True,
+            bgcolor=DIALOG_BG,
+            title=dialog_text("Unsaved Drafts Found"),
+            content=ft.Column([dialog_text("These estimates were not saved when the editor last closed:"), *rows],
+                              tight=True, spacing=6),
+            actions=[
+                dialog_button("Discard all", on_discard_all),
+                dialog_button("Later", lambda e: page.close(drafts_dlg)),
+            ],
+        )
+        page.open(drafts_dlg)
+
+    offer_drafts()